@@ -0,0 +1,85 @@
+"""
+Benchmark: frame compositing with the NumPy compositor vs the legacy PIL path.
+
+Usage:
+    python benchmarks/compositing_benchmark.py [--repeat N]
+
+The legacy path is the previous PhotoController implementation: camera array
+→ PIL RGBA → Image.alpha_composite → RGB array. The new path blends the RGB
+camera array under a premultiplied FrameAsset into a preallocated buffer,
+copying transparent/opaque tiles and blending only partial-alpha spans.
+Frame decoding/scaling is excluded from both timings (it is cached).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.controllers.compositor import Compositor, FrameAsset  # noqa: E402
+
+RESOLUTIONS = [
+    ("720p", 1280, 720),
+    ("1080p", 1920, 1080),
+    ("24 MP", 6000, 4000),
+]
+
+
+def make_border_frame(width: int, height: int) -> Image.Image:
+    """Typical photobooth frame: opaque border, soft edge, transparent centre."""
+    frame = Image.new("RGBA", (width, height), (200, 30, 60, 255))
+    draw = ImageDraw.Draw(frame)
+    border = max(8, min(width, height) // 12)
+    draw.rectangle(
+        [border, border, width - border - 1, height - border - 1],
+        fill=(255, 255, 255, 96),
+    )
+    draw.rectangle(
+        [border + 4, border + 4, width - border - 5, height - border - 5],
+        fill=(0, 0, 0, 0),
+    )
+    return frame
+
+
+def legacy_pil(image_data: np.ndarray, frame: Image.Image) -> np.ndarray:
+    photo_img = Image.fromarray(image_data).convert("RGBA")
+    combined = Image.alpha_composite(photo_img, frame)
+    return np.array(combined.convert("RGB"))
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    compositor = Compositor()
+    rng = np.random.default_rng(0)
+
+    print(f"{'size':>8} | {'PIL (ms)':>9} | {'NumPy (ms)':>10} | {'speed-up':>8}")
+    print("-" * 45)
+    for name, width, height in RESOLUTIONS:
+        camera = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        frame = make_border_frame(width, height)
+        asset = FrameAsset.from_rgba(np.asarray(frame))
+        out = np.empty_like(camera)
+
+        pil_ms = best_of(lambda: legacy_pil(camera, frame), args.repeat)
+        numpy_ms = best_of(lambda: compositor.composite(camera, asset, out=out), args.repeat)
+        print(f"{name:>8} | {pil_ms:9.1f} | {numpy_ms:10.1f} | {pil_ms / numpy_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
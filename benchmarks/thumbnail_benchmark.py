@@ -0,0 +1,150 @@
+"""
+Benchmark: thumbnail decoding of large JPEGs, reduced-scale vs full decode.
+
+Usage:
+    python benchmarks/thumbnail_benchmark.py [--count N] [--width W] [--height H]
+
+Methods, each run in its own process so peak RSS is not shared:
+  qpixmap       previous path: QPixmap(path).scaled(..., SmoothTransformation)
+                on the GUI thread, one file after another
+  qimagereader  QImageReader.setScaledSize, Qt's JPEG plugin scales in the
+                DCT domain
+  pil-draft     load_thumbnail (PIL draft + LANCZOS), one file after another
+  pil-pool      load_thumbnail batched on the gallery's ThumbnailLoader pool
+
+Time is the wall time for the whole batch. Peak RSS is the process
+high-water mark above its level after imports (Unix only). The test
+photos are generated in yet another process: Linux carries ru_maxrss over
+exec, so the parent must stay small.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.controllers.thumbnail_cache import THUMBNAIL_SIZE  # noqa: E402
+from src.controllers.thumbnail_loader import ThumbnailLoader, load_thumbnail  # noqa: E402
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+METHODS = ("qpixmap", "qimagereader", "pil-draft", "pil-pool")
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_photos(directory: str, count: int, width: int, height: int):
+    """Photo-like JPEGs: smooth gradients with mild sensor noise."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    paths = []
+    for i in range(count):
+        base = np.stack([
+            128 + 100 * np.sin(x / (width / (3 + i)) + y / height),
+            128 + 100 * np.cos(y / (height / (2 + i))),
+            255 * x / width,
+        ], axis=-1)
+        noise = rng.normal(0, 6, base.shape)
+        pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+        path = os.path.join(directory, f"photo_{i:03d}.jpg")
+        Image.fromarray(pixels).save(path, "JPEG", quality=92)
+        paths.append(path)
+    return paths
+
+
+def run_method(method: str, paths) -> float:
+    width, height = THUMBNAIL_SIZE
+    if method in ("qpixmap", "qimagereader"):
+        from PyQt6.QtCore import QSize, Qt
+        from PyQt6.QtGui import QGuiApplication, QImageReader, QPixmap
+        app = QGuiApplication.instance() or QGuiApplication([])  # noqa: F841
+
+    start = time.perf_counter()
+    if method == "qpixmap":
+        for path in paths:
+            QPixmap(path).scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+    elif method == "qimagereader":
+        for path in paths:
+            reader = QImageReader(path)
+            reader.setAutoTransform(True)
+            size = reader.size().scaled(QSize(width, height), Qt.AspectRatioMode.KeepAspectRatio)
+            reader.setScaledSize(size)
+            reader.read()
+    elif method == "pil-draft":
+        for path in paths:
+            load_thumbnail(path, THUMBNAIL_SIZE)
+    elif method == "pil-pool":
+        done = threading.Semaphore(0)
+        loader = ThumbnailLoader(THUMBNAIL_SIZE, on_ready=lambda _p, _i: done.release())
+        for path in paths:
+            loader.request(path)
+        for _ in paths:
+            done.acquire()
+        loader.shutdown()
+    return (time.perf_counter() - start) * 1000
+
+
+def child(method: str, paths):
+    baseline = peak_rss_mb()
+    elapsed = run_method(method, paths)
+    print(f"{elapsed:.1f} {peak_rss_mb() - baseline:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=8)
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--child", choices=METHODS, help=argparse.SUPPRESS)
+    parser.add_argument("--make", metavar="DIR", help=argparse.SUPPRESS)
+    parser.add_argument("paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.paths)
+        return
+    if args.make:
+        print("\n".join(make_photos(args.make, args.count, args.width, args.height)))
+        return
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    with tempfile.TemporaryDirectory() as directory:
+        paths = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--make", directory,
+             "--count", str(args.count), "--width", str(args.width), "--height", str(args.height)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        mp = args.width * args.height / 1e6
+        print(f"{args.count} JPEGs of {args.width}x{args.height} ({mp:.0f} MP) "
+              f"to fit {THUMBNAIL_SIZE[0]}x{THUMBNAIL_SIZE[1]}")
+        print(f"{'method':>12} | {'batch (ms)':>10} | {'per file':>8} | {'peak RSS (MB)':>13}")
+        print("-" * 54)
+        for method in METHODS:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", method, *paths],
+                capture_output=True, text=True, env=env, check=True,
+            ).stdout.split()
+            elapsed, rss = float(out[-2]), float(out[-1])
+            print(f"{method:>12} | {elapsed:10.1f} | {elapsed / args.count:8.1f} | {rss:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,16 @@
 import sys
 import os
 from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox, QLabel
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 
 from src.models import AppConfig
 from src.controllers.camera_controller import CameraController
+from src.controllers.camera_broker import CameraBroker
+from src.controllers.camera_probe import saved_modes
+from src.controllers.capture_pipeline import CapturePipeline, wait_for_path
 from src.controllers.dslr_controller import DSLRController
 from src.controllers.photo_controller import PhotoController
+from src.controllers.photo_index import PhotoIndex
 from src.controllers.email_controller import EmailController
 from src.controllers.printer_controller import PrinterController
 
@@ -71,15 +75,50 @@ QGroupBox::title {
 def _build_camera_controller(config):
     """Instantiate the correct camera controller based on config."""
     if getattr(config.camera, "camera_type", "webcam") == "dslr":
-        return DSLRController(getattr(config.camera, "gphoto2_path", "gphoto2"))
+        return DSLRController(
+            getattr(config.camera, "gphoto2_path", "gphoto2"),
+            live_view=getattr(config.camera, "dslr_live_view", False),
+        )
     return CameraController(
         config.camera.device_id,
         (config.camera.resolution_width, config.camera.resolution_height),
+        threaded=getattr(config.camera, "threaded_capture", True),
+        modes=saved_modes(config.camera, config.camera.device_id),
+        still_resolution=_still_resolution(config),
+        max_switch_ms=getattr(config.camera, "max_mode_switch_ms", 1500),
     )
 
 
+def _still_resolution(config):
+    """Photo resolution of a dual-mode webcam, or None to use the preview one."""
+    width = getattr(config.camera, "still_resolution_width", 0)
+    height = getattr(config.camera, "still_resolution_height", 0)
+    return (width, height) if width > 0 and height > 0 else None
+
+
+def _camera_identity(config):
+    """Camera settings that need a new controller when they change.
+
+    Resolution is not part of it: the broker reconfigures the open device.
+    """
+    if getattr(config.camera, "camera_type", "webcam") == "dslr":
+        return ("dslr", getattr(config.camera, "gphoto2_path", "gphoto2"),
+                getattr(config.camera, "dslr_live_view", False))
+    modes = saved_modes(config.camera, config.camera.device_id)
+    return ("webcam", config.camera.device_id, getattr(config.camera, "threaded_capture", True),
+            tuple(sorted((m.resolution, m.fourcc, m.fps) for m in modes.values())),
+            _still_resolution(config))
+
+
+def _camera_resolution(config):
+    return (config.camera.resolution_width, config.camera.resolution_height)
+
+
 class PhotoboothApp(QMainWindow):
     """Main photobooth application."""
+
+    framed_photo_ready = pyqtSignal(object)  # CaptureJob whose framing finished (any thread)
+    photo_indexed = pyqtSignal(str)          # final path of a capture just indexed (any thread)
     
     def __init__(self):
         super().__init__()
@@ -89,7 +128,16 @@ class PhotoboothApp(QMainWindow):
         
         # Initialize controllers
         self.camera_controller = _build_camera_controller(self.config)
+        self.camera_broker = CameraBroker(
+            self.camera_controller,
+            idle_release_seconds=getattr(self.config.camera, "idle_release_seconds", 120),
+        )
+        self._camera_identity = _camera_identity(self.config)
         self.photo_controller = PhotoController(self.config.photos_directory)
+        self.capture_pipeline = CapturePipeline(self.photo_controller)
+        self.photo_index = PhotoIndex(
+            self.config.photos_directory, thumb_key=self.photo_controller.thumbnails.key
+        )
         self.email_controller = EmailController(
             self.config.email.smtp_server,
             self.config.email.smtp_port,
@@ -109,6 +157,8 @@ class PhotoboothApp(QMainWindow):
         
         # Current photo
         self.current_photo = None
+        self.current_job = None
+        self.framed_photo_ready.connect(self.on_framed_photo_ready)
     
     def init_ui(self):
         """Initialize the user interface."""
@@ -124,7 +174,9 @@ class PhotoboothApp(QMainWindow):
         
         # Create screens
         self.home_screen = HomeScreen()
-        self.capture_screen = CaptureScreen(self.camera_controller, self.photo_controller)
+        self.capture_screen = CaptureScreen(
+            self.camera_controller, self.photo_controller, self.camera_broker
+        )
         self.capture_screen.set_buttons_config(self.config.buttons)
         self.capture_screen.set_shutter_sound_path(
             getattr(self.config, "shutter_sound_path", "assets/sounds/shutter.wav")
@@ -134,7 +186,7 @@ class PhotoboothApp(QMainWindow):
         )
         self.gallery_screen = GalleryScreen()
         self.preview_screen = PreviewScreen()
-        self.admin_screen = AdminScreen(self.config)
+        self.admin_screen = AdminScreen(self.config, self.camera_broker)
         
         # Add screens to stack
         self.stacked_widget.addWidget(self.home_screen)
@@ -153,13 +205,14 @@ class PhotoboothApp(QMainWindow):
         self.capture_screen.admin_requested.connect(self.show_admin)
 
         self.gallery_screen.back_requested.connect(self.show_capture)
+        self.photo_indexed.connect(self.gallery_screen.add_photo)
         
         self.preview_screen.retake_requested.connect(self.show_capture)
         self.preview_screen.done.connect(self.show_capture)
         self.preview_screen.email_send_requested.connect(self.on_preview_email_send)
         self.preview_screen.print_requested.connect(self.on_preview_print)
         
-        self.admin_screen.back_requested.connect(self.show_capture)
+        self.admin_screen.back_requested.connect(self.on_admin_closed)
         self.admin_screen.config_saved.connect(self.on_config_saved)
         
         # Load frames in home screen
@@ -203,7 +256,7 @@ class PhotoboothApp(QMainWindow):
 
     def show_gallery(self):
         """Show gallery screen."""
-        self.gallery_screen.load_photos(self.config.photos_directory)
+        self.gallery_screen.load_photos(self.config.photos_directory, self.photo_index)
         self.stacked_widget.setCurrentWidget(self.gallery_screen)
     
     def show_preview(self):
@@ -213,6 +266,11 @@ class PhotoboothApp(QMainWindow):
     def show_admin(self):
         """Show admin screen."""
         self.stacked_widget.setCurrentWidget(self.admin_screen)
+
+    def on_admin_closed(self):
+        """Leave admin; undo an unsaved resolution tried in its preview."""
+        self.camera_broker.set_resolution(_camera_resolution(self.config))
+        self.show_capture()
     
     def on_frame_selected(self, frame_path: str):
         """Handle frame selection.
@@ -231,39 +289,67 @@ class PhotoboothApp(QMainWindow):
         Args:
             photo: Captured Photo object
         """
-        # Generate base filename from timestamp
-        timestamp = photo.timestamp.strftime("%Y%m%d_%H%M%S")
-        base_filename = f"photo_{timestamp}.jpg"
-        original_filename = f"photo_{timestamp}_original.jpg"
-
-        saved_path = None
-        
-        # Save original photo (without frame) if a frame will be applied
-        if self.config.save_to_disk and photo.frame_path and not photo.frame_applied:
-            self.photo_controller.save_photo(photo, original_filename)
-        
-        # Apply frame if one was selected
-        if photo.frame_path and not photo.frame_applied:
-            photo = self.photo_controller.apply_frame(photo, photo.frame_path)
-        
-        # Save final photo (with frame if any)
-        if self.config.save_to_disk:
-            saved_path = self.photo_controller.save_photo(photo, base_filename)
-        
+        # Save original, apply frame and save final in the background
+        job = self.capture_pipeline.submit(photo, self.config.save_to_disk)
+        self.current_job = job
         self.current_photo = photo
 
-        # Show preview
-        self.preview_screen.set_photo(photo, saved_path)
+        # Show the unframed capture now; the framed one replaces it when ready
+        self.preview_screen.set_photo(photo, saved_path_future=job.saved_path)
         self.show_preview()
+        job.framed.add_done_callback(lambda _f, job=job: self.framed_photo_ready.emit(job))
+        job.saved_path.add_done_callback(lambda _f, job=job: self._index_capture(job))
+
+    def _index_capture(self, job):
+        """Record a saved capture in the photo index (pipeline worker thread)."""
+        final_path = wait_for_path(job.saved_path, timeout=0)
+        if not final_path:
+            return
+        photo = job.framed.result()
+        height, width = photo.image_data.shape[:2]
+        try:
+            self.photo_index.record_capture(
+                final_path, job.photo.timestamp,
+                original_path=wait_for_path(job.original_path),
+                frame_path=job.photo.frame_path,
+                size=(width, height),
+            )
+        except Exception as e:
+            print(f"[PhotoIndex] could not record {final_path}: {e}")
+        self.photo_indexed.emit(final_path)
+
+    def on_framed_photo_ready(self, job):
+        """Swap the framed photo into the preview once the pipeline produced it.
+
+        Args:
+            job: CaptureJob whose framed future has completed
+        """
+        if job is not self.current_job or job.framed.exception() is not None:
+            return
+        photo = job.framed.result()
+        if photo is job.photo:
+            return
+        self.current_photo = photo
+        self.preview_screen.update_photo(photo)
     
     def on_config_saved(self):
         """Handle configuration save."""
         # Reload configuration
         self.config = AppConfig.load()
         
-        # Update camera controller
-        self.camera_controller = _build_camera_controller(self.config)
-        self.capture_screen.camera = self.camera_controller
+        # Update camera: a new controller only if the device or mode changed,
+        # otherwise the open device is just reconfigured
+        self.camera_broker.session.idle_release_seconds = getattr(
+            self.config.camera, "idle_release_seconds", 120
+        )
+        identity = _camera_identity(self.config)
+        if identity != self._camera_identity:
+            self._camera_identity = identity
+            self.camera_controller = _build_camera_controller(self.config)
+            self.camera_broker.replace(self.camera_controller)
+            self.capture_screen.camera = self.camera_controller
+        else:
+            self.camera_broker.set_resolution(_camera_resolution(self.config))
         
         # Update button configuration
         self.capture_screen.set_buttons_config(self.config.buttons)
@@ -373,6 +459,7 @@ class PhotoboothApp(QMainWindow):
 
         success = self.email_controller.send_photo(recipient_email, saved_path)
         if success:
+            self.photo_index.mark_emailed(saved_path, recipient_email)
             self.show_toast(f"✅ Photo envoyée à {recipient_email}")
         else:
             QMessageBox.warning(
@@ -397,6 +484,7 @@ class PhotoboothApp(QMainWindow):
 
         success = self.printer_controller.print_photo(saved_path)
         if success:
+            self.photo_index.mark_printed(saved_path)
             self.show_toast("✅ Photo envoyée à l'imprimante !")
         else:
             self.show_toast("❌ Échec de l'impression. Vérifiez la configuration imprimante.")
@@ -407,8 +495,10 @@ class PhotoboothApp(QMainWindow):
         Args:
             event: Close event
         """
-        # Clean up camera
-        self.camera_controller.stop()
+        # Clean up camera and let pending saves finish
+        self.camera_broker.close()
+        self.capture_pipeline.shutdown(wait=True)
+        self.photo_index.close()
         event.accept()
 
     def keyPressEvent(self, event):
@@ -0,0 +1,186 @@
+"""One physical camera shared by every screen that shows its picture."""
+import dataclasses
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.controllers.camera_session import CameraSession
+from src.controllers.frame_grabber import FramePacket
+
+
+class CameraSubscription:
+    """One consumer's view of the broker's frames.
+
+    poll() returns each new frame at most once, no faster than ``max_fps``,
+    scaled to fit ``target_size`` (aspect ratio kept) when one is given.
+
+    The controller's frames live in a pool that refills them a few reads
+    later, so a frame is never handed over as is: it is scaled into a new
+    array or copied into a buffer owned by the subscription, which stays
+    valid until the next poll().
+    """
+
+    def __init__(self, broker: "CameraBroker", name: str,
+                 target_size: Optional[Tuple[int, int]] = None,
+                 max_fps: Optional[float] = None):
+        self.broker = broker
+        self.name = name
+        self.target_size = target_size
+        self.max_fps = max_fps
+        self.last_seq = 0
+        self._last_time = 0.0
+        self._buffer: Optional[np.ndarray] = None
+
+    def poll(self) -> Optional[FramePacket]:
+        """Return the newest frame if it is new and due, else None."""
+        now = time.monotonic()
+        if self.max_fps and now - self._last_time < 1.0 / self.max_fps:
+            return None
+        # Copy under the fetch lock: no other subscriber's read can recycle
+        # the pooled frame first, and the pool's spare buffers cover the grabber
+        with self.broker._fetch_lock:
+            packet = self.broker._fetch()
+            if packet is None or packet.seq == self.last_seq:
+                return None
+            frame = self._fit(packet.frame)
+        self.last_seq = packet.seq
+        self._last_time = now
+        return dataclasses.replace(packet, frame=frame)
+
+    def close(self) -> None:
+        """Unsubscribe; the device is released once nobody is subscribed."""
+        self.broker.unsubscribe(self)
+
+    def _fit(self, frame: np.ndarray) -> np.ndarray:
+        """Frame scaled to the target box, or copied into the own buffer."""
+        if self.target_size:
+            src_h, src_w = frame.shape[:2]
+            box_w, box_h = self.target_size
+            scale = min(box_w / src_w, box_h / src_h)
+            if scale < 1.0:
+                size = (max(1, int(src_w * scale)), max(1, int(src_h * scale)))
+                return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if self._buffer is None or self._buffer.shape != frame.shape:
+            self._buffer = np.empty_like(frame)
+        np.copyto(self._buffer, frame)
+        return self._buffer
+
+
+class CameraBroker:
+    """Owns one camera device and fans its frames out to subscribers.
+
+    The capture preview, the admin preview and any future mirror screen
+    subscribe here instead of opening the device themselves: a second open
+    of a V4L2 or DirectShow device either fails or renegotiates the stream.
+    The device is opened through a CameraSession when the first subscriber
+    arrives and idles (then closes) when the last one leaves.
+
+    Frames are read from the controller at most once per ``share_window``
+    seconds and shared, so an unthreaded controller is not read once per
+    subscriber. Subscriptions may be polled from worker threads.
+    """
+
+    def __init__(self, controller, idle_release_seconds: float = 120.0,
+                 share_window: float = 0.01):
+        """Initialize broker (the device is opened by the first subscriber).
+
+        Args:
+            controller: CameraController or DSLRController
+            idle_release_seconds: See CameraSession
+            share_window: Age below which a fetched frame is reused
+        """
+        self.session = CameraSession(controller, idle_release_seconds)
+        self.share_window = share_window
+        self._subscriptions: List[CameraSubscription] = []
+        self._packet: Optional[FramePacket] = None
+        self._fetched_at = 0.0
+        self._fetch_lock = threading.Lock()
+
+    @property
+    def controller(self):
+        return self.session.controller
+
+    @property
+    def subscriptions(self) -> List[CameraSubscription]:
+        return list(self._subscriptions)
+
+    def subscribe(self, name: str, target_size: Optional[Tuple[int, int]] = None,
+                  max_fps: Optional[float] = None) -> Optional[CameraSubscription]:
+        """Open the device if needed and register a consumer.
+
+        Args:
+            name: Consumer name, for diagnostics
+            target_size: Optional (width, height) box frames are scaled to fit
+            max_fps: Optional cap on the delivered frame rate
+
+        Returns:
+            CameraSubscription, or None if the camera could not be opened
+        """
+        if not self.session.acquire():
+            return None
+        subscription = CameraSubscription(self, name, target_size, max_fps)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: CameraSubscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            self.session.release()
+
+    def latest(self) -> Optional[FramePacket]:
+        """Newest frame from the device, shared between subscribers.
+
+        The frame may be a pooled camera buffer: copy it before using it
+        on another thread (subscriptions do).
+        """
+        with self._fetch_lock:
+            return self._fetch()
+
+    def _fetch(self) -> Optional[FramePacket]:
+        """latest() without the lock; callers hold ``_fetch_lock``."""
+        now = time.monotonic()
+        if self._packet is None or now - self._fetched_at >= self.share_window:
+            self._packet = self.controller.get_frame_packet()
+            self._fetched_at = now
+        return self._packet
+
+    def set_resolution(self, resolution: Tuple[int, int]) -> bool:
+        """Change the capture resolution, keeping the device open.
+
+        Returns:
+            True if the device was reconfigured, False if nothing changed
+        """
+        resolution = (int(resolution[0]), int(resolution[1]))
+        set_resolution = getattr(self.controller, "set_resolution", None)
+        if set_resolution is None or tuple(self.controller.resolution) == resolution:
+            return False
+        set_resolution(resolution)
+        self._packet = None
+        return True
+
+    def replace(self, controller) -> bool:
+        """Switch to another device; current subscribers move over.
+
+        Returns:
+            False if the new device could not be opened for them
+        """
+        holders = len(self._subscriptions)
+        idle_release_seconds = self.session.idle_release_seconds
+        self.session.close()
+        self.session = CameraSession(controller, idle_release_seconds)
+        self._packet = None
+        for subscription in self._subscriptions:
+            subscription.last_seq = 0
+        ok = True
+        for _ in range(holders):
+            ok = self.session.acquire() and ok
+        return ok
+
+    def close(self) -> None:
+        """Release the device now and drop all subscriptions."""
+        self._subscriptions.clear()
+        self.session.close()
+        self._packet = None
@@ -2,7 +2,13 @@
 import cv2
 import numpy as np
 import platform
-from typing import Optional, List, Tuple
+import threading
+import time
+from typing import Dict, Optional, List, Tuple
+from src.controllers.camera_discovery import default_discovery
+from src.controllers.camera_probe import CameraMode, apply_mode
+from src.controllers.frame_grabber import BGR, FrameGrabber, FramePacket
+from src.controllers.frame_pool import FrameBufferPool
 from src.models.photo import Photo
 from datetime import datetime
 
@@ -10,17 +16,50 @@ from datetime import datetime
 class CameraController:
     """Manages camera operations."""
     
-    def __init__(self, device_id: int = 0, resolution: Tuple[int, int] = (1920, 1080)):
+    def __init__(self, device_id: int = 0, resolution: Tuple[int, int] = (1920, 1080),
+                 threaded: bool = False, precapture_frames: int = 8,
+                 modes: Optional[Dict[Tuple[int, int], CameraMode]] = None,
+                 still_resolution: Optional[Tuple[int, int]] = None,
+                 max_switch_ms: float = 1500.0):
         """Initialize camera controller.
         
         Args:
             device_id: Camera device ID
             resolution: Tuple of (width, height)
+            threaded: Read frames on a dedicated thread so get_frame never blocks
+            precapture_frames: Recent frames kept (threaded mode) for zero-lag capture
+            modes: Probed capture mode (pixel format, frame rate) per resolution
+            still_resolution: Resolution for photos if it differs from the
+                preview one (dual mode); None to capture from the preview
+            max_switch_ms: Still-mode switch time above which dual mode is
+                given up for single mode
         """
         self.device_id = device_id
         self.resolution = resolution
+        self.threaded = threaded
+        self.precapture_frames = precapture_frames
+        self.modes = dict(modes or {})
+        self.still_resolution = tuple(still_resolution) if still_resolution else None
+        self.max_switch_ms = max_switch_ms
+        self.last_switch_ms: Optional[float] = None   # preview -> still mode, last capture
+        self.last_shutter_lag_ms: Optional[float] = None
+        self.negotiated_fps = 0.0     # frame rate the driver agreed to (0 if unknown)
         self.camera: Optional[cv2.VideoCapture] = None
         self.is_active = False
+        self.grabber: Optional[FrameGrabber] = None
+        # Frames are converted into pooled arrays; the ring plus a few spares
+        # is all a preview session ever needs
+        self.pool = FrameBufferPool(capacity=precapture_frames + 4)
+        self._frame_shape: Optional[tuple] = None      # shape of the last read frame
+        self._last_frame: Optional[np.ndarray] = None  # unthreaded mode only
+        self._seq = 0
+        # Dual mode: the device is in still mode between prepare_capture()
+        # and the end of capture_photo(); unthreaded preview reads wait
+        self._device_lock = threading.RLock()
+        self._still_mode = False
+        self._still_ready = False
+        self._switch_thread: Optional[threading.Thread] = None
+        self._single_mode = False     # set when switching proved too slow
     
     def start(self) -> bool:
         """Start the camera.
@@ -39,11 +78,19 @@ class CameraController:
             if not self.camera.isOpened():
                 return False
             
-            # Set resolution
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
+            self._apply_resolution(self.resolution)
+            self.negotiated_fps = self._query_fps()
             
             self.is_active = True
+            if self.threaded:
+                self.grabber = FrameGrabber(
+                    self._read_frame,
+                    name=f"camera-{camera_id}",
+                    history_size=self.precapture_frames,
+                    on_evict=self.pool.release,
+                    pixel_format=BGR,
+                )
+                self.grabber.start()
             return True
         except Exception as e:
             print(f"Error starting camera: {e}")
@@ -51,37 +98,205 @@ class CameraController:
     
     def stop(self) -> None:
         """Stop the camera."""
+        if self._switch_thread is not None:
+            self._switch_thread.join()
+            self._switch_thread = None
+        self._still_mode = False
+        if self.grabber:
+            # Reader thread must be gone before the device is released
+            if not self.grabber.stop():
+                print("[CameraController] reader stuck in read(), device left open")
+                self.is_active = False
+                return
+            self.grabber = None
         if self.camera:
             self.camera.release()
             self.is_active = False
+
+    @property
+    def device_key(self) -> Tuple[str, int]:
+        """Identifies the physical device, independent of its settings."""
+        try:
+            return ("webcam", int(self.device_id))
+        except (TypeError, ValueError):
+            return ("webcam", 0)
+
+    def set_resolution(self, resolution: Tuple[int, int]) -> None:
+        """Change the capture resolution without closing the device."""
+        self.resolution = resolution
+        if not (self.is_active and self.camera):
+            return
+        if self.pause():
+            self._apply_resolution(resolution)
+            self.negotiated_fps = self._query_fps()
+        else:
+            print(f"[CameraController] reader busy, {resolution} not applied")
+        self.resume()
+
+    def pause(self) -> bool:
+        """Stop background grabbing but keep the device open.
+
+        Returns:
+            False if the reader is still inside read() (the device must
+            not be reconfigured)
+        """
+        if self.grabber:
+            return self.grabber.stop()
+        return True
+
+    def resume(self) -> None:
+        """Restart background grabbing after pause()."""
+        if self.grabber and not self.grabber.is_running:
+            # Frames from before the pause are stale for preview and pre-capture
+            self.grabber.slot.clear()
+            self.grabber.start()
     
     def get_frame(self) -> Optional[np.ndarray]:
         """Get current frame from camera.
+
+        In threaded mode this returns the newest grabbed frame immediately.
         
         Returns:
-            Frame as numpy array or None if failed
+            RGB frame as numpy array or None if failed
+        """
+        packet = self.get_frame_packet()
+        return packet.to_rgb() if packet else None
+
+    def get_frame_packet(self) -> Optional[FramePacket]:
+        """Get the current frame with its sequence number and timestamp.
+
+        Callers can compare ``seq`` with the last one they handled and skip
+        repainting when no new frame has arrived. The frame is the camera's
+        native BGR, in a pooled buffer: convert or copy it to keep it.
+
+        Returns:
+            FramePacket or None if no frame is available
         """
         if not self.is_active or not self.camera:
             return None
-        
-        ret, frame = self.camera.read()
-        if ret:
-            # Convert BGR to RGB
-            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return None
+
+        if self.grabber:
+            return self.grabber.slot.latest()
+
+        # A mode switch holds the lock for up to 2 * max_switch_ms: do not
+        # wait for it, there is no preview frame to get meanwhile
+        if self._still_mode or not self._device_lock.acquire(blocking=False):
+            return None
+        try:
+            if self._still_mode:
+                return None
+            frame = self._read_frame()
+        finally:
+            self._device_lock.release()
+        if frame is None:
+            return None
+        if self._last_frame is not None:
+            self.pool.release(self._last_frame)
+        self._last_frame = frame
+        self._seq += 1
+        return FramePacket(frame=frame, seq=self._seq, timestamp=time.monotonic(), pixel_format=BGR)
+
+    @property
+    def dual_mode(self) -> bool:
+        """True if photos are taken in a separate, higher-resolution mode."""
+        return (self.still_resolution is not None and not self._single_mode
+                and tuple(self.still_resolution) != tuple(self.resolution))
+
+    @property
+    def capture_lead_ms(self) -> float:
+        """How long before the shutter prepare_capture() should be called.
+
+        0 in single mode. Until a switch has been measured, half the
+        allowed switch time is assumed.
+        """
+        if not self.dual_mode:
+            return 0.0
+        if self.last_switch_ms is None:
+            return self.max_switch_ms / 2
+        return self.last_switch_ms
+
+    def prepare_capture(self) -> None:
+        """Start switching to the still mode so capture_photo finds it ready.
+
+        The switch runs in the background (the preview stops receiving
+        frames meanwhile); does nothing in single mode.
+        """
+        if not (self.dual_mode and self.is_active and self.camera) or self._switch_thread is not None:
+            return
+        self._switch_thread = threading.Thread(target=self._enter_still_mode,
+                                               name="camera-still-switch", daemon=True)
+        self._switch_thread.start()
+
+    @property
+    def measured_fps(self) -> float:
+        """Frame rate actually delivered by the reader thread (0 if unthreaded)."""
+        return self.grabber.fps if self.grabber else 0.0
+
+    def _apply_resolution(self, resolution: Tuple[int, int]) -> None:
+        """Set the frame size, in the fastest probed mode for it if there is one."""
+        mode = self.modes.get(tuple(resolution))
+        if mode is None:
+            mode = CameraMode(int(resolution[0]), int(resolution[1]))
+        apply_mode(self.camera, mode)
+
+    def _query_fps(self) -> float:
+        """Frame rate reported by the driver for the current mode (0 if unknown)."""
+        try:
+            fps = float(self.camera.get(cv2.CAP_PROP_FPS))
+        except Exception:
+            return 0.0
+        # Some backends report 0, -1 or absurd values when they do not know
+        return fps if 0 < fps <= 240 else 0.0
+
+    def _read_frame(self) -> Optional[np.ndarray]:
+        """Blocking read of one BGR frame straight into a pooled buffer.
+
+        The returned array is leased from ``self.pool``; it is released when
+        it leaves the pre-capture ring (threaded) or on the next read.
+        """
+        buffer = self.pool.lease(self._frame_shape) if self._frame_shape else None
+        ret, frame = self.camera.read(buffer)
+        if buffer is not None and (not ret or frame is not buffer):
+            # Failed read, or the driver changed size: buffer not handed on
+            self.pool.release(buffer)
+        if not ret or frame is None:
+            return None
+        self._frame_shape = frame.shape
+        return frame
     
-    def capture_photo(self, frame_path: Optional[str] = None) -> Optional[Photo]:
+    def capture_photo(self, frame_path: Optional[str] = None,
+                      shutter_time: Optional[float] = None) -> Optional[Photo]:
         """Capture a photo from the camera.
+
+        In threaded mode the frame is taken from the pre-capture ring: the
+        one whose timestamp is closest to ``shutter_time``. The signed gap
+        (frame time minus shutter time) is kept in ``last_shutter_lag_ms``.
         
         Args:
             frame_path: Optional path to a frame image to overlay
+            shutter_time: time.monotonic() of the shutter instant; now if None
             
         Returns:
             Photo object or None if capture failed
         """
-        frame = self.get_frame()
-        if frame is None:
+        if shutter_time is None:
+            shutter_time = time.monotonic()
+
+        if self.dual_mode and self.is_active and self.camera:
+            photo = self._capture_still(frame_path, shutter_time)
+            if photo is not None:
+                return photo
+            # Still mode failed: take the photo from the preview stream
+
+        if self.grabber:
+            packet = self._precaptured_packet(shutter_time)
+        else:
+            packet = self.get_frame_packet()
+        if packet is None:
             return None
+        # Converting to RGB also copies the frame out of the reused pool
+        frame = cv2.cvtColor(packet.frame, cv2.COLOR_BGR2RGB)
+        self.last_shutter_lag_ms = (packet.timestamp - shutter_time) * 1000.0
         
         photo = Photo(
             image_data=frame,
@@ -91,21 +306,93 @@ class CameraController:
         
         return photo
     
+    def _capture_still(self, frame_path: Optional[str], shutter_time: float) -> Optional[Photo]:
+        """Take the photo in the still mode, then go back to the preview mode."""
+        self.prepare_capture()
+        if self._switch_thread is not None:
+            self._switch_thread.join()
+            self._switch_thread = None
+        frame = None
+        switched = self._still_mode
+        try:
+            if self._still_ready:
+                with self._device_lock:
+                    # The first frame of the new mode proved the switch;
+                    # this one has had a frame period to settle
+                    ret, frame = self.camera.read()
+                if not ret:
+                    frame = None
+        finally:
+            self._leave_still_mode()
+        if not switched:
+            return None     # reader busy: this photo comes from the preview stream
+
+        if frame is None or self.last_switch_ms > self.max_switch_ms:
+            print(f"[CameraController] still mode switch "
+                  f"{'failed' if frame is None else f'took {self.last_switch_ms:.0f} ms'}, "
+                  f"capturing from the preview stream from now on")
+            self._single_mode = True
+        if frame is None:
+            return None
+        self.last_shutter_lag_ms = (time.monotonic() - shutter_time) * 1000.0
+        return Photo(
+            image_data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB),
+            timestamp=datetime.now(),
+            frame_path=frame_path
+        )
+
+    def _enter_still_mode(self) -> None:
+        """Switch the device to the still resolution (switch thread).
+
+        The switch counts as done when a frame of the new size arrives;
+        its duration is kept in ``last_switch_ms``.
+        """
+        start = time.perf_counter()
+        self._still_ready = False
+        if not self.pause():
+            print("[CameraController] reader busy, photo taken in preview mode")
+            return
+        width, height = self.still_resolution
+        with self._device_lock:
+            self._still_mode = True
+            try:
+                self._apply_resolution(self.still_resolution)
+                deadline = time.monotonic() + 2 * self.max_switch_ms / 1000.0
+                while time.monotonic() < deadline:
+                    ret, frame = self.camera.read()
+                    if ret and frame is not None and frame.shape[:2] == (height, width):
+                        self._still_ready = True
+                        break
+            except Exception as e:
+                print(f"[CameraController] still mode switch error: {e}")
+        self.last_switch_ms = (time.perf_counter() - start) * 1000.0
+
+    def _leave_still_mode(self) -> None:
+        with self._device_lock:
+            if self._still_mode:
+                self._apply_resolution(self.resolution)
+                self._still_mode = False
+        self.resume()
+
+    def _precaptured_packet(self, shutter_time: float) -> Optional[FramePacket]:
+        """Pick the ring-buffered frame closest to the shutter instant."""
+        slot = self.grabber.slot
+        latest = slot.latest()
+        if latest is None or latest.timestamp < shutter_time:
+            # Newest frame predates the shutter: the next one may be closer
+            # (no frame at all: grabbing was just resumed, allow a full wait)
+            interval = 1.0 / self.grabber.fps if self.grabber.fps and latest else 1.0
+            slot.wait_newer(latest.seq if latest else slot.seq, timeout=min(0.5, 1.5 * interval))
+        return slot.closest(shutter_time)
+
     @staticmethod
     def list_available_cameras() -> List[Tuple[int, str]]:
-        """List all available cameras.
+        """List all available cameras (cached, see CameraDiscovery).
         
         Returns:
             List of tuples (device_id, device_name)
         """
-        cameras = []
-        backend = cv2.CAP_DSHOW if platform.system() == "Windows" else cv2.CAP_ANY
-        for i in range(10):  # Check first 10 indices
-            cap = cv2.VideoCapture(i, backend)
-            if cap.isOpened():
-                cameras.append((i, f"Camera {i}"))
-            cap.release()
-        return cameras
+        return default_discovery().cameras()
     
     def __del__(self):
         """Cleanup on deletion."""
@@ -0,0 +1,175 @@
+"""Webcam discovery without blocking the GUI."""
+import os
+import platform
+import re
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import cv2
+
+Camera = Tuple[int, str]
+
+_VIDEO_NODE = re.compile(r"^video(\d+)$")
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def list_v4l2_devices(sysfs_root: str = "/sys/class/video4linux",
+                      dev_root: str = "/dev") -> Optional[List[Camera]]:
+    """Cameras known to V4L2, read from sysfs without opening any device.
+
+    UVC drivers register a second node per camera for metadata; only the
+    first node of each device (sysfs ``index`` 0) can stream frames.
+
+    Returns:
+        List of (index, name) sorted by index, or None where sysfs is not
+        available (not Linux)
+    """
+    if not os.path.isdir(sysfs_root):
+        return None
+    cameras = []
+    for entry in os.listdir(sysfs_root):
+        match = _VIDEO_NODE.match(entry)
+        if not match or not os.path.exists(os.path.join(dev_root, entry)):
+            continue
+        node_dir = os.path.join(sysfs_root, entry)
+        if (_read_text(os.path.join(node_dir, "index")) or "0") != "0":
+            continue
+        index = int(match.group(1))
+        name = _read_text(os.path.join(node_dir, "name")) or f"Camera {index}"
+        cameras.append((index, name))
+    cameras.sort()
+    return cameras
+
+
+def probe_opencv_cameras(in_use: Iterable[int] = (), max_index: int = 10) -> List[Camera]:
+    """Cameras found by opening indices 0..max_index-1 (slow: one open each).
+
+    Indices in ``in_use`` are open elsewhere in the app: they are listed
+    without being opened, since a second open would compete for the device.
+    """
+    in_use = set(in_use)
+    cameras = []
+    backend = cv2.CAP_DSHOW if platform.system() == "Windows" else cv2.CAP_ANY
+    for i in range(max_index):
+        if i in in_use:
+            cameras.append((i, f"Camera {i}"))
+            continue
+        cap = cv2.VideoCapture(i, backend)
+        if cap.isOpened():
+            cameras.append((i, f"Camera {i}"))
+        cap.release()
+    return cameras
+
+
+class CameraDiscovery:
+    """Cached camera list, refreshed when devices come and go.
+
+    On Linux the list comes from sysfs and the cache is invalidated when
+    the set of /dev/video* nodes changes, which is a cheap directory
+    listing. Elsewhere the only option is opening devices through OpenCV;
+    that result is cached for ``ttl`` seconds. discover_async() keeps any
+    slow work off the caller's thread.
+    """
+
+    def __init__(self, ttl: float = 30.0, dev_root: str = "/dev",
+                 sysfs_root: str = "/sys/class/video4linux",
+                 probe: Callable[[Iterable[int]], List[Camera]] = probe_opencv_cameras):
+        """Initialize discovery.
+
+        Args:
+            ttl: Lifetime of an OpenCV probe result
+            dev_root: Where device nodes live
+            sysfs_root: V4L2 class directory in sysfs
+            probe: Fallback used when sysfs is unavailable, given the
+                indices not to open
+        """
+        self.ttl = ttl
+        self.dev_root = dev_root
+        self.sysfs_root = sysfs_root
+        self.probe = probe
+        self._cameras: Optional[List[Camera]] = None
+        self._signature: Optional[Tuple[str, ...]] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def probes(self) -> bool:
+        """True if a refresh opens devices (no sysfs to read them from)."""
+        return not os.path.isdir(self.sysfs_root)
+
+    def cameras(self, in_use: Iterable[int] = ()) -> List[Camera]:
+        """Current cameras as (index, name); may block on a fallback probe.
+
+        Args:
+            in_use: Indices the app has open, which a probe must not open
+        """
+        with self._lock:
+            signature = self._node_signature()
+            if self._cameras is not None and signature == self._signature and \
+                    (signature is not None or time.monotonic() < self._expires):
+                return list(self._cameras)
+            cameras = list_v4l2_devices(self.sysfs_root, self.dev_root)
+            if cameras is None:
+                cameras = self.probe(in_use)
+            self._cameras = cameras
+            self._signature = signature
+            self._expires = time.monotonic() + self.ttl
+            return list(cameras)
+
+    def cached(self) -> Optional[List[Camera]]:
+        """Last known list without any refresh (None before the first one)."""
+        with self._lock:
+            return list(self._cameras) if self._cameras is not None else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cameras = None
+
+    def discover_async(self, callback: Callable[[List[Camera]], None],
+                       in_use: Iterable[int] = ()) -> threading.Thread:
+        """Refresh on a worker thread and hand the list to ``callback`` there."""
+        in_use = tuple(in_use)
+
+        def run():
+            try:
+                cameras = self.cameras(in_use)
+            except Exception as e:
+                print(f"[CameraDiscovery] {e}")
+                cameras = []
+            callback(cameras)
+
+        thread = threading.Thread(target=run, name="camera-discovery", daemon=True)
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _node_signature(self) -> Optional[Tuple[str, ...]]:
+        """Names of the video device nodes, or None if they cannot be listed."""
+        if not os.path.isdir(self.sysfs_root):
+            return None
+        try:
+            return tuple(sorted(n for n in os.listdir(self.dev_root) if _VIDEO_NODE.match(n)))
+        except OSError:
+            return None
+
+
+_default_discovery: Optional[CameraDiscovery] = None
+
+
+def default_discovery() -> CameraDiscovery:
+    """Discovery shared by the whole application."""
+    global _default_discovery
+    if _default_discovery is None:
+        _default_discovery = CameraDiscovery()
+    return _default_discovery
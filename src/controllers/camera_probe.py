@@ -0,0 +1,154 @@
+"""Webcam capability probing: which capture mode actually delivers frames fastest."""
+import platform
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import cv2
+
+# Compressed first: most UVC cameras only reach 30 fps at 720p/1080p in MJPG
+DEFAULT_FOURCCS = ("MJPG", "YUYV")
+DEFAULT_FPS = (60, 30)
+DEFAULT_RESOLUTIONS = ((1920, 1080), (1280, 720), (640, 480))
+# DirectShow reports the same packed 4:2:2 format under another name
+_FOURCC_ALIASES = {"YUY2": "YUYV"}
+
+
+@dataclass
+class CameraMode:
+    """One capture mode and the frame rate it was measured to deliver."""
+    width: int
+    height: int
+    fourcc: str = ""          # empty: leave the driver's default
+    fps: int = 0              # requested rate, 0: leave the driver's default
+    measured_fps: float = 0.0
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CameraMode":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+def fourcc_name(code: float) -> str:
+    """Decode a CAP_PROP_FOURCC value ("" if the backend does not report one)."""
+    code = int(code)
+    if code <= 0:
+        return ""
+    name = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+    return _FOURCC_ALIASES.get(name, name)
+
+
+def apply_mode(capture, mode: CameraMode) -> None:
+    """Configure an open capture for ``mode``.
+
+    The pixel format goes first: V4L2 picks the frame sizes and rates it
+    offers per format, so size and rate set before it may be discarded.
+    """
+    if mode.fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    if mode.fps:
+        capture.set(cv2.CAP_PROP_FPS, mode.fps)
+
+
+def measure_throughput(capture, frames: int = 12, warmup: int = 2,
+                       timeout: float = 1.5) -> float:
+    """Frames per second actually read from ``capture`` (0 if it fails)."""
+    deadline = time.monotonic() + timeout
+    for _ in range(warmup):
+        ok, _ = capture.read()
+        if not ok or time.monotonic() > deadline:
+            return 0.0
+    start = time.monotonic()
+    count = 0
+    while count < frames and time.monotonic() < deadline:
+        ok, _ = capture.read()
+        if not ok:
+            break
+        count += 1
+    elapsed = time.monotonic() - start
+    return count / elapsed if count and elapsed > 0 else 0.0
+
+
+def probe_camera(device_id: int,
+                 resolutions: Iterable[Tuple[int, int]] = DEFAULT_RESOLUTIONS,
+                 fourccs: Iterable[str] = DEFAULT_FOURCCS,
+                 fps_options: Iterable[int] = DEFAULT_FPS,
+                 on_progress: Optional[Callable[[str], None]] = None,
+                 open_fn: Optional[Callable[[int], object]] = None) -> List[CameraMode]:
+    """Try capture modes on a device and measure what each delivers.
+
+    Modes the driver does not accept (another size or pixel format is
+    reported back) are skipped, as are requests that end up in a mode
+    already measured. The device must not be open elsewhere.
+
+    Args:
+        device_id: Camera index
+        resolutions: Frame sizes to try
+        fourccs: Pixel formats to try
+        fps_options: Frame rates to request
+        on_progress: Called with a short description before each mode
+        open_fn: Opens the device (defaults to cv2.VideoCapture)
+
+    Returns:
+        Working modes, fastest first
+    """
+    if open_fn is None:
+        backend = cv2.CAP_DSHOW if platform.system() == "Windows" else cv2.CAP_ANY
+        open_fn = lambda index: cv2.VideoCapture(index, backend)
+
+    capture = open_fn(device_id)
+    modes: List[CameraMode] = []
+    seen = set()
+    try:
+        if not capture.isOpened():
+            return []
+        for width, height in resolutions:
+            for fourcc in fourccs:
+                for fps in fps_options:
+                    if on_progress:
+                        on_progress(f"{width}x{height} {fourcc} {fps} i/s")
+                    requested = CameraMode(width, height, fourcc, fps)
+                    try:
+                        apply_mode(capture, requested)
+                        actual = (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                  int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                                  fourcc_name(capture.get(cv2.CAP_PROP_FOURCC)) or fourcc,
+                                  round(capture.get(cv2.CAP_PROP_FPS)))
+                    except Exception as e:
+                        print(f"[CameraProbe] {requested}: {e}")
+                        continue
+                    if actual[:3] != (width, height, fourcc) or actual in seen:
+                        continue
+                    seen.add(actual)
+                    requested.measured_fps = round(measure_throughput(capture), 1)
+                    if requested.measured_fps > 0:
+                        modes.append(requested)
+    finally:
+        capture.release()
+    modes.sort(key=lambda mode: mode.measured_fps, reverse=True)
+    return modes
+
+
+def best_modes(modes: Iterable[CameraMode]) -> Dict[Tuple[int, int], CameraMode]:
+    """Fastest mode for each resolution."""
+    best: Dict[Tuple[int, int], CameraMode] = {}
+    for mode in modes:
+        current = best.get(mode.resolution)
+        if current is None or mode.measured_fps > current.measured_fps:
+            best[mode.resolution] = mode
+    return best
+
+
+def saved_modes(camera_config, device_id: int) -> Dict[Tuple[int, int], CameraMode]:
+    """Best probed mode per resolution stored in the config for a device."""
+    entries = getattr(camera_config, "probed_modes", {}).get(str(device_id), [])
+    return best_modes(CameraMode.from_dict(entry) for entry in entries)
@@ -0,0 +1,101 @@
+"""Camera session shared by the screens that show a live preview."""
+import threading
+from typing import Optional
+
+
+class CameraSession:
+    """Keeps the camera device open across screen switches.
+
+    Screens acquire() the session while they show a preview and release()
+    it when hidden. When nobody holds it, frame grabbing is paused but the
+    device stays open, so returning to the capture screen shows a picture
+    immediately and auto-exposure does not have to settle again. The device
+    is released ``idle_release_seconds`` after the last holder left, or at
+    once by close() (settings changed, application exit).
+
+    The controller needs start()/stop()/is_active and may provide
+    pause()/resume() to stop and restart background grabbing.
+    """
+
+    def __init__(self, controller, idle_release_seconds: float = 120.0):
+        """Initialize session (the device is opened on first acquire()).
+
+        Args:
+            controller: CameraController or DSLRController
+            idle_release_seconds: Delay before an unused device is released;
+                0 releases it as soon as the last holder leaves
+        """
+        self.controller = controller
+        self.idle_release_seconds = idle_release_seconds
+        self._holders = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    @property
+    def holders(self) -> int:
+        """Number of screens currently holding the session."""
+        return self._holders
+
+    @property
+    def is_open(self) -> bool:
+        """True while the device is open (held or idling)."""
+        return bool(self.controller.is_active)
+
+    def acquire(self) -> bool:
+        """Open the device if needed and resume grabbing.
+
+        Returns:
+            True if the camera is ready; on failure the session is not held
+        """
+        with self._lock:
+            self._cancel_timer()
+            if self.controller.is_active:
+                self._call("resume")
+            elif not self.controller.start():
+                return False
+            self._holders += 1
+            return True
+
+    def release(self) -> None:
+        """Drop one hold; pause grabbing and arm the idle timer when unused."""
+        with self._lock:
+            if self._holders == 0:
+                return
+            self._holders -= 1
+            if self._holders > 0 or not self.controller.is_active:
+                return
+            if self.idle_release_seconds <= 0:
+                self.controller.stop()
+                return
+            self._call("pause")
+            self._timer = threading.Timer(self.idle_release_seconds, self._on_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def close(self) -> None:
+        """Release the device now, whoever holds the session."""
+        with self._lock:
+            self._cancel_timer()
+            self._holders = 0
+            self.controller.stop()
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _on_idle(self) -> None:
+        with self._lock:
+            if self._holders == 0 and self._timer is not None:
+                self._timer = None
+                print("[CameraSession] idle timeout, releasing camera")
+                self.controller.stop()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _call(self, name: str) -> None:
+        method = getattr(self.controller, name, None)
+        if method is not None:
+            method()
@@ -0,0 +1,121 @@
+"""Background post-capture pipeline: framing and JPEG writes off the GUI thread."""
+import dataclasses
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from src.controllers.photo_controller import PhotoController
+from src.models.photo import Photo
+
+
+@dataclass
+class CaptureJob:
+    """Futures for one captured photo moving through the pipeline."""
+    photo: Photo                  # Unframed capture, available immediately
+    original_path: Future         # Future[Optional[str]]: unframed JPEG on disk
+    framed: Future                # Future[Photo]: photo with frame applied
+    saved_path: Future            # Future[Optional[str]]: final JPEG on disk
+
+
+class CapturePipeline:
+    """Runs save-original, apply-frame and save-final on a worker pool.
+
+    The original JPEG is encoded in parallel with framing; the final JPEG is
+    written as soon as the framed image is ready. OpenCV and Pillow release
+    the GIL for encoding and resampling, so threads are enough here.
+    """
+
+    def __init__(self, photo_controller: PhotoController, max_workers: int = 2):
+        """Initialize pipeline.
+
+        Args:
+            photo_controller: Controller used to frame and save photos
+            max_workers: Number of worker threads
+        """
+        self.photo_controller = photo_controller
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="capture")
+
+    def submit(self, photo: Photo, save_to_disk: bool = True) -> CaptureJob:
+        """Queue a captured photo for framing and saving.
+
+        Args:
+            photo: Captured Photo; frame_path is applied if frame_applied is False
+            save_to_disk: Whether to write JPEGs
+
+        Returns:
+            CaptureJob whose futures resolve as each stage completes
+        """
+        timestamp = photo.timestamp.strftime("%Y%m%d_%H%M%S")
+        base_filename = f"photo_{timestamp}.jpg"
+        original_filename = f"photo_{timestamp}_original.jpg"
+        needs_frame = bool(photo.frame_path) and not photo.frame_applied
+
+        # Save original photo (without frame) if a frame will be applied
+        if save_to_disk and needs_frame:
+            original_path = self._executor.submit(
+                self.photo_controller.save_photo, photo, original_filename, thumbnail=False
+            )
+        else:
+            original_path = self._done(None)
+
+        # Apply frame on a copy so the unframed photo stays valid for display/saving
+        if needs_frame:
+            framed = self._executor.submit(
+                self.photo_controller.apply_frame, dataclasses.replace(photo), photo.frame_path
+            )
+        else:
+            framed = self._done(photo)
+
+        # Save final photo (with frame if any) once framing is done
+        saved_path: Future = Future()
+        if save_to_disk:
+            framed.add_done_callback(
+                lambda f: self._chain(f, saved_path, base_filename)
+            )
+        else:
+            saved_path.set_result(None)
+
+        return CaptureJob(photo=photo, original_path=original_path, framed=framed, saved_path=saved_path)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _done(result) -> Future:
+        future: Future = Future()
+        future.set_result(result)
+        return future
+
+    def _chain(self, framed: Future, saved_path: Future, filename: str) -> None:
+        if framed.exception() is not None:
+            saved_path.set_exception(framed.exception())
+            return
+        try:
+            inner = self._executor.submit(self.photo_controller.save_photo, framed.result(), filename)
+        except RuntimeError as e:  # executor shut down
+            saved_path.set_exception(e)
+            return
+        inner.add_done_callback(lambda f: self._forward(f, saved_path))
+
+    @staticmethod
+    def _forward(source: Future, target: Future) -> None:
+        if source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+
+
+def wait_for_path(future: Optional[Future], timeout: float = 10.0) -> Optional[str]:
+    """Block until a saved-path future resolves; None on failure or timeout."""
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=timeout)
+    except Exception as e:
+        print(f"[CapturePipeline] save failed: {e}")
+        return None
@@ -0,0 +1,202 @@
+"""Alpha compositing of frame overlays directly on uint8 NumPy arrays."""
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Span kinds produced by analyse_alpha()
+SPAN_TRANSPARENT = 0
+SPAN_OPAQUE = 1
+SPAN_PARTIAL = 2
+
+# A span is (y0, y1, x0, x1, kind), half-open pixel bounds
+Span = Tuple[int, int, int, int, int]
+
+
+def analyse_alpha(alpha: np.ndarray, tile: int = 32) -> List[Span]:
+    """Split an alpha mask into transparent, opaque and partial regions.
+
+    The mask is classified in ``tile`` x ``tile`` blocks. Adjacent blocks of
+    the same kind are merged into horizontal runs, and consecutive tile rows
+    with identical runs are merged vertically, so a typical border frame
+    reduces to a handful of spans.
+
+    Args:
+        alpha: (h, w) uint8 alpha mask
+        tile: Tile edge length in pixels
+
+    Returns:
+        List of (y0, y1, x0, x1, kind) spans covering the whole mask
+    """
+    height, width = alpha.shape[:2]
+    rows = -(-height // tile)
+    cols = -(-width // tile)
+
+    # Pad with a neutral value (repeat edge) so partial edge tiles classify correctly
+    padded = np.pad(alpha, ((0, rows * tile - height), (0, cols * tile - width)), mode='edge')
+    blocks = padded.reshape(rows, tile, cols, tile)
+    tile_min = blocks.min(axis=(1, 3))
+    tile_max = blocks.max(axis=(1, 3))
+
+    kinds = np.full((rows, cols), SPAN_PARTIAL, dtype=np.uint8)
+    kinds[tile_max == 0] = SPAN_TRANSPARENT
+    kinds[tile_min == 255] = SPAN_OPAQUE
+
+    spans: List[Span] = []
+    previous_runs = None
+    group_start = 0
+    for row in range(rows + 1):
+        runs = _row_runs(kinds[row], tile, width) if row < rows else None
+        if runs == previous_runs:
+            continue
+        if previous_runs is not None:
+            y0, y1 = group_start * tile, min(height, row * tile)
+            spans.extend((y0, y1, x0, x1, kind) for x0, x1, kind in previous_runs)
+        previous_runs = runs
+        group_start = row
+    return spans
+
+
+def _row_runs(kinds: np.ndarray, tile: int, width: int) -> List[Tuple[int, int, int]]:
+    runs = []
+    start = 0
+    for col in range(1, len(kinds) + 1):
+        if col == len(kinds) or kinds[col] != kinds[start]:
+            runs.append((start * tile, min(width, col * tile), int(kinds[start])))
+            start = col
+    return runs
+
+
+@dataclass
+class FrameAsset:
+    """A frame overlay prepared for compositing.
+
+    Colours are stored premultiplied by alpha so blending a camera pixel
+    only needs ``premultiplied + background * inverse_alpha / 255``.
+    ``spans`` records which regions are fully transparent or opaque so the
+    compositor only blends where alpha is actually partial.
+    """
+    premultiplied: np.ndarray  # (h, w, 3) uint8, colour * alpha / 255 (floored)
+    inverse_alpha: np.ndarray  # (h, w, 1) uint8, 255 - alpha
+    spans: List[Span] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.spans:
+            height, width = self.premultiplied.shape[:2]
+            self.spans = [(0, height, 0, width, SPAN_PARTIAL)]
+
+    @classmethod
+    def from_rgba(cls, rgba: np.ndarray, tile: int = 32) -> "FrameAsset":
+        """Build an asset from an (h, w, 4) uint8 RGBA array."""
+        rgba = np.asarray(rgba, dtype=np.uint8)
+        alpha = rgba[:, :, 3:4].astype(np.uint16)
+        # Floor (not round) so premultiplied + blended background never exceeds 255
+        premultiplied = (rgba[:, :, :3] * alpha // 255).astype(np.uint8)
+        inverse_alpha = (255 - rgba[:, :, 3:4]).astype(np.uint8)
+        return cls(
+            premultiplied=premultiplied,
+            inverse_alpha=inverse_alpha,
+            spans=analyse_alpha(rgba[:, :, 3], tile),
+        )
+
+    @property
+    def blended_fraction(self) -> float:
+        """Share of pixels that need a real blend (partial alpha)."""
+        height, width = self.premultiplied.shape[:2]
+        partial = sum(
+            (y1 - y0) * (x1 - x0) for y0, y1, x0, x1, kind in self.spans if kind == SPAN_PARTIAL
+        )
+        return partial / float(max(1, height * width))
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) of the overlay."""
+        height, width = self.premultiplied.shape[:2]
+        return width, height
+
+    @property
+    def nbytes(self) -> int:
+        return self.premultiplied.nbytes + self.inverse_alpha.nbytes
+
+
+class Compositor:
+    """Blends RGB images under a FrameAsset without intermediate RGBA copies.
+
+    Transparent spans pass the background through (no work at all when
+    compositing in place), opaque spans are a straight copy of the overlay,
+    and only partial spans are blended. Blending is done in horizontal bands
+    so the uint16 scratch buffers stay small and cache-friendly; they are
+    allocated once per thread and reused between calls.
+    """
+
+    def __init__(self, band_rows: int = 64):
+        """Initialize compositor.
+
+        Args:
+            band_rows: Number of rows blended per pass
+        """
+        self.band_rows = max(1, band_rows)
+        self._local = threading.local()
+
+    def composite(
+        self,
+        background: np.ndarray,
+        asset: FrameAsset,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Composite ``asset`` over ``background``.
+
+        Args:
+            background: (h, w, 3) uint8 image, same size as the asset
+            asset: Prepared frame overlay
+            out: Optional preallocated (h, w, 3) uint8 output; may be ``background``
+
+        Returns:
+            The output array
+        """
+        height, width = background.shape[:2]
+        if (width, height) != asset.size or background.shape[2:] != (3,):
+            raise ValueError(
+                f"background {background.shape} does not match frame asset {asset.size}"
+            )
+        if out is None:
+            out = np.empty_like(background)
+
+        in_place = out is background
+        for y0, y1, x0, x1, kind in asset.spans:
+            if kind == SPAN_TRANSPARENT:
+                if not in_place:
+                    out[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+            elif kind == SPAN_OPAQUE:
+                out[y0:y1, x0:x1] = asset.premultiplied[y0:y1, x0:x1]
+            else:
+                for band in range(y0, y1, self.band_rows):
+                    band_end = min(y1, band + self.band_rows)
+                    self._blend(
+                        background[band:band_end, x0:x1],
+                        asset.premultiplied[band:band_end, x0:x1],
+                        asset.inverse_alpha[band:band_end, x0:x1],
+                        out[band:band_end, x0:x1],
+                    )
+        return out
+
+    def _blend(self, background, premultiplied, inverse_alpha, out) -> None:
+        rows, width = background.shape[:2]
+        scratch, carry = self._buffers(rows, width)
+
+        # scratch = round(background * inverse_alpha / 255), exact for 8-bit input
+        np.multiply(background, inverse_alpha, out=scratch, dtype=np.uint16)
+        scratch += 128
+        np.right_shift(scratch, 8, out=carry)
+        scratch += carry
+        scratch >>= 8
+        np.add(scratch, premultiplied, out=out, casting='unsafe')
+
+    def _buffers(self, rows: int, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        local = self._local
+        if getattr(local, "scratch", None) is None or local.scratch.shape[1] < width:
+            shape = (self.band_rows, width, 3)
+            local.scratch = np.empty(shape, dtype=np.uint16)
+            local.carry = np.empty(shape, dtype=np.uint16)
+        return local.scratch[:rows, :width], local.carry[:rows, :width]
@@ -1,42 +1,81 @@
 """DSLR camera controller using gphoto2 subprocess."""
+import io
 import os
 import platform
 import subprocess
-import tempfile
+import time
 from datetime import datetime
 from typing import List, Optional, Tuple
 
 import numpy as np
 from PIL import Image
 
+from src.controllers.frame_grabber import FramePacket
+from src.controllers.gphoto2_session import GPhoto2Session
+from src.controllers.mjpeg_stream import MjpegLiveView
+from src.controllers.photo_controller import cover_geometry
 from src.models.photo import Photo
 
 # Suppress console window on Windows when spawning gphoto2
 _CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
 
 
+def decode_jpeg(data: bytes, cover_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Decode JPEG bytes to an RGB array.
+
+    Args:
+        data: Encoded JPEG
+        cover_size: Optional (width, height) the image will be scaled to
+            cover. The decoder then uses DCT scaling (1/2, 1/4, 1/8) to
+            produce the smallest image that still covers it.
+
+    Returns:
+        RGB image data
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        if cover_size:
+            _, new_w, new_h, _, _ = cover_geometry(img.width, img.height, *cover_size)
+            if new_w < img.width:
+                img.draft("RGB", (new_w, new_h))
+        return np.array(img.convert("RGB"))
+
+
 class DSLRController:
     """Controls a DSLR camera via the gphoto2 command-line tool.
 
     Supports any camera recognised by gphoto2 (including Olympus E-500).
     Requires gphoto2 to be installed and on PATH, or a full path provided.
+
+    By default preview and capture commands go through one persistent
+    ``gphoto2 --shell`` session; if the shell cannot be started the
+    controller falls back to one gphoto2 process per command.
+
+    With ``live_view`` the preview instead streams ``--capture-movie`` MJPEG
+    at the camera's native rate. Cameras without movie support end the
+    stream immediately and the controller falls back to polled previews.
     """
 
-    def __init__(self, gphoto2_path: str = "gphoto2"):
+    def __init__(self, gphoto2_path: str = "gphoto2", use_session: bool = True,
+                 live_view: bool = False):
         self.gphoto2_path = gphoto2_path or "gphoto2"
+        self.use_session = use_session
+        self.live_view_enabled = live_view
+        self.session: Optional[GPhoto2Session] = None
+        self.live_view: Optional[MjpegLiveView] = None
         self.is_active = False
         self.last_error: str = ""
+        self._seq = 0
 
     # ------------------------------------------------------------------ #
     #  Internal helpers                                                     #
     # ------------------------------------------------------------------ #
 
-    def _run(self, args: list, timeout: int = 15) -> subprocess.CompletedProcess:
+    def _run(self, args: list, timeout: int = 15, text: bool = True) -> subprocess.CompletedProcess:
         cmd = [self.gphoto2_path] + args
         return subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
+            text=text,
             timeout=timeout,
             creationflags=_CREATION_FLAGS,
         )
@@ -53,6 +92,8 @@ class DSLRController:
             self.is_active = len(cameras) > 0
             if not self.is_active:
                 self.last_error = "Aucun appareil détecté par gphoto2"
+            elif not (self.live_view_enabled and self.start_live_view()) and self.use_session:
+                self._start_session()
             return self.is_active
         except FileNotFoundError:
             self.last_error = f"gphoto2 introuvable : {self.gphoto2_path}"
@@ -65,56 +106,175 @@ class DSLRController:
             return False
 
     def stop(self) -> None:
+        self._stop_live_view()
+        if self.session:
+            self.session.stop()
+            self.session = None
         self.is_active = False
 
+    @property
+    def device_key(self) -> Tuple[str, str]:
+        """Identifies the camera, independent of live-view settings."""
+        return ("dslr", self.gphoto2_path)
+
+    def pause(self) -> None:
+        """Stop the live-view stream; the shell session stays open."""
+        self._stop_live_view()
+
+    def resume(self) -> None:
+        """Restart the live-view stream after pause()."""
+        if self.is_active and self.live_view_enabled and self.live_view is None:
+            if not self.start_live_view() and self.use_session:
+                self._start_session()
+
+    def start_live_view(self) -> bool:
+        """Stream live view with ``gphoto2 --capture-movie --stdout``.
+
+        The stream owns the USB device, so any shell session is closed first.
+        """
+        if self.session:
+            self.session.stop()
+            self.session = None
+        live_view = MjpegLiveView([self.gphoto2_path, "--capture-movie", "--stdout"])
+        if not live_view.start():
+            return False
+        self.live_view = live_view
+        return True
+
+    def _stop_live_view(self) -> None:
+        if self.live_view:
+            self.live_view.stop()
+            self.live_view = None
+
+    @property
+    def measured_fps(self) -> float:
+        """Decoded live-view frame rate (0 when polling single previews)."""
+        return self.live_view.fps if self.live_view else 0.0
+
+    def _start_session(self) -> None:
+        """Open the persistent shell; keep per-command mode if it fails."""
+        session = GPhoto2Session(self.gphoto2_path)
+        if session.start():
+            self.session = session
+        else:
+            print(f"[DSLRController] shell session unavailable: {session.last_error}")
+            self.session = None
+
+    def _session_command(self, action: str) -> Optional[bytes]:
+        """Run a session helper, restarting the shell once if it died."""
+        if not self.session.is_running:
+            self.session.stop()
+            if not self.session.start():
+                raise RuntimeError(self.session.last_error)
+        data = getattr(self.session, action)()
+        if data is None:
+            self.last_error = self.session.last_error
+        return data
+
     def get_frame(self) -> Optional[np.ndarray]:
         """Capture a live-view preview frame from the camera."""
-        tmp = None
+        if self.live_view is not None:
+            if self.live_view.is_running:
+                packet = self.live_view.slot.latest()
+                return packet.to_rgb() if packet else None
+            # Stream ended (no movie support on this body): poll previews instead
+            print("[DSLRController] live view stream ended, falling back to previews")
+            self._stop_live_view()
+            if self.use_session:
+                self._start_session()
+
+        if self.session:
+            try:
+                data = self._session_command("capture_preview")
+                return decode_jpeg(data) if data else None
+            except Exception as e:
+                print(f"[DSLRController] preview error: {e}")
+                return None
+
         try:
-            with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as f:
-                tmp = f.name
-            self._run(
-                ["--capture-preview", f"--filename={tmp}", "--force-overwrite"],
-                timeout=10,
-            )
-            if tmp and os.path.exists(tmp) and os.path.getsize(tmp) > 0:
-                img = Image.open(tmp).convert("RGB")
-                return np.array(img)
+            data = self._download(["--capture-preview"], timeout=10)
+            return decode_jpeg(data) if data else None
         except Exception as e:
             print(f"[DSLRController] preview error: {e}")
-        finally:
-            if tmp and os.path.exists(tmp):
-                os.unlink(tmp)
         return None
 
-    def capture_photo(self, frame_path: Optional[str] = None) -> Optional[Photo]:
-        """Trigger the shutter, download the full-resolution image."""
-        tmp = None
+    def get_frame_packet(self) -> Optional[FramePacket]:
+        """Capture a live-view frame tagged with a sequence number and timestamp."""
+        if self.live_view is not None and self.live_view.is_running:
+            return self.live_view.slot.latest()
+        frame = self.get_frame()
+        if frame is None:
+            return None
+        self._seq += 1
+        return FramePacket(frame=frame, seq=self._seq, timestamp=time.monotonic())
+
+    def capture_photo(self, frame_path: Optional[str] = None,
+                      shutter_time: Optional[float] = None) -> Optional[Photo]:
+        """Trigger the shutter, download the full-resolution image.
+
+        ``shutter_time`` is accepted for interface parity with
+        CameraController; the DSLR fires its own shutter on request.
+        """
+        if self.live_view is None:
+            return self._capture(frame_path)
+
+        # Movie capture holds the camera: pause it for the still, then resume
+        self._stop_live_view()
+        if self.use_session:
+            self._start_session()
         try:
-            with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as f:
-                tmp = f.name
-            result = self._run(
-                ["--capture-image-and-download", f"--filename={tmp}", "--force-overwrite"],
-                timeout=30,
-            )
-            if tmp and os.path.exists(tmp) and os.path.getsize(tmp) > 0:
-                img = Image.open(tmp).convert("RGB")
+            return self._capture(frame_path)
+        finally:
+            if self.session:
+                self.session.stop()
+                self.session = None
+            self.start_live_view()
+
+    def _capture(self, frame_path: Optional[str]) -> Optional[Photo]:
+        """Fire the shutter and download the image into memory.
+
+        The JPEG comes back as bytes (gphoto2 ``--stdout``, or the session's
+        tmpfs workdir) and is kept on the Photo so it can be saved verbatim.
+        With a frame, only the resolution the framed print needs is decoded.
+        """
+        try:
+            if self.session:
+                data = self._session_command("capture_image")
+            else:
+                data = self._download(["--capture-image-and-download"], timeout=30)
+            if data:
                 return Photo(
-                    image_data=np.array(img),
+                    image_data=decode_jpeg(data, self._output_size(frame_path)),
                     timestamp=datetime.now(),
                     frame_path=frame_path,
+                    encoded_data=data,
                 )
-            self.last_error = result.stderr.strip() or "Aucun fichier reçu"
         except subprocess.TimeoutExpired:
             self.last_error = "Délai dépassé lors de la capture"
         except Exception as e:
             self.last_error = str(e)
             print(f"[DSLRController] capture error: {e}")
-        finally:
-            if tmp and os.path.exists(tmp):
-                os.unlink(tmp)
         return None
 
+    def _download(self, args: list, timeout: int) -> Optional[bytes]:
+        """Run a one-shot gphoto2 command that writes the file to stdout."""
+        result = self._run(args + ["--stdout"], timeout=timeout, text=False)
+        if result.stdout:
+            return result.stdout
+        self.last_error = result.stderr.decode(errors="replace").strip() or "Aucun fichier reçu"
+        return None
+
+    @staticmethod
+    def _output_size(frame_path: Optional[str]) -> Optional[Tuple[int, int]]:
+        """Size of the framed print (the frame image), or None if unframed."""
+        if not frame_path or not os.path.exists(frame_path):
+            return None
+        try:
+            with Image.open(frame_path) as img:   # reads the header only
+                return img.size
+        except OSError:
+            return None
+
     # ------------------------------------------------------------------ #
     #  Utilities                                                            #
     # ------------------------------------------------------------------ #
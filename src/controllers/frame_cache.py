@@ -0,0 +1,121 @@
+"""Decoded frame-asset cache shared by the preview and final compositing paths."""
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.controllers.compositor import FrameAsset
+
+
+class FrameAssetCache:
+    """LRU cache of decoded, pre-scaled frame overlays.
+
+    Entries are keyed by (path, mtime, target size) so that an edited frame
+    PNG is reloaded automatically. Least-recently-used entries are evicted
+    once the decoded pixels exceed ``max_bytes``; the most recent entry is
+    always kept so a single oversized frame still benefits from caching.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory cap for decoded overlays, in bytes
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, FrameAsset]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cached overlays, in bytes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        frame_path: str,
+        size: Optional[Tuple[int, int]] = None,
+        crop: Optional[Tuple[int, int, int, int]] = None,
+        pixel_format: str = "RGB",
+    ) -> FrameAsset:
+        """Return the decoded overlay for a frame.
+
+        Args:
+            frame_path: Path to frame image
+            size: Optional (width, height) to pre-scale to; natural size if None
+            crop: Optional (left, top, width, height) taken after scaling
+            pixel_format: Channel order of the images it will be blended onto
+                ("RGB" or "BGR")
+
+        Returns:
+            Premultiplied FrameAsset. Callers must treat it as read-only.
+        """
+        key = self._key(frame_path, size, crop, pixel_format)
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return frame
+            self.misses += 1
+
+        frame = self._load(frame_path, size, crop, pixel_format)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = frame
+                self._nbytes += frame.nbytes
+                self._evict()
+        return frame
+
+    def invalidate(self, frame_path: str) -> None:
+        """Drop every cached size of a frame."""
+        path = os.path.abspath(frame_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._nbytes -= self._entries.pop(key).nbytes
+
+    def clear(self) -> None:
+        """Drop all cached overlays."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _key(frame_path: str, size, crop, pixel_format) -> tuple:
+        path = os.path.abspath(frame_path)
+        mtime = os.stat(path).st_mtime_ns
+        return (path, mtime, tuple(size) if size else None, tuple(crop) if crop else None,
+                pixel_format)
+
+    @staticmethod
+    def _load(frame_path: str, size, crop, pixel_format) -> FrameAsset:
+        with Image.open(frame_path) as img:
+            frame = img.convert('RGBA')
+        if size and frame.size != tuple(size):
+            frame = frame.resize(tuple(size), Image.Resampling.LANCZOS)
+        if crop:
+            left, top, width, height = crop
+            frame = frame.crop((left, top, left + width, top + height))
+        rgba = np.asarray(frame)
+        if pixel_format == "BGR":
+            rgba = rgba[:, :, [2, 1, 0, 3]]
+        return FrameAsset.from_rgba(rgba)
+
+    def _evict(self) -> None:
+        while self._nbytes > self.max_bytes and len(self._entries) > 1:
+            _, frame = self._entries.popitem(last=False)
+            self._nbytes -= frame.nbytes
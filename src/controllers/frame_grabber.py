@@ -0,0 +1,209 @@
+"""Background frame grabbing with a latest-frame slot."""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+
+# Channel order of FramePacket.frame
+RGB = "RGB"
+BGR = "BGR"
+RGBA = "RGBA"
+
+_TO_RGB = {BGR: cv2.COLOR_BGR2RGB, RGBA: cv2.COLOR_RGBA2RGB}
+
+
+@dataclass
+class FramePacket:
+    """A camera frame tagged with its sequence number, capture time and layout.
+
+    Frames are handed on in the format the source produced (OpenCV webcams
+    give BGR); the stage that needs another format converts, once.
+    """
+    frame: np.ndarray
+    seq: int                  # Monotonically increasing, starts at 1
+    timestamp: float          # time.monotonic() when the frame was read
+    pixel_format: str = RGB   # RGB | BGR | RGBA
+
+    @property
+    def stride(self) -> int:
+        """Bytes per row of ``frame``."""
+        return self.frame.strides[0]
+
+    def to_rgb(self) -> np.ndarray:
+        """The frame as RGB; the array itself if it already is."""
+        code = _TO_RGB.get(self.pixel_format)
+        return self.frame if code is None else cv2.cvtColor(self.frame, code)
+
+
+class LatestFrameSlot:
+    """Single-frame mailbox: the writer replaces, readers never block.
+
+    Readers compare ``seq`` with the last one they handled to skip work
+    when no new frame has arrived. The last ``history_size`` frames are also
+    kept in a pre-capture ring so a capture can pick the frame closest to
+    the shutter instant rather than whatever arrives next. ``on_evict`` is
+    called with each frame array as it leaves the ring, e.g. to return it
+    to a FrameBufferPool.
+    """
+
+    def __init__(self, history_size: int = 1,
+                 on_evict: Optional[Callable[[np.ndarray], None]] = None):
+        self._packet: Optional[FramePacket] = None
+        self._seq = 0
+        self._history: deque = deque()
+        self._history_size = max(1, history_size)
+        self._on_evict = on_evict
+        self._cond = threading.Condition()
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest frame (0 if none yet)."""
+        return self._seq
+
+    def publish(self, frame: np.ndarray, timestamp: Optional[float] = None,
+                pixel_format: str = RGB) -> FramePacket:
+        """Store a new frame, replacing the previous one."""
+        with self._cond:
+            self._seq += 1
+            packet = FramePacket(
+                frame=frame,
+                seq=self._seq,
+                timestamp=time.monotonic() if timestamp is None else timestamp,
+                pixel_format=pixel_format,
+            )
+            self._packet = packet
+            if len(self._history) == self._history_size:
+                self._evict(self._history.popleft())
+            self._history.append(packet)
+            self._cond.notify_all()
+        return packet
+
+    def latest(self) -> Optional[FramePacket]:
+        """Return the newest frame without blocking, or None."""
+        return self._packet
+
+    def wait_newer(self, seq: int, timeout: float) -> Optional[FramePacket]:
+        """Block until a frame newer than ``seq`` arrives or ``timeout`` expires."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq, timeout=timeout)
+            return self._packet if self._seq > seq else None
+
+    def history(self) -> List[FramePacket]:
+        """Return the buffered frames, oldest first."""
+        with self._cond:
+            return list(self._history)
+
+    def closest(self, timestamp: float) -> Optional[FramePacket]:
+        """Return the buffered frame whose timestamp is closest to ``timestamp``."""
+        with self._cond:
+            if not self._history:
+                return None
+            return min(self._history, key=lambda p: abs(p.timestamp - timestamp))
+
+    def clear(self) -> None:
+        with self._cond:
+            self._packet = None
+            while self._history:
+                self._evict(self._history.popleft())
+
+    def _evict(self, packet: FramePacket) -> None:
+        if self._on_evict is not None:
+            self._on_evict(packet.frame)
+
+
+class FrameGrabber:
+    """Reads frames continuously on a dedicated thread into a LatestFrameSlot.
+
+    A stalled ``read_fn`` only stalls this thread; consumers keep getting
+    the last good frame.
+    """
+
+    def __init__(self, read_fn: Callable[[], Optional[np.ndarray]], name: str = "frame-grabber",
+                 history_size: int = 1,
+                 on_evict: Optional[Callable[[np.ndarray], None]] = None,
+                 pixel_format: str = RGB):
+        """Initialize grabber.
+
+        Args:
+            read_fn: Blocking callable returning the next frame, or None on failure
+            name: Thread name
+            history_size: Number of recent frames kept for pre-capture
+            on_evict: Called with each frame leaving the pre-capture ring
+            pixel_format: Channel order of the frames read_fn returns
+        """
+        self.read_fn = read_fn
+        self.name = name
+        self.pixel_format = pixel_format
+        self.slot = LatestFrameSlot(history_size, on_evict)
+        self.fps = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._exited = True     # reader left its loop (set under _lock)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the reader thread (no-op if already running).
+
+        A reader that stop() could not join (stuck in ``read_fn``) is still
+        the reader: it is told to carry on rather than joined by a second
+        one reading the same device.
+        """
+        with self._lock:
+            self._stop.clear()
+            if self._thread is not None and not self._exited:
+                return
+            self._exited = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> bool:
+        """Stop the reader thread and wait for it to exit.
+
+        Returns:
+            False if it was still running after ``timeout``; the device must
+            not be released or reconfigured then
+        """
+        self._stop.set()
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"[FrameGrabber] {self.name} still reading after {timeout:.1f} s")
+            return False
+        self._thread = None
+        return True
+
+    def _run(self) -> None:
+        last = None
+        while True:
+            if self._stop.is_set():
+                # Decided under the lock, so start() either sees this reader
+                # gone or clears _stop in time for it to carry on
+                with self._lock:
+                    if self._stop.is_set():
+                        self._exited = True
+                        return
+            try:
+                frame = self.read_fn()
+            except Exception as e:
+                print(f"[FrameGrabber] read error: {e}")
+                frame = None
+            if frame is None:
+                # Device hiccup: back off briefly instead of spinning
+                self._stop.wait(0.01)
+                continue
+
+            now = time.monotonic()
+            self.slot.publish(frame, now, self.pixel_format)
+            if last is not None and now > last:
+                # Exponential moving average of the delivered frame rate
+                self.fps = 0.9 * self.fps + 0.1 * (1.0 / (now - last)) if self.fps else 1.0 / (now - last)
+            last = now
@@ -0,0 +1,63 @@
+"""Reusable frame buffers for the camera read path."""
+import threading
+from collections import deque
+from typing import Tuple
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """Hands out preallocated image arrays and takes them back.
+
+    lease() returns a free buffer of the requested shape, allocating only
+    when none is free; release() gives it back. Buffers are reused oldest
+    first and ``spare`` released buffers are always held back, so a frame
+    stays intact for at least ``spare`` more leases after its release. That
+    grace period lets a consumer finish with a frame that has just left
+    the ring; anything kept longer (a captured photo) must be copied.
+
+    A new shape (resolution change) drops the buffers of the old one.
+    """
+
+    def __init__(self, capacity: int = 12, spare: int = 2, dtype=np.uint8):
+        """Initialize pool.
+
+        Args:
+            capacity: Free buffers kept for reuse; extra releases are dropped
+            spare: Released buffers held back before reuse
+            dtype: Element type of the buffers
+        """
+        self.capacity = max(capacity, spare + 1)
+        self.spare = spare
+        self.dtype = dtype
+        self.allocations = 0          # buffers created so far (for diagnostics)
+        self._shape: Tuple[int, ...] = ()
+        self._free: deque = deque()
+        self._lock = threading.Lock()
+
+    def lease(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Take a buffer of ``shape``; its contents are undefined."""
+        shape = tuple(shape)
+        with self._lock:
+            if shape != self._shape:
+                self._shape = shape
+                self._free.clear()
+            if len(self._free) > self.spare:
+                return self._free.popleft()
+            self.allocations += 1
+        return np.empty(shape, dtype=self.dtype)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a leased buffer; it may be handed out again later."""
+        with self._lock:
+            if buffer.shape == self._shape and len(self._free) < self.capacity:
+                self._free.append(buffer)
+
+    @property
+    def free(self) -> int:
+        """Number of buffers ready for reuse."""
+        return len(self._free)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._free.clear()
@@ -0,0 +1,122 @@
+"""Adaptive pacing for live previews."""
+import time
+from typing import Optional, Tuple
+
+# Degradation steps: (preview resolution scale, frame-rate divisor)
+LEVELS: Tuple[Tuple[float, int], ...] = ((1.0, 1), (0.75, 1), (0.5, 1), (0.5, 2))
+
+
+def source_fps(controller) -> float:
+    """Best known frame rate of a camera controller (0 if unknown).
+
+    The rate measured by the reader thread wins over the negotiated one.
+    """
+    return (getattr(controller, "measured_fps", 0.0)
+            or getattr(controller, "negotiated_fps", 0.0)
+            or 0.0)
+
+
+class FrameScheduler:
+    """Decides how often a preview pulls frames and how much it renders.
+
+    The pull interval follows the source's frame rate, so a 15 fps camera
+    is not polled every 30 ms and a 60 fps one is not throttled. Each tick
+    reports its cost; when the smoothed cost stays above ``budget`` of the
+    frame period the scheduler steps down (smaller preview, then half rate)
+    and steps back up once it stays well below. The frame rate actually
+    shown is tracked in ``achieved_fps``.
+    """
+
+    def __init__(self, fps: float = 30.0, budget: float = 0.8, patience: int = 10,
+                 min_fps: float = 0.5, max_fps: float = 60.0):
+        """Initialize scheduler.
+
+        Args:
+            fps: Frame rate assumed until the source reports one
+            budget: Fraction of the frame period a tick may cost
+            patience: Consecutive over/under-budget ticks before changing level
+            min_fps, max_fps: Bounds for the source rate
+        """
+        self.budget = budget
+        self.patience = patience
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.source_fps = fps
+        self.level = 0
+        self.cost_ms = 0.0
+        self.achieved_fps = 0.0
+        self._over = 0
+        self._under = 0
+        self._last_shown: Optional[float] = None
+
+    @property
+    def resolution_scale(self) -> float:
+        """Factor to apply to the preview size at the current level."""
+        return LEVELS[self.level][0]
+
+    @property
+    def interval_ms(self) -> int:
+        """Timer period matching the source rate (and level)."""
+        return max(1, int(round(1000.0 * LEVELS[self.level][1] / self.source_fps)))
+
+    @property
+    def render_interval(self) -> float:
+        """Seconds a renderer should leave between frames (0: render every frame)."""
+        if LEVELS[self.level][1] == 1:
+            return 0.0
+        # A little slack so a slightly early source frame is not skipped
+        return 0.9 * self.interval_ms / 1000.0
+
+    @property
+    def poll_interval(self) -> float:
+        """Seconds to wait before asking the source again when it had nothing new."""
+        return min(0.02, max(0.002, 0.125 / self.source_fps))
+
+    def set_source_fps(self, fps: float) -> None:
+        """Update the source rate; ignored while it is unknown (0)."""
+        if fps and fps > 0:
+            self.source_fps = min(self.max_fps, max(self.min_fps, float(fps)))
+
+    def record_cost(self, cost_ms: float) -> bool:
+        """Report the cost of one tick.
+
+        Returns:
+            True if the level changed (callers re-apply size and interval)
+        """
+        self.cost_ms = 0.8 * self.cost_ms + 0.2 * cost_ms if self.cost_ms else cost_ms
+        period_ms = 1000.0 / self.source_fps
+        if self.cost_ms > self.budget * period_ms:
+            self._over += 1
+            self._under = 0
+        elif self.cost_ms < 0.5 * self.budget * period_ms:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.patience and self.level < len(LEVELS) - 1:
+            self.level += 1
+        elif self._under >= 3 * self.patience and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self._over = self._under = 0
+        # The new level changes the cost: measure it afresh
+        self.cost_ms = 0.0
+        return True
+
+    def frame_shown(self, now: Optional[float] = None) -> None:
+        """Count a displayed frame towards ``achieved_fps``."""
+        now = time.monotonic() if now is None else now
+        if self._last_shown is not None and now > self._last_shown:
+            fps = 1.0 / (now - self._last_shown)
+            self.achieved_fps = 0.9 * self.achieved_fps + 0.1 * fps if self.achieved_fps else fps
+        self._last_shown = now
+
+    def reset(self) -> None:
+        """Forget measurements (new camera or preview restarted)."""
+        self.level = 0
+        self.cost_ms = 0.0
+        self.achieved_fps = 0.0
+        self._over = self._under = 0
+        self._last_shown = None
@@ -0,0 +1,239 @@
+"""Long-lived gphoto2 --shell session driven over pipes."""
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Suppress console window on Windows when spawning gphoto2
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# "gphoto2: {/local/dir} /remote/folder> " — printed after every command
+_PROMPT = re.compile(rb"gphoto2: \{[^}]*\}[^\n]*> $")
+_SAVED = re.compile(r"Saving file as (.+?)\s*$", re.MULTILINE)
+
+# RAM-backed directory for downloads, when the system has one
+_TMPFS_DIRS = ("/dev/shm",)
+
+
+def _download_dir() -> Optional[str]:
+    """Return a writable tmpfs directory, or None for the default temp dir."""
+    for path in _TMPFS_DIRS:
+        if os.path.isdir(path) and os.access(path, os.W_OK):
+            return path
+    return None
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one shell command."""
+    command: str
+    output: str
+    latency_ms: float
+    saved_files: List[str] = field(default_factory=list)  # absolute paths
+
+
+class GPhoto2Session:
+    """Keeps one ``gphoto2 --shell`` process open for the camera.
+
+    Detecting the camera over USB once, instead of once per command, is what
+    makes live view usable. All commands (preview and capture) go through a
+    single queue and worker thread so they never interleave on the pipe.
+    Files the shell saves land in a private working directory (on tmpfs when
+    available, so downloads never touch the disk) and are read back and
+    deleted by the helpers.
+    """
+
+    def __init__(self, gphoto2_path: str = "gphoto2", timeout: float = 15.0):
+        """Initialize session (the process is started by start()).
+
+        Args:
+            gphoto2_path: gphoto2 executable
+            timeout: Default per-command timeout, in seconds
+        """
+        self.gphoto2_path = gphoto2_path or "gphoto2"
+        self.timeout = timeout
+        self.workdir: Optional[str] = None
+        self.command_latency_ms: Dict[str, float] = {}
+        self.last_error: str = ""
+        self._process: Optional[subprocess.Popen] = None
+        self._commands: "queue.Queue" = queue.Queue()
+        self._chunks: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._reader: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """Launch the shell and wait for its first prompt."""
+        if self.is_running:
+            return True
+        self.workdir = tempfile.mkdtemp(prefix="gphoto2_", dir=_download_dir())
+        try:
+            self._process = subprocess.Popen(
+                [self.gphoto2_path, "--shell"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=self.workdir,
+                creationflags=_CREATION_FLAGS,
+            )
+        except OSError as e:
+            self.last_error = str(e)
+            self._cleanup()
+            return False
+
+        self._chunks = queue.Queue()
+        self._reader = threading.Thread(
+            target=self._read_loop, args=(self._process.stdout, self._chunks),
+            name="gphoto2-reader", daemon=True,
+        )
+        self._reader.start()
+        try:
+            self._read_until_prompt(self.timeout)
+        except (TimeoutError, EOFError) as e:
+            self.last_error = f"gphoto2 --shell n'a pas démarré : {e}"
+            self.stop()
+            return False
+
+        self._commands = queue.Queue()
+        self._worker = threading.Thread(target=self._work_loop, name="gphoto2-session", daemon=True)
+        self._worker.start()
+        return True
+
+    def stop(self) -> None:
+        """Exit the shell and remove the working directory."""
+        if self._worker is not None:
+            self._commands.put(None)
+            self._worker.join(timeout=2)
+            self._worker = None
+        if self._process is not None:
+            try:
+                if self._process.poll() is None:
+                    self._process.stdin.write(b"exit\n")
+                    self._process.stdin.flush()
+                    self._process.wait(timeout=2)
+            except Exception:
+                self._process.kill()
+            self._process = None
+        self._cleanup()
+
+    def submit(self, command: str, timeout: Optional[float] = None) -> Future:
+        """Queue a shell command.
+
+        Returns:
+            Future resolving to a CommandResult
+        """
+        future: Future = Future()
+        if not self.is_running or self._worker is None:
+            future.set_exception(RuntimeError("gphoto2 session not running"))
+            return future
+        self._commands.put((command, timeout or self.timeout, future))
+        return future
+
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        """Run a shell command and wait for its result."""
+        wait = (timeout or self.timeout) + 5
+        return self.submit(command, timeout).result(timeout=wait)
+
+    def capture_preview(self) -> Optional[bytes]:
+        """Grab one live-view JPEG."""
+        return self._run_and_collect("capture-preview")
+
+    def capture_image(self) -> Optional[bytes]:
+        """Fire the shutter and download the image bytes."""
+        return self._run_and_collect("capture-image-and-download", timeout=max(30.0, self.timeout))
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _run_and_collect(self, command: str, timeout: Optional[float] = None) -> Optional[bytes]:
+        result = self.run(command, timeout)
+        data = None
+        for path in result.saved_files:
+            try:
+                if data is None and os.path.getsize(path) > 0:
+                    with open(path, "rb") as f:
+                        data = f.read()
+            finally:
+                if os.path.exists(path):
+                    os.unlink(path)
+        if data is None:
+            self.last_error = result.output.strip() or "Aucun fichier reçu"
+        return data
+
+    def _work_loop(self) -> None:
+        while True:
+            item = self._commands.get()
+            if item is None:
+                return
+            command, timeout, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._execute(command, timeout))
+            except Exception as e:
+                self.last_error = str(e)
+                future.set_exception(e)
+                if isinstance(e, (TimeoutError, EOFError, OSError)):
+                    # The shell is out of sync or gone: kill it so callers can restart
+                    if self._process is not None:
+                        self._process.kill()
+
+    def _execute(self, command: str, timeout: float) -> CommandResult:
+        start = time.perf_counter()
+        self._process.stdin.write(command.encode() + b"\n")
+        self._process.stdin.flush()
+        output = self._read_until_prompt(timeout)
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        self.command_latency_ms[command.split()[0]] = latency_ms
+
+        saved = [
+            os.path.join(self.workdir, os.path.basename(name))
+            for name in _SAVED.findall(output)
+        ]
+        return CommandResult(command=command, output=output, latency_ms=latency_ms, saved_files=saved)
+
+    def _read_until_prompt(self, timeout: float) -> str:
+        buffer = b""
+        deadline = time.monotonic() + timeout
+        while not _PROMPT.search(buffer):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("gphoto2 n'a pas répondu (timeout)")
+            try:
+                chunk = self._chunks.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                raise EOFError("gphoto2 s'est arrêté")
+            buffer += chunk
+        return _PROMPT.sub(b"", buffer).decode(errors="replace")
+
+    @staticmethod
+    def _read_loop(stream, chunks: "queue.Queue") -> None:
+        # Bound to one process: a reader outliving a restart must not feed
+        # its EOF into the new shell's queue
+        while True:
+            try:
+                chunk = os.read(stream.fileno(), 4096)
+            except (OSError, ValueError):
+                chunk = b""
+            if not chunk:
+                chunks.put(None)
+                return
+            chunks.put(chunk)
+
+    def _cleanup(self) -> None:
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
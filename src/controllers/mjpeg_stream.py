@@ -0,0 +1,174 @@
+"""Continuous live view from a process writing an MJPEG stream to stdout."""
+import os
+import subprocess
+import threading
+import time
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from src.controllers.frame_grabber import BGR, LatestFrameSlot
+
+# Suppress console window on Windows when spawning gphoto2
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+_SOI = b"\xff\xd8"
+_EOI = b"\xff\xd9"
+
+
+class MjpegSplitter:
+    """Splits a concatenated JPEG byte stream into frames, incrementally.
+
+    Bytes can be fed in arbitrary chunks; each complete SOI..EOI frame is
+    returned once. Garbage before a start-of-image marker is discarded, and
+    the buffer is reset if a frame grows beyond ``max_frame_bytes``.
+    """
+
+    def __init__(self, max_frame_bytes: int = 16 * 1024 * 1024):
+        self.max_frame_bytes = max_frame_bytes
+        self._buffer = bytearray()
+        self._scan_from = 0   # where to resume looking for EOI
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add stream bytes and return the frames they completed."""
+        self._buffer += data
+        frames = []
+        while True:
+            start = self._buffer.find(_SOI)
+            if start < 0:
+                # Keep a trailing 0xFF: it may be the first half of a marker
+                del self._buffer[:-1]
+                self._scan_from = 0
+                break
+            if start > 0:
+                del self._buffer[:start]
+                self._scan_from = max(0, self._scan_from - start)
+
+            end = self._buffer.find(_EOI, max(2, self._scan_from))
+            if end < 0:
+                self._scan_from = max(2, len(self._buffer) - 1)
+                if len(self._buffer) > self.max_frame_bytes:
+                    self._buffer.clear()
+                    self._scan_from = 0
+                break
+
+            frames.append(bytes(self._buffer[:end + 2]))
+            del self._buffer[:end + 2]
+            self._scan_from = 0
+        return frames
+
+
+class MjpegLiveView:
+    """Reads MJPEG from a subprocess and decodes only the newest frame.
+
+    A reader thread splits stdout into JPEG frames and parks the newest one;
+    a decoder thread picks it up when idle. Frames that arrive while a decode
+    is running replace the parked one, so the stream never backs up and the
+    displayed frame is always the most recent the camera sent.
+    """
+
+    def __init__(self, command: List[str]):
+        """Initialize live view (the process is started by start()).
+
+        Args:
+            command: Process command line writing MJPEG to stdout
+        """
+        self.command = command
+        self.slot = LatestFrameSlot()
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.fps = 0.0
+        self._process: Optional[subprocess.Popen] = None
+        self._pending: Optional[bytes] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """Launch the stream process and worker threads."""
+        if self.is_running:
+            return True
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                creationflags=_CREATION_FLAGS,
+            )
+        except OSError as e:
+            print(f"[MjpegLiveView] cannot start stream: {e}")
+            self._process = None
+            return False
+
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._read_loop, name="mjpeg-reader", daemon=True),
+            threading.Thread(target=self._decode_loop, name="mjpeg-decoder", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Terminate the stream process and join the worker threads."""
+        self._stop.set()
+        self._wake.set()
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                    self._process.wait()
+            self._process = None
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+    def _read_loop(self) -> None:
+        splitter = MjpegSplitter()
+        stream = self._process.stdout
+        while not self._stop.is_set():
+            try:
+                chunk = os.read(stream.fileno(), 65536)
+            except (OSError, ValueError):
+                break
+            if not chunk:
+                break
+            frames = splitter.feed(chunk)
+            if not frames:
+                continue
+            with self._lock:
+                self.frames_received += len(frames)
+                # Anything not yet picked up by the decoder is superseded
+                self.frames_dropped += len(frames) - 1 + (self._pending is not None)
+                self._pending = frames[-1]
+            self._wake.set()
+
+    def _decode_loop(self) -> None:
+        last = None
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                data, self._pending = self._pending, None
+            if data is None:
+                continue
+
+            bgr = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if bgr is None:
+                continue
+            now = time.monotonic()
+            # Published as decoded (BGR); consumers convert only if they must
+            self.slot.publish(bgr, now, BGR)
+            if last is not None and now > last:
+                self.fps = 0.9 * self.fps + 0.1 / (now - last) if self.fps else 1.0 / (now - last)
+            last = now
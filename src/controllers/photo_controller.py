@@ -1,11 +1,70 @@
 """Photo controller for managing photo operations."""
 import os
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 import cv2
 import numpy as np
 from PIL import Image
 from src.models.photo import Photo
+from src.controllers.compositor import Compositor
+from src.controllers.frame_cache import FrameAssetCache
+from src.controllers.thumbnail_cache import ThumbnailCache
+
+
+def cover_geometry(src_w: int, src_h: int, dst_w: int, dst_h: int) -> Tuple[float, int, int, int, int]:
+    """Scale and center-crop that make a source COVER a target without distortion.
+
+    Args:
+        src_w, src_h: Source dimensions
+        dst_w, dst_h: Target dimensions
+
+    Returns:
+        Tuple of (scale, scaled_width, scaled_height, crop_left, crop_top)
+    """
+    scale = max(dst_w / src_w, dst_h / src_h)
+    new_w = max(1, int(src_w * scale))
+    new_h = max(1, int(src_h * scale))
+    left = (new_w - dst_w) // 2
+    top  = (new_h - dst_h) // 2
+    return scale, new_w, new_h, left, top
+
+
+@lru_cache(maxsize=32)
+def preview_geometry(
+    camera_size: Tuple[int, int],
+    frame_size: Tuple[int, int],
+    display_size: Tuple[int, int],
+) -> Tuple[Tuple[int, int, int, int], Tuple[int, int], Tuple[int, int, int, int]]:
+    """Geometry that renders the final print, cover-cropped, at display size.
+
+    The final print is the camera image covering the frame (see
+    apply_frame_to_array). The display shows that print covering the preview
+    area, so the frame is scaled to cover the display (the "canvas"), the
+    camera is scaled to cover the canvas, and both are cropped to the
+    visible display rectangle.
+
+    Args:
+        camera_size: (width, height) of the camera frame
+        frame_size: (width, height) of the frame, or the display size if none
+        display_size: (width, height) of the preview area
+
+    Returns:
+        Tuple of (camera_box, overlay_size, overlay_crop) where camera_box is
+        the (x, y, w, h) source rectangle in camera pixels, overlay_size the
+        size the frame is scaled to, and overlay_crop the (x, y, w, h)
+        display rectangle within it
+    """
+    cam_w, cam_h = camera_size
+    disp_w, disp_h = display_size
+    _, canvas_w, canvas_h, off_x, off_y = cover_geometry(*frame_size, disp_w, disp_h)
+    scale, _, _, left, top = cover_geometry(cam_w, cam_h, canvas_w, canvas_h)
+
+    x0 = min(cam_w - 1, max(0, int(round((left + off_x) / scale))))
+    y0 = min(cam_h - 1, max(0, int(round((top + off_y) / scale))))
+    x1 = min(cam_w, max(x0 + 1, int(round((left + off_x + disp_w) / scale))))
+    y1 = min(cam_h, max(y0 + 1, int(round((top + off_y + disp_h) / scale))))
+    return (x0, y0, x1 - x0, y1 - y0), (canvas_w, canvas_h), (off_x, off_y, disp_w, disp_h)
 
 
 class PhotoController:
@@ -18,6 +77,11 @@ class PhotoController:
             photos_directory: Directory to save photos
         """
         self.photos_directory = photos_directory
+        self.frame_cache = FrameAssetCache()
+        self.compositor = Compositor()
+        self.thumbnails = ThumbnailCache(photos_directory)
+        self._preview_buffer: Optional[np.ndarray] = None
+        self._display_buffer: Optional[np.ndarray] = None
         os.makedirs(photos_directory, exist_ok=True)
     
     def apply_frame(self, photo: Photo, frame_path: str) -> Photo:
@@ -37,6 +101,7 @@ class PhotoController:
             photo.image_data = self.apply_frame_to_array(photo.image_data, frame_path)
             photo.frame_path = frame_path
             photo.frame_applied = True
+            photo.encoded_data = None
             
             return photo
         except Exception as e:
@@ -60,34 +125,29 @@ class PhotoController:
             return image_data
 
         # Load frame at its natural size
-        frame = Image.open(frame_path).convert('RGBA')
+        frame = self.frame_cache.get(frame_path)
         frame_w, frame_h = frame.size
 
-        # Convert photo to PIL Image
-        photo_img = Image.fromarray(image_data).convert('RGBA')
+        photo_img = Image.fromarray(image_data)
         photo_w, photo_h = photo_img.size
 
         # Scale camera image to COVER the frame dimensions (crop to fill, no letter-boxing)
-        scale = max(frame_w / photo_w, frame_h / photo_h)
-        new_w = max(1, int(photo_w * scale))
-        new_h = max(1, int(photo_h * scale))
-        photo_resized = photo_img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+        _, new_w, new_h, left, top = cover_geometry(photo_w, photo_h, frame_w, frame_h)
+        photo_resized = np.asarray(photo_img.resize((new_w, new_h), Image.Resampling.LANCZOS))
 
         # Center-crop the scaled photo to exactly the frame size
-        left = (new_w - frame_w) // 2
-        top  = (new_h - frame_h) // 2
-        photo_cropped = photo_resized.crop((left, top, left + frame_w, top + frame_h))
+        photo_cropped = photo_resized[top:top + frame_h, left:left + frame_w]
 
         # Composite: camera image underneath, frame on top
-        combined = Image.alpha_composite(photo_cropped, frame)
-
-        return np.array(combined.convert('RGB'))
+        return self.compositor.composite(photo_cropped, frame)
     
     def apply_frame_to_array_preview(self, image_data: np.ndarray, frame_path: str) -> np.ndarray:
         """Apply a frame overlay for live preview.
 
         The frame is scaled to match the camera feed's dimensions so the live
         view is never distorted regardless of the frame's natural resolution.
+        The result is written into a buffer that is reused on the next call,
+        so callers must copy it if they need to keep it.
 
         Args:
             image_data: RGB image data (camera feed)
@@ -99,22 +159,83 @@ class PhotoController:
         if image_data is None or not frame_path or not os.path.exists(frame_path):
             return image_data
 
-        frame = Image.open(frame_path).convert('RGBA')
-        photo_img = Image.fromarray(image_data).convert('RGBA')
-        photo_w, photo_h = photo_img.size
+        photo_h, photo_w = image_data.shape[:2]
+
+        # Frame pre-scaled to the camera feed dimensions, decoded once and cached
+        frame_scaled = self.frame_cache.get(frame_path, (photo_w, photo_h))
+
+        if self._preview_buffer is None or self._preview_buffer.shape != image_data.shape:
+            self._preview_buffer = np.empty_like(image_data)
+        return self.compositor.composite(image_data, frame_scaled, out=self._preview_buffer)
 
-        # Scale frame to exactly match the camera feed dimensions
-        frame_scaled = frame.resize((photo_w, photo_h), Image.Resampling.LANCZOS)
+    def render_preview(
+        self,
+        image_data: np.ndarray,
+        frame_path: Optional[str],
+        display_size: Tuple[int, int],
+        pixel_format: str = "RGB",
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Render the live preview directly at display resolution.
 
-        combined = Image.alpha_composite(photo_img, frame_scaled)
-        return np.array(combined.convert('RGB'))
+        The camera frame is cropped and downscaled once to the display size,
+        then blended with a frame overlay pre-scaled to that same size, so no
+        work is spent on pixels the screen cannot show. Crop and scale follow
+        apply_frame_to_array, so the preview matches the final print. The
+        result is written into ``out`` (a new array if its shape no longer
+        matches), or else into a buffer that is reused on the next call.
 
-    def save_photo(self, photo: Photo, filename: Optional[str] = None) -> str:
+        Args:
+            image_data: 3-channel image data (camera feed)
+            frame_path: Path to frame image, or None for no frame
+            display_size: (width, height) of the preview area
+            pixel_format: Channel order of image_data ("RGB" or "BGR"); the
+                overlay is prepared in the same order, so no conversion is needed
+            out: Optional output array; callers rendering from several threads
+                must pass their own
+
+        Returns:
+            Image of exactly display_size, in pixel_format
+        """
+        if image_data is None:
+            return image_data
+
+        disp_w, disp_h = max(1, int(display_size[0])), max(1, int(display_size[1]))
+        cam_h, cam_w = image_data.shape[:2]
+
+        frame = None
+        if frame_path and os.path.exists(frame_path):
+            frame = self.frame_cache.get(frame_path)
+        frame_size = frame.size if frame is not None else (disp_w, disp_h)
+
+        (x, y, w, h), overlay_size, overlay_crop = preview_geometry(
+            (cam_w, cam_h), frame_size, (disp_w, disp_h)
+        )
+
+        shape = (disp_h, disp_w, 3)
+        if out is not None:
+            display = out if out.shape == shape else np.empty(shape, dtype=np.uint8)
+        else:
+            if self._display_buffer is None or self._display_buffer.shape != shape:
+                self._display_buffer = np.empty(shape, dtype=np.uint8)
+            display = self._display_buffer
+        cv2.resize(image_data[y:y + h, x:x + w], (disp_w, disp_h), dst=display,
+                   interpolation=cv2.INTER_AREA)
+
+        if frame is not None:
+            overlay = self.frame_cache.get(frame_path, overlay_size, overlay_crop, pixel_format)
+            self.compositor.composite(display, overlay, out=display)
+        return display
+
+    def save_photo(self, photo: Photo, filename: Optional[str] = None,
+                   thumbnail: bool = True) -> str:
         """Save photo to disk.
         
         Args:
             photo: Photo object to save
             filename: Optional filename, generates one if not provided
+            thumbnail: Store its gallery thumbnail (not for files the
+                gallery never shows, such as unframed originals)
             
         Returns:
             Path to saved file
@@ -124,10 +245,22 @@ class PhotoController:
             filename = f"photo_{timestamp}.jpg"
         
         filepath = os.path.join(self.photos_directory, filename)
-        
-        # Convert RGB to BGR for OpenCV
-        bgr_image = cv2.cvtColor(photo.image_data, cv2.COLOR_RGB2BGR)
-        cv2.imwrite(filepath, bgr_image)
+
+        # Camera JPEG still matches the image: write it verbatim, no re-encode
+        if photo.encoded_data and not photo.frame_applied:
+            with open(filepath, "wb") as f:
+                f.write(photo.encoded_data)
+        else:
+            # Convert RGB to BGR for OpenCV
+            bgr_image = cv2.cvtColor(photo.image_data, cv2.COLOR_RGB2BGR)
+            cv2.imwrite(filepath, bgr_image)
+
+        # The gallery thumbnail is made now, from pixels already in memory
+        if thumbnail:
+            try:
+                self.thumbnails.store(filepath, photo.image_data)
+            except Exception as e:
+                print(f"[PhotoController] thumbnail for {filepath}: {e}")
         
         return filepath
     
@@ -0,0 +1,281 @@
+"""SQLite index of captured photos."""
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from src.controllers.thumbnail_loader import list_photos
+
+INDEX_FILENAME = ".photos.sqlite"
+_ORIGINAL_SUFFIX = "_original"
+_TIMESTAMP = re.compile(r"(\d{8}_\d{6})")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    final_path TEXT NOT NULL UNIQUE,
+    original_path TEXT,
+    frame_path TEXT,
+    width INTEGER,
+    height INTEGER,
+    thumb_key TEXT,
+    emailed_to TEXT,
+    emailed_at TEXT,
+    print_count INTEGER NOT NULL DEFAULT 0,
+    printed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS photos_taken_at ON photos (taken_at DESC, id DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_UPSERT = """
+INSERT INTO photos (taken_at, final_path, original_path, frame_path, width, height, thumb_key)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (final_path) DO UPDATE SET
+    taken_at = excluded.taken_at,
+    original_path = excluded.original_path,
+    frame_path = excluded.frame_path,
+    width = excluded.width, height = excluded.height,
+    thumb_key = excluded.thumb_key
+"""
+
+
+@dataclass
+class PhotoRecord:
+    """One capture as stored in the index."""
+    id: int
+    taken_at: datetime
+    final_path: str
+    original_path: Optional[str] = None
+    frame_path: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    thumb_key: Optional[str] = None
+    emailed_to: Optional[str] = None
+    emailed_at: Optional[datetime] = None
+    print_count: int = 0
+    printed_at: Optional[datetime] = None
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class PhotoIndex:
+    """Captures of a photos directory, queryable without touching the files.
+
+    The app records each capture as it is saved, with its unframed
+    original, and later its email and print history. reconcile() brings
+    in photos that appeared by other means (older versions, copied files)
+    and drops the deleted ones. It is a no-op while the directory's mtime
+    is unchanged, so opening the gallery usually costs one stat() plus one
+    ordered query.
+
+    The connection is shared between threads behind a lock; captures are
+    recorded from the pipeline's workers.
+    """
+
+    def __init__(self, photos_directory: str, db_path: Optional[str] = None,
+                 thumb_key: Optional[Callable[[str], Optional[str]]] = None):
+        """Open (or create) the index.
+
+        Args:
+            photos_directory: Directory holding the photos
+            db_path: Database file (default: hidden file in the directory)
+            thumb_key: Maps a photo path to its thumbnail cache key
+        """
+        self.photos_directory = photos_directory
+        self.thumb_key = thumb_key
+        os.makedirs(photos_directory, exist_ok=True)
+        self.db_path = db_path or os.path.join(photos_directory, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # ------------------------------------------------------------------ #
+    #  Recording                                                          #
+    # ------------------------------------------------------------------ #
+
+    def record_capture(self, final_path: str, taken_at: datetime,
+                       original_path: Optional[str] = None, frame_path: Optional[str] = None,
+                       size: Optional[Tuple[int, int]] = None) -> int:
+        """Add (or update) a capture; returns its id."""
+        row = self._row(final_path, taken_at, original_path, frame_path, size)
+        with self._lock, self._db:
+            self._db.execute(_UPSERT, row)
+            return self._db.execute(
+                "SELECT id FROM photos WHERE final_path = ?", (final_path,)
+            ).fetchone()[0]
+
+    def mark_emailed(self, final_path: str, recipient: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE photos SET emailed_to = ?, emailed_at = ? WHERE final_path = ?",
+                (recipient, datetime.now().isoformat(), final_path),
+            )
+
+    def mark_printed(self, final_path: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE photos SET print_count = print_count + 1, printed_at = ? WHERE final_path = ?",
+                (datetime.now().isoformat(), final_path),
+            )
+
+    # ------------------------------------------------------------------ #
+    #  Queries                                                            #
+    # ------------------------------------------------------------------ #
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM photos").fetchone()[0]
+
+    def page(self, offset: int = 0, limit: int = 100) -> List[PhotoRecord]:
+        """Captures newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM photos ORDER BY taken_at DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def final_paths(self) -> List[str]:
+        """Paths of the final photos, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT final_path FROM photos ORDER BY taken_at DESC, id DESC"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, final_path: str) -> Optional[PhotoRecord]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM photos WHERE final_path = ?", (final_path,)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        """Totals for the admin: photos, emailed photos, prints."""
+        with self._lock:
+            row = self._db.execute(
+                """SELECT COUNT(*), COUNT(emailed_at), COALESCE(SUM(print_count), 0)
+                   FROM photos"""
+            ).fetchone()
+        return {"photos": row[0], "emailed": row[1], "prints": row[2]}
+
+    # ------------------------------------------------------------------ #
+    #  Reconciliation                                                     #
+    # ------------------------------------------------------------------ #
+
+    def reconcile(self, force: bool = False) -> Tuple[int, int]:
+        """Sync the index with the directory contents.
+
+        Returns:
+            (added, removed) row counts
+        """
+        try:
+            dir_mtime = str(os.stat(self.photos_directory).st_mtime_ns)
+        except OSError:
+            return (0, 0)
+        if not force and self._meta("dir_mtime_ns") == dir_mtime:
+            return (0, 0)
+
+        on_disk = set(list_photos(self.photos_directory))
+        with self._lock:
+            indexed = {row[0]: row[1] for row in
+                       self._db.execute("SELECT final_path, original_path FROM photos")}
+        known = set(indexed) | {p for p in indexed.values() if p}
+
+        # An unframed original is never a final photo, even while the
+        # pipeline has written it and not yet the framed one
+        removed = [path for path in indexed
+                   if path not in on_disk or self._is_original(path)]
+        rows = []
+        for path in sorted(on_disk - known):
+            if self._is_original(path):
+                continue    # recorded with its final photo
+            stem, ext = os.path.splitext(path)
+            original = stem + _ORIGINAL_SUFFIX + ext
+            rows.append(self._row(
+                path, self._taken_at(path),
+                original_path=original if original in on_disk else None,
+                size=self._image_size(path),
+            ))
+
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT, rows)
+            self._db.executemany("DELETE FROM photos WHERE final_path = ?",
+                                 [(path,) for path in removed])
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dir_mtime_ns', ?)",
+                             (dir_mtime,))
+        return (len(rows), len(removed))
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _row(self, final_path: str, taken_at: datetime, original_path: Optional[str] = None,
+             frame_path: Optional[str] = None, size: Optional[Tuple[int, int]] = None) -> tuple:
+        """Parameters of _UPSERT for one capture."""
+        width, height = size if size else (None, None)
+        thumb_key = self.thumb_key(final_path) if self.thumb_key else None
+        return (taken_at.isoformat(), final_path, original_path, frame_path,
+                width, height, thumb_key)
+
+    @staticmethod
+    def _is_original(path: str) -> bool:
+        return os.path.splitext(path)[0].endswith(_ORIGINAL_SUFFIX)
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _taken_at(path: str) -> datetime:
+        """Capture time from a photo_YYYYmmdd_HHMMSS name, else the file mtime."""
+        match = _TIMESTAMP.search(os.path.basename(path))
+        if match:
+            try:
+                return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+            except ValueError:
+                pass
+        return datetime.fromtimestamp(os.path.getmtime(path))
+
+    @staticmethod
+    def _image_size(path: str) -> Optional[Tuple[int, int]]:
+        """Pixel size read from the file header (no decode)."""
+        try:
+            with Image.open(path) as image:
+                return image.size
+        except Exception:
+            return None
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> PhotoRecord:
+        return PhotoRecord(
+            id=row["id"],
+            taken_at=_parse_time(row["taken_at"]),
+            final_path=row["final_path"],
+            original_path=row["original_path"],
+            frame_path=row["frame_path"],
+            width=row["width"],
+            height=row["height"],
+            thumb_key=row["thumb_key"],
+            emailed_to=row["emailed_to"],
+            emailed_at=_parse_time(row["emailed_at"]),
+            print_count=row["print_count"],
+            printed_at=_parse_time(row["printed_at"]),
+        )
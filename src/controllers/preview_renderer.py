@@ -0,0 +1,168 @@
+"""Live preview rendering on a worker thread."""
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from src.controllers.frame_grabber import FramePacket
+from src.controllers.photo_controller import PhotoController
+
+
+class PreviewRenderer:
+    """Crops, scales and frames camera images for display off the GUI thread.
+
+    The worker pulls new frames from ``source``, renders them at display size
+    through PhotoController.render_preview (cv2.resize INTER_AREA plus the
+    overlay) and parks the result. The GUI thread only calls take() and
+    paints what it gets.
+
+    Output buffers rotate between three roles: the one on screen, the one
+    waiting for take() and the one being rendered. A buffer is never
+    rendered into while it is on screen or waiting.
+    """
+
+    def __init__(self, photo_controller: PhotoController,
+                 source: Callable[[], Optional[FramePacket]],
+                 idle_wait: float = 0.004, min_interval: float = 0.0):
+        """Initialize renderer (the worker is started by start()).
+
+        Args:
+            photo_controller: Renders the preview image
+            source: Returns a new camera packet, or None if there is none yet;
+                called on the worker thread only
+            idle_wait: Pause before polling again when no frame was new
+            min_interval: Minimum time between two rendered frames (0: every
+                new frame is rendered)
+        """
+        self.photo_controller = photo_controller
+        self.source = source
+        self.idle_wait = idle_wait
+        self.min_interval = min_interval
+        self.render_ms = 0.0
+        self._settings: Tuple[Optional[str], Tuple[int, int]] = (None, (1024, 768))
+        self._free: List[np.ndarray] = [np.empty((0, 0, 3), dtype=np.uint8) for _ in range(3)]
+        self._pending: Optional[FramePacket] = None
+        self._shown: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._exited = True     # worker left its loop (set under _lock)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def configure(self, frame_path: Optional[str], display_size: Tuple[int, int]) -> None:
+        """Set the overlay and display size used for the next frames."""
+        self._settings = (frame_path, (int(display_size[0]), int(display_size[1])))
+
+    def start(self) -> None:
+        """Start the worker.
+
+        A worker that stop() could not join (stuck in a slow source) is
+        still the worker: it is told to carry on rather than joined by a
+        second one that would share its buffers.
+        """
+        with self._lock:
+            self._stop.clear()
+            if self._thread is not None and not self._exited:
+                return
+            self._exited = False
+            self._thread = threading.Thread(target=self._run, name="preview-renderer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> bool:
+        """Stop the worker; False if it was still running after ``timeout``."""
+        self._stop.set()
+        stopped = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"[PreviewRenderer] worker still busy after {timeout:.1f} s")
+                stopped = False
+            else:
+                self._thread = None
+        with self._lock:
+            if self._pending is not None:
+                self._free.append(self._pending.frame)
+                self._pending = None
+        return stopped
+
+    def take(self) -> Optional[FramePacket]:
+        """Newest rendered frame not taken yet, or None.
+
+        The returned frame stays valid until the next successful take().
+        """
+        with self._lock:
+            packet, self._pending = self._pending, None
+            if packet is None:
+                return None
+            if self._shown is not None:
+                self._free.append(self._shown)
+            self._shown = packet.frame
+            return packet
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _run(self) -> None:
+        last_render = 0.0
+        while True:
+            if self._stop.is_set():
+                # Decided under the lock, so start() either sees this worker
+                # gone or clears _stop in time for it to carry on
+                with self._lock:
+                    if self._stop.is_set():
+                        self._exited = True
+                        return
+            remaining = self.min_interval - (time.monotonic() - last_render)
+            if remaining > 0:
+                self._stop.wait(remaining)
+                continue
+            try:
+                packet = self.source()
+            except Exception as e:
+                print(f"[PreviewRenderer] source error: {e}")
+                packet = None
+            if packet is None:
+                self._stop.wait(self.idle_wait)
+                continue
+
+            last_render = time.monotonic()
+            with self._lock:
+                out = self._free.pop() if self._free else None
+            if out is None:
+                self._stop.wait(self.idle_wait)
+                continue
+            start = time.perf_counter()
+            try:
+                display = self._render(packet, out)
+            except Exception as e:
+                print(f"[PreviewRenderer] render error: {e}")
+                with self._lock:
+                    self._free.append(out)
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            self.render_ms = 0.9 * self.render_ms + 0.1 * elapsed_ms if self.render_ms else elapsed_ms
+
+            rendered = FramePacket(frame=display, seq=packet.seq, timestamp=packet.timestamp,
+                                   pixel_format=packet.pixel_format)
+            with self._lock:
+                if self._pending is not None:
+                    # Not taken in time: superseded, its buffer is free again
+                    self._free.append(self._pending.frame)
+                self._pending = rendered
+
+    def _render(self, packet: FramePacket, out: np.ndarray) -> np.ndarray:
+        frame_path, display_size = self._settings
+        try:
+            return self.photo_controller.render_preview(
+                packet.frame, frame_path, display_size, packet.pixel_format, out=out
+            )
+        except Exception:
+            # Unreadable frame file: keep the live view going without it
+            return self.photo_controller.render_preview(
+                packet.frame, None, display_size, packet.pixel_format, out=out
+            )
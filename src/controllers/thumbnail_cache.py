@@ -0,0 +1,150 @@
+"""Persistent gallery thumbnails stored next to the photos."""
+import hashlib
+import os
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.controllers.thumbnail_loader import load_thumbnail
+
+THUMBS_DIRNAME = ".thumbs"
+# Gallery tiles are 300x220 with a 4 px border
+THUMBNAIL_SIZE = (292, 212)
+
+
+class ThumbnailCache:
+    """Small JPEG thumbnails in ``<photos_directory>/.thumbs``.
+
+    An entry is named after a hash of the photo's path, mtime, file size
+    and the thumbnail box. A rewritten photo therefore gets a fresh entry,
+    and its stale one ages out. Entries are touched when read. Once the
+    directory grows past ``max_bytes`` the least recently used entries are
+    deleted until it is back under 90% of the limit.
+    """
+
+    def __init__(self, photos_directory: str, size: Tuple[int, int] = THUMBNAIL_SIZE,
+                 max_bytes: int = 256 * 1024 * 1024, quality: int = 85):
+        """Initialize cache (the directory is created on the first write).
+
+        Args:
+            photos_directory: Directory holding the photos
+            size: Box thumbnails are scaled to fit
+            max_bytes: Disk budget for the cache directory
+            quality: JPEG quality of stored thumbnails
+        """
+        self.root = os.path.join(photos_directory, THUMBS_DIRNAME)
+        self.size = tuple(size)
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self._total: Optional[int] = None   # bytes on disk, scanned on first write
+        self._lock = threading.Lock()
+
+    def key(self, path: str) -> Optional[str]:
+        """Cache key of a photo as it is on disk now (None if it is missing)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        ident = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{self.size[0]}x{self.size[1]}"
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+    def get(self, path: str) -> Optional[np.ndarray]:
+        """Stored thumbnail of a photo as an RGB array, or None."""
+        key = self.key(path)
+        if key is None:
+            return None
+        entry = self._entry(key)
+        try:
+            with Image.open(entry) as image:
+                thumb = np.asarray(image.convert("RGB"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(entry)          # recently used: evicted last
+        except OSError:
+            pass
+        return thumb
+
+    def load(self, path: str, size: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+        """Stored thumbnail, or decode the photo and store it (legacy files).
+
+        ``size`` is accepted for ThumbnailLoader's decode signature; the
+        cache's own box is used.
+        """
+        thumb = self.get(path)
+        if thumb is not None:
+            return thumb
+        thumb = load_thumbnail(path, self.size)
+        if thumb is not None:
+            self._write(path, thumb)
+        return thumb
+
+    def store(self, path: str, image: np.ndarray) -> None:
+        """Store the thumbnail of a photo just written from ``image`` (RGB).
+
+        Called at save time, so the gallery never has to decode the full
+        JPEG back.
+        """
+        thumb = Image.fromarray(image)
+        thumb.thumbnail(self.size, Image.Resampling.LANCZOS)
+        self._write(path, np.asarray(thumb))
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.jpg")
+
+    def _write(self, path: str, thumb: np.ndarray) -> None:
+        key = self.key(path)
+        if key is None:
+            return
+        entry = self._entry(key)
+        tmp = f"{entry}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            Image.fromarray(thumb).save(tmp, "JPEG", quality=self.quality)
+            os.replace(tmp, entry)   # readers never see a partial file
+            written = os.path.getsize(entry)
+        except OSError as e:
+            print(f"[ThumbnailCache] {path}: {e}")
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[0]
+            else:
+                self._total += written
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """(total bytes, [(last use, size, path)]) of the entries on disk."""
+        entries = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                total += st.st_size
+                entries.append((st.st_mtime, st.st_size, full))
+        return total, entries
+
+    def _evict(self) -> None:
+        total, entries = self._scan()
+        entries.sort()
+        target = int(self.max_bytes * 0.9)
+        for _, size, full in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(full)
+                total -= size
+            except OSError:
+                pass
+        self._total = total
@@ -0,0 +1,145 @@
+"""Background thumbnail decoding for the gallery."""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import ExifTags, Image, ImageOps
+
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png")
+# EXIF orientations that swap width and height
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def list_photos(directory: str) -> List[str]:
+    """Photo paths in ``directory``, newest name first."""
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as entries:
+        paths = [entry.path for entry in entries
+                 if entry.is_file() and entry.name.lower().endswith(PHOTO_EXTENSIONS)]
+    paths.sort(reverse=True)
+    return paths
+
+
+def reduce_decode(image: Image.Image, size: Tuple[int, int]) -> None:
+    """Have a JPEG decode at the smallest DCT scale still covering ``size``.
+
+    libjpeg can scale by 1/2, 1/4 or 1/8 while decoding, so a 24 MP photo
+    wanted as a 300 px thumbnail is never expanded to full size in memory.
+    Must be called before the image is loaded; other formats are left
+    alone.
+    """
+    if image.format != "JPEG":
+        return
+    width, height = size
+    if image.getexif().get(ExifTags.Base.Orientation) in _TRANSPOSED_ORIENTATIONS:
+        width, height = height, width
+    image.draft("RGB", (width, height))
+
+
+def load_thumbnail(path: str, size: Tuple[int, int]) -> Optional[np.ndarray]:
+    """Decode an image scaled to fit ``size`` (aspect kept) as an RGB array."""
+    try:
+        with Image.open(path) as image:
+            reduce_decode(image, size)
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+            return np.asarray(image.convert("RGB"))
+    except Exception as e:
+        print(f"[ThumbnailLoader] {path}: {e}")
+        return None
+
+
+def load_cover_thumbnail(path: str, size: Tuple[int, int]) -> Optional[np.ndarray]:
+    """Decode an image scaled to fill ``size`` and centre-cropped, as RGBA.
+
+    Transparency is kept, for frame overlays shown on a light tile.
+    """
+    try:
+        with Image.open(path) as image:
+            reduce_decode(image, size)
+            image = ImageOps.exif_transpose(image)
+            image = ImageOps.fit(image.convert("RGBA"), size, Image.Resampling.LANCZOS)
+            return np.asarray(image)
+    except Exception as e:
+        print(f"[ThumbnailLoader] {path}: {e}")
+        return None
+
+
+class ThumbnailLoader:
+    """Decodes thumbnails on a thread pool.
+
+    The gallery asks for the tiles it is about to show and, when the user
+    scrolls on, withdraws the requests for tiles that left the screen so
+    the pool works on what is visible. ``on_ready(path, image)`` is called
+    on a worker thread with an RGB array (None if the file is unreadable);
+    a withdrawn request that had already started still reports.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (300, 220), max_workers: Optional[int] = None,
+                 on_ready: Optional[Callable[[str, Optional[np.ndarray]], None]] = None,
+                 decode: Callable[[str, Tuple[int, int]], Optional[np.ndarray]] = load_thumbnail):
+        """Initialize loader.
+
+        Args:
+            size: Box thumbnails are scaled to fit
+            max_workers: Decoding threads (default: half the CPUs, at least 2)
+            on_ready: Completion callback (worker thread)
+            decode: Decoding function, for tests
+        """
+        self.size = size
+        self.on_ready = on_ready
+        self.decode = decode
+        workers = max_workers or max(2, (os.cpu_count() or 2) // 2)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Requests queued or being decoded."""
+        with self._lock:
+            return len(self._pending)
+
+    def request(self, path: str) -> bool:
+        """Queue a thumbnail; False if it is already queued."""
+        with self._lock:
+            if path in self._pending:
+                return False
+            self._pending[path] = self._executor.submit(self._load, path)
+            return True
+
+    def cancel(self, path: str) -> None:
+        """Withdraw a request unless it has started."""
+        with self._lock:
+            future = self._pending.get(path)
+            if future is not None and future.cancel():
+                del self._pending[path]
+
+    def retain(self, paths: Iterable[str]) -> None:
+        """Withdraw every queued request not in ``paths``."""
+        keep = set(paths)
+        with self._lock:
+            for path in [p for p in self._pending if p not in keep]:
+                if self._pending[path].cancel():
+                    del self._pending[path]
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Withdraw queued requests; ``wait`` for the running ones to report."""
+        self.retain(())
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------ #
+    #  Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _load(self, path: str) -> None:
+        try:
+            image = self.decode(path, self.size)
+        finally:
+            with self._lock:
+                self._pending.pop(path, None)
+        if self.on_ready is not None:
+            self.on_ready(path, image)
@@ -1,8 +1,8 @@
 """Configuration models and management."""
 import json
 import os
-from dataclasses import dataclass, asdict, fields
-from typing import Optional, List
+from dataclasses import dataclass, asdict, field, fields
+from typing import Dict, Optional, List
 
 
 def _filter_fields(cls, data: dict) -> dict:
@@ -21,6 +21,13 @@ class CameraConfig:
     fps: int = 30
     camera_type: str = "webcam"   # "webcam" | "dslr"
     gphoto2_path: str = "gphoto2"  # path to gphoto2 executable
+    threaded_capture: bool = True  # read webcam frames on a dedicated thread
+    dslr_live_view: bool = False   # stream DSLR preview via gphoto2 --capture-movie
+    idle_release_seconds: int = 120  # keep the camera open this long when no screen uses it
+    probed_modes: Dict[str, List[dict]] = field(default_factory=dict)  # device id -> measured capture modes
+    still_resolution_width: int = 0   # photo resolution when it differs from the preview (0: same)
+    still_resolution_height: int = 0
+    max_mode_switch_ms: int = 1500    # slower preview -> still switches fall back to single mode
 
 
 @dataclass
@@ -14,6 +14,7 @@ class Photo:
     frame_applied: bool = False
     width: int = 0
     height: int = 0
+    encoded_data: Optional[bytes] = None  # Camera JPEG, valid while image_data is unmodified
     
     def __post_init__(self):
         if self.image_data is not None and len(self.image_data.shape) >= 2:
@@ -1,19 +1,27 @@
 """Admin screen for application settings."""
 import os
 import sys
+import threading
+from typing import Optional
+import time
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QLineEdit, QComboBox, QCheckBox, QRadioButton,
-    QTabWidget, QFormLayout, QFileDialog,
+    QTabWidget, QFormLayout, QFileDialog, QSpinBox,
     QGroupBox, QMessageBox, QTextEdit, QDialog
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QImage, QPixmap, QCursor
+from PyQt6.QtGui import QFont, QPixmap, QCursor
 from src.models import AppConfig
+from src.controllers.camera_broker import CameraBroker
 from src.controllers.camera_controller import CameraController
+from src.controllers.camera_discovery import default_discovery
+from src.controllers.camera_probe import probe_camera, saved_modes
 from src.controllers.dslr_controller import DSLRController
+from src.controllers.frame_scheduler import FrameScheduler, source_fps
 from src.controllers.printer_controller import PrinterController
 from src.controllers.email_controller import EmailController
+from src.views.preview_widget import frame_to_qimage
 
 
 class AdminScreen(QWidget):
@@ -21,14 +29,26 @@ class AdminScreen(QWidget):
     
     back_requested = pyqtSignal()  # Signal to go back
     config_saved = pyqtSignal()    # Signal when config is saved
+    cameras_discovered = pyqtSignal(list)  # emitted from the discovery thread
+    probe_progress = pyqtSignal(str)       # emitted from the probe thread
+    modes_probed = pyqtSignal(int, list)   # device id, CameraModes (probe thread)
     
-    def __init__(self, config: AppConfig):
+    def __init__(self, config: AppConfig, camera_broker: Optional[CameraBroker] = None):
         super().__init__()
         self.config = config
+        self.camera_broker = camera_broker
         self.preview_controller = None
+        self._preview_subscription = None
+        self._preview_seq = 0
         self.preview_timer = QTimer()
         self.preview_timer.timeout.connect(self.update_camera_preview)
+        self.preview_scheduler = FrameScheduler(max_fps=15)
+        self.cameras_discovered.connect(self._on_cameras_discovered)
+        self._probe_thread = None
+        self.probe_progress.connect(self._on_probe_progress)
+        self.modes_probed.connect(self._on_modes_probed)
         self.init_ui()
+        self._refresh_cameras()
     
     def init_ui(self):
         """Initialize the user interface."""
@@ -93,6 +113,7 @@ class AdminScreen(QWidget):
             }
         """)
         back_btn.clicked.connect(self.back_requested.emit)
+        self.back_btn = back_btn
         button_layout.addWidget(back_btn)
         
         button_layout.addStretch()
@@ -112,6 +133,7 @@ class AdminScreen(QWidget):
             }
         """)
         save_btn.clicked.connect(self.save_config)
+        self.save_btn = save_btn
         button_layout.addWidget(save_btn)
         
         layout.addLayout(button_layout)
@@ -163,6 +185,17 @@ class AdminScreen(QWidget):
         type_layout.addStretch()
         layout.addLayout(type_layout)
 
+        idle_row = QHBoxLayout()
+        idle_row.addWidget(QLabel("Libérer la caméra après inactivité :"))
+        self.idle_release_spin = QSpinBox()
+        self.idle_release_spin.setRange(0, 3600)
+        self.idle_release_spin.setSuffix(" s")
+        self.idle_release_spin.setToolTip("0 = libérer dès que l'écran de capture est quitté")
+        self.idle_release_spin.setValue(int(getattr(self.config.camera, "idle_release_seconds", 120)))
+        idle_row.addWidget(self.idle_release_spin)
+        idle_row.addStretch()
+        layout.addLayout(idle_row)
+
         # ── Webcam section ────────────────────────────────────────────────
         self.webcam_widget = QWidget()
         webcam_form = QFormLayout()
@@ -170,26 +203,49 @@ class AdminScreen(QWidget):
         webcam_form.setContentsMargins(0, 8, 0, 0)
 
         self.camera_combo = QComboBox()
-        cameras = CameraController.list_available_cameras()
-        if cameras:
-            for device_id, name in cameras:
-                self.camera_combo.addItem(name, device_id)
-        else:
-            self.camera_combo.addItem("Aucune caméra détectée", 0)
-        current_index = self.camera_combo.findData(self.config.camera.device_id)
-        if current_index >= 0:
-            self.camera_combo.setCurrentIndex(current_index)
+        # Filled by _refresh_cameras; until then only the configured camera
+        self._fill_camera_combo(
+            default_discovery().cached()
+            or [(self.config.camera.device_id, self.config.camera.device_name)],
+            self.config.camera.device_id,
+        )
         webcam_form.addRow("Caméra:", self.camera_combo)
 
         self.resolution_combo = QComboBox()
-        self.resolution_combo.addItem("1920x1080 (Full HD)", (1920, 1080))
-        self.resolution_combo.addItem("1280x720 (HD)", (1280, 720))
-        self.resolution_combo.addItem("640x480 (VGA)", (640, 480))
-        current_resolution = (self.config.camera.resolution_width, self.config.camera.resolution_height)
-        resolution_index = self.resolution_combo.findData(current_resolution)
-        if resolution_index >= 0:
-            self.resolution_combo.setCurrentIndex(resolution_index)
-        webcam_form.addRow("Résolution:", self.resolution_combo)
+        self._populate_resolutions(
+            (self.config.camera.resolution_width, self.config.camera.resolution_height)
+        )
+        resolution_row = QHBoxLayout()
+        resolution_row.addWidget(self.resolution_combo, 1)
+        self.probe_btn = QPushButton("⏱ Mesurer les modes")
+        self.probe_btn.setToolTip("Essaie les formats MJPG/YUYV et les cadences, puis garde le plus rapide")
+        self.probe_btn.clicked.connect(self._probe_camera_modes)
+        resolution_row.addWidget(self.probe_btn)
+        webcam_form.addRow("Résolution:", resolution_row)
+
+        self.still_resolution_combo = QComboBox()
+        self.still_resolution_combo.setToolTip(
+            "Aperçu fluide en basse résolution, photo prise dans ce mode "
+            "(si le changement de mode est trop lent, la photo reprend la résolution de l'aperçu)"
+        )
+        self.still_resolution_combo.addItem("Identique à l'aperçu", (0, 0))
+        for label, resolution in self._STATIC_RESOLUTIONS:
+            self.still_resolution_combo.addItem(label, resolution)
+        still_index = self.still_resolution_combo.findData((
+            getattr(self.config.camera, "still_resolution_width", 0),
+            getattr(self.config.camera, "still_resolution_height", 0),
+        ))
+        if still_index >= 0:
+            self.still_resolution_combo.setCurrentIndex(still_index)
+        webcam_form.addRow("Résolution photo:", self.still_resolution_combo)
+
+        self.probe_status_label = QLabel("")
+        self.probe_status_label.setStyleSheet("color: #94a3b8; font-size: 11px;")
+        webcam_form.addRow("", self.probe_status_label)
+
+        self.threaded_capture_check = QCheckBox("Lire la caméra en arrière-plan (aperçu plus fluide)")
+        self.threaded_capture_check.setChecked(getattr(self.config.camera, "threaded_capture", True))
+        webcam_form.addRow("", self.threaded_capture_check)
 
         self.webcam_widget.setLayout(webcam_form)
         layout.addWidget(self.webcam_widget)
@@ -217,6 +273,10 @@ class AdminScreen(QWidget):
         detect_row.addStretch()
         dslr_layout.addLayout(detect_row)
 
+        self.dslr_live_view_check = QCheckBox("Live view continu (gphoto2 --capture-movie)")
+        self.dslr_live_view_check.setChecked(getattr(self.config.camera, "dslr_live_view", False))
+        dslr_layout.addWidget(self.dslr_live_view_check)
+
         self.dslr_detected_label = QLabel("")
         self.dslr_detected_label.setWordWrap(True)
         dslr_layout.addWidget(self.dslr_detected_label)
@@ -251,11 +311,17 @@ class AdminScreen(QWidget):
         """)
         layout.addWidget(self.camera_preview_label)
 
+        self.preview_fps_label = QLabel("")
+        self.preview_fps_label.setStyleSheet("color: #94a3b8; font-size: 11px;")
+        layout.addWidget(self.preview_fps_label)
+
         # Signals
+        self.camera_combo.currentIndexChanged.connect(lambda _: self._populate_resolutions())
         self.camera_combo.currentIndexChanged.connect(self.start_camera_preview)
         self.resolution_combo.currentIndexChanged.connect(self.start_camera_preview)
         self.camera_type_webcam.toggled.connect(self._on_camera_type_changed)
         self.camera_type_dslr.toggled.connect(self._on_camera_type_changed)
+        self.dslr_live_view_check.toggled.connect(self.start_camera_preview)
         layout.addStretch()
 
         widget.setLayout(layout)
@@ -280,6 +346,129 @@ class AdminScreen(QWidget):
         if path:
             self.gphoto2_path_edit.setText(path)
 
+    def _refresh_cameras(self):
+        """List webcams in the background; the combo is updated when done.
+
+        Where listing means opening devices, the broker's webcam is never
+        opened by the probe. Once a list is known, it is not probed again
+        while the broker has its device open.
+        """
+        discovery = default_discovery()
+        in_use = ()
+        if self.camera_broker is not None:
+            kind, index = getattr(self.camera_broker.controller, "device_key", (None, None))
+            if kind == "webcam":
+                in_use = (index,)
+            if discovery.probes and self.camera_broker.session.is_open:
+                cameras = discovery.cached()
+                if cameras is not None:
+                    self._on_cameras_discovered(cameras)
+                    return
+        discovery.discover_async(self.cameras_discovered.emit, in_use)
+
+    def _fill_camera_combo(self, cameras, selected_id):
+        self.camera_combo.blockSignals(True)
+        self.camera_combo.clear()
+        if cameras:
+            for device_id, name in cameras:
+                self.camera_combo.addItem(name, device_id)
+        else:
+            self.camera_combo.addItem("Aucune caméra détectée", 0)
+        index = self.camera_combo.findData(selected_id)
+        if index >= 0:
+            self.camera_combo.setCurrentIndex(index)
+        self.camera_combo.blockSignals(False)
+
+    def _on_cameras_discovered(self, cameras):
+        selected_id = self.camera_combo.currentData()
+        self._fill_camera_combo(cameras, selected_id)
+        if self.camera_combo.currentData() != selected_id:
+            # The selected camera is gone; a hidden screen must not open
+            # the replacement (showEvent starts the preview)
+            self._populate_resolutions()
+            if self.isVisible():
+                self.start_camera_preview()
+
+    _STATIC_RESOLUTIONS = (
+        ("1920x1080 (Full HD)", (1920, 1080)),
+        ("1280x720 (HD)", (1280, 720)),
+        ("640x480 (VGA)", (640, 480)),
+    )
+
+    def _populate_resolutions(self, selected=None):
+        """Fill the resolution list, with measured frame rates once probed."""
+        if selected is None:
+            selected = self.resolution_combo.currentData()
+        device_id = self.camera_combo.currentData()
+        modes = saved_modes(self.config.camera, int(device_id) if device_id is not None else 0)
+        self.resolution_combo.blockSignals(True)
+        self.resolution_combo.clear()
+        if modes:
+            for resolution in sorted(modes, key=lambda r: r[0] * r[1], reverse=True):
+                mode = modes[resolution]
+                self.resolution_combo.addItem(
+                    f"{mode.width}x{mode.height} — {mode.fourcc} {mode.measured_fps:.0f} i/s mesurés",
+                    resolution,
+                )
+        else:
+            for label, resolution in self._STATIC_RESOLUTIONS:
+                self.resolution_combo.addItem(label, resolution)
+        index = self.resolution_combo.findData(tuple(selected) if selected else None)
+        if index >= 0:
+            self.resolution_combo.setCurrentIndex(index)
+        self.resolution_combo.blockSignals(False)
+
+    def _probe_camera_modes(self):
+        """Measure the capture modes of the selected webcam and keep the results."""
+        if self._probe_thread is not None:
+            return
+        device_id = self.camera_combo.currentData()
+        device_id = int(device_id) if device_id is not None else 0
+        self.stop_camera_preview()
+        if self.camera_broker is not None and \
+                getattr(self.camera_broker.controller, "device_key", None) == ("webcam", device_id):
+            if self.camera_broker.session.holders:
+                self.probe_status_label.setText("Caméra occupée, réessayez depuis l'écran d'accueil")
+                return
+            # Idling after the capture screen: the probe needs the device itself
+            self.camera_broker.session.close()
+
+        # Up to ~1.5 s per mode: measured on a worker thread. Leaving or
+        # saving would reopen the device mid-probe, so both wait for it
+        self._set_probing(True)
+
+        def run():
+            try:
+                modes = probe_camera(device_id, on_progress=self.probe_progress.emit)
+            except Exception as e:
+                print(f"[AdminScreen] Camera probe failed: {e}")
+                modes = []
+            self.modes_probed.emit(device_id, modes)
+
+        self._probe_thread = threading.Thread(target=run, name="camera-probe", daemon=True)
+        self._probe_thread.start()
+
+    def _set_probing(self, probing: bool):
+        for button in (self.probe_btn, self.back_btn, self.save_btn):
+            button.setEnabled(not probing)
+
+    def _on_probe_progress(self, text: str):
+        self.probe_status_label.setText(f"Mesure en cours… {text}")
+
+    def _on_modes_probed(self, device_id: int, modes):
+        self._probe_thread = None
+        self._set_probing(False)
+        if modes:
+            self.config.camera.probed_modes[str(device_id)] = [mode.to_dict() for mode in modes]
+            self.probe_status_label.setText(
+                f"{len(modes)} mode(s) mesuré(s) — enregistrez pour les appliquer"
+            )
+            self._populate_resolutions()
+        else:
+            self.probe_status_label.setText("Aucun mode n'a pu être mesuré")
+        if self.isVisible():
+            self.start_camera_preview()
+
     def _detect_dslr_cameras(self):
         """Run gphoto2 --auto-detect and show results."""
         gphoto2 = self.gphoto2_path_edit.text().strip() or "gphoto2"
@@ -728,6 +917,7 @@ class AdminScreen(QWidget):
         if self.camera_type_dslr.isChecked():
             self.config.camera.camera_type = "dslr"
             self.config.camera.gphoto2_path = self.gphoto2_path_edit.text().strip() or "gphoto2"
+            self.config.camera.dslr_live_view = self.dslr_live_view_check.isChecked()
         else:
             self.config.camera.camera_type = "webcam"
             selected_device = self.camera_combo.currentData()
@@ -736,6 +926,11 @@ class AdminScreen(QWidget):
             selected_resolution = self.resolution_combo.currentData() or (1920, 1080)
             self.config.camera.resolution_width = int(selected_resolution[0])
             self.config.camera.resolution_height = int(selected_resolution[1])
+            self.config.camera.threaded_capture = self.threaded_capture_check.isChecked()
+            still_resolution = self.still_resolution_combo.currentData() or (0, 0)
+            self.config.camera.still_resolution_width = int(still_resolution[0])
+            self.config.camera.still_resolution_height = int(still_resolution[1])
+        self.config.camera.idle_release_seconds = self.idle_release_spin.value()
         
         # Update email config
         self.config.email.enabled = self.email_enabled.isChecked()
@@ -782,17 +977,22 @@ class AdminScreen(QWidget):
 
     def start_camera_preview(self):
         """Start live camera preview in admin camera tab."""
-        if self.tabs.currentIndex() != 0:
-            return
+        if self.tabs.currentIndex() != 0 or self._probe_thread is not None:
+            return      # the probe has the device; it restarts the preview
 
         self.stop_camera_preview()
 
+        if self._subscribe_shared_camera():
+            return
+
         if self.camera_type_dslr.isChecked():
             gphoto2 = self.gphoto2_path_edit.text().strip() or "gphoto2"
-            self.preview_controller = DSLRController(gphoto2)
+            self.preview_controller = DSLRController(
+                gphoto2, live_view=self.dslr_live_view_check.isChecked()
+            )
             if self.preview_controller.start():
                 self.camera_preview_label.setText("")
-                self.preview_timer.start(1500)  # DSLR liveview is slow
+                self._start_preview_timer(self.preview_controller)
             else:
                 self.camera_preview_label.setText(
                     f"DSLR : {self.preview_controller.last_error or 'Appareil non détecté'}"
@@ -801,40 +1001,117 @@ class AdminScreen(QWidget):
         else:
             device_id = self.camera_combo.currentData()
             resolution = self.resolution_combo.currentData() or (1280, 720)
+            device_id = int(device_id) if device_id is not None else 0
             self.preview_controller = CameraController(
-                int(device_id) if device_id is not None else 0, resolution
+                device_id, resolution,
+                threaded=self.threaded_capture_check.isChecked(),
+                modes=saved_modes(self.config.camera, device_id),
             )
             if self.preview_controller.start():
                 self.camera_preview_label.setText("")
-                self.preview_timer.start(80)
+                self._start_preview_timer(self.preview_controller)
             else:
                 self.camera_preview_label.setPixmap(QPixmap())
                 self.camera_preview_label.setText("Impossible d'ouvrir la caméra sélectionnée")
                 self.preview_controller = None
 
+    def _subscribe_shared_camera(self) -> bool:
+        """Preview through the app's camera broker if it owns the selected device.
+
+        Opening the same device a second time fails or renegotiates it, so
+        the preview subscribes instead; a changed resolution reconfigures
+        the shared device in place.
+        """
+        if self.camera_broker is None:
+            return False
+        if self.camera_type_dslr.isChecked():
+            key = ("dslr", self.gphoto2_path_edit.text().strip() or "gphoto2")
+        else:
+            device_id = self.camera_combo.currentData()
+            key = ("webcam", int(device_id) if device_id is not None else 0)
+        controller = self.camera_broker.controller
+        if getattr(controller, "device_key", None) != key:
+            return False
+
+        if not self.camera_type_dslr.isChecked():
+            self.camera_broker.set_resolution(self.resolution_combo.currentData() or (1280, 720))
+        size = self.camera_preview_label.size()
+        self._preview_subscription = self.camera_broker.subscribe(
+            "admin", target_size=(size.width(), size.height()), max_fps=15
+        )
+        if self._preview_subscription is None:
+            self.camera_preview_label.setPixmap(QPixmap())
+            self.camera_preview_label.setText("Impossible d'ouvrir la caméra sélectionnée")
+            return True
+        self.camera_preview_label.setText("")
+        self._start_preview_timer(controller)
+        return True
+
+    def _start_preview_timer(self, controller):
+        """Poll the preview at the camera's rate (first guess from its type)."""
+        self.preview_scheduler.reset()
+        self.preview_scheduler.set_source_fps(1000.0 / self._preview_interval(controller))
+        self.preview_scheduler.set_source_fps(source_fps(controller))
+        self.preview_timer.start(self.preview_scheduler.interval_ms)
+
+    @staticmethod
+    def _preview_interval(controller) -> int:
+        """Initial preview timer period in ms for a controller."""
+        if isinstance(controller, DSLRController):
+            # One-shot gphoto2 per frame is slow; the shell session is not,
+            # and a movie stream delivers frames at the camera's own rate
+            if controller.live_view:
+                return 33
+            return 200 if controller.session else 1500
+        return 80
+
     def update_camera_preview(self):
         """Update camera preview frame."""
-        if not self.preview_controller:
-            return
-
-        frame = self.preview_controller.get_frame()
-        if frame is None:
+        start = time.perf_counter()
+        if self._preview_subscription is not None:
+            packet = self._preview_subscription.poll()
+            controller = self.camera_broker.controller
+        elif self.preview_controller:
+            packet = self.preview_controller.get_frame_packet()
+            controller = self.preview_controller
+        else:
             return
-
-        height, width, channel = frame.shape
-        bytes_per_line = 3 * width
-        q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_image)
+        if packet is None or packet.seq == self._preview_seq:
+            return  # no new frame since last repaint
+        self._preview_seq = packet.seq
+        frame = packet.frame
+
+        scheduler = self.preview_scheduler
+        # Past the first level the cheap filter is good enough for a settings preview
+        mode = (Qt.TransformationMode.SmoothTransformation if scheduler.level == 0
+                else Qt.TransformationMode.FastTransformation)
+        pixmap = QPixmap.fromImage(frame_to_qimage(frame, packet.pixel_format))
         scaled = pixmap.scaled(
             self.camera_preview_label.size(),
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            mode
         )
         self.camera_preview_label.setPixmap(scaled)
 
+        scheduler.frame_shown()
+        scheduler.set_source_fps(source_fps(controller))
+        scheduler.record_cost((time.perf_counter() - start) * 1000.0)
+        if self.preview_timer.interval() != scheduler.interval_ms:
+            self.preview_timer.setInterval(scheduler.interval_ms)
+        camera_fps = getattr(controller, "measured_fps", 0.0)
+        self.preview_fps_label.setText(
+            f"Aperçu : {scheduler.achieved_fps:.1f} i/s"
+            + (f" · caméra : {camera_fps:.1f} i/s mesurés" if camera_fps else "")
+        )
+
     def stop_camera_preview(self):
         """Stop live camera preview."""
         self.preview_timer.stop()
+        self.preview_fps_label.setText("")
+        self._preview_seq = 0
+        if self._preview_subscription is not None:
+            self._preview_subscription.close()
+            self._preview_subscription = None
         if self.preview_controller:
             self.preview_controller.stop()
             self.preview_controller = None
@@ -842,6 +1119,7 @@ class AdminScreen(QWidget):
     def showEvent(self, event):
         """Handle show event."""
         super().showEvent(event)
+        self._refresh_cameras()   # picks up plugged/unplugged webcams
         if self.tabs.currentIndex() == 0:
             self.start_camera_preview()
 
@@ -1,15 +1,21 @@
 """Capture screen for taking photos with countdown."""
 import os
 import sys
+import time
+from typing import Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QMessageBox
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QIcon, QImage, QPixmap, QFont, QPainter, QColor
+from PyQt6.QtGui import QIcon, QFont
 from src.controllers.camera_controller import CameraController
+from src.controllers.camera_broker import CameraBroker
+from src.controllers.frame_scheduler import FrameScheduler, source_fps
 from src.controllers.photo_controller import PhotoController
+from src.controllers.preview_renderer import PreviewRenderer
 from src.models.photo import Photo
+from src.views.preview_widget import PreviewLabel
 
 if sys.platform == "win32":
     import winsound
@@ -23,9 +29,13 @@ class CaptureScreen(QWidget):
     gallery_requested = pyqtSignal()       # Signal to open gallery
     admin_requested = pyqtSignal()         # Signal to open admin
     
-    def __init__(self, camera_controller: CameraController, photo_controller: PhotoController):
+    def __init__(self, camera_controller: CameraController, photo_controller: PhotoController,
+                 camera_broker: Optional[CameraBroker] = None):
         super().__init__()
         self.camera = camera_controller
+        self.camera_broker = camera_broker
+        self._subscription = None
+        self._camera_held = False
         self.photo_controller = photo_controller
         self.selected_frame = None
         self.buttons_config = None
@@ -40,6 +50,10 @@ class CaptureScreen(QWidget):
         # countdown uses singleShot chain (no repeating timer to avoid tick accumulation)
 
         self.frame_preview_cache = {}
+        self._display_size = (1024, 768)
+        self._last_frame_seq = 0
+        self.renderer: Optional[PreviewRenderer] = None
+        self.scheduler = FrameScheduler()
         
         self.init_ui()
     
@@ -50,7 +64,7 @@ class CaptureScreen(QWidget):
         layout.setSpacing(0)
         
         # Camera preview
-        self.preview_label = QLabel()
+        self.preview_label = PreviewLabel()
         self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.preview_label.setStyleSheet("""
             background-color: #0f172a;
@@ -373,6 +387,14 @@ class CaptureScreen(QWidget):
         """)
         self._apply_image_button_styles()
 
+    def _update_display_size(self):
+        """Remember the preview area size the live view is rendered at."""
+        self._display_size = (
+            max(1, self.preview_label.width()),
+            max(1, self.preview_label.height()),
+        )
+        self._configure_renderer()
+
     def _adapt_capture_button_size(self):
         """Adapt capture button size to preview area."""
         ref_size = min(self.preview_label.width(), self.preview_label.height())
@@ -395,6 +417,7 @@ class CaptureScreen(QWidget):
         """
         self.selected_frame = frame_path if frame_path else None
         self.frame_preview_cache = {}
+        self._configure_renderer()
 
     def set_buttons_config(self, buttons_config):
         """Update button images from configuration.
@@ -414,92 +437,128 @@ class CaptureScreen(QWidget):
         self.countdown_sound_path = sound_path or ""
 
     def start_camera(self):
-        """Start the camera preview."""
-        if not self.camera.is_active:
-            if self.camera.start():
-                self.timer.start(30)  # Update at ~30 FPS
-            else:
-                self.capture_btn.setEnabled(False)
-                self.preview_label.setText("Impossible d'ouvrir la caméra.\nVérifiez la configuration dans Administration.")
-                self.preview_label.setStyleSheet("""
-                    background-color: #0f172a;
-                    color: #cbd5e1;
-                    border: 2px solid #1e293b;
-                    border-radius: 14px;
-                    padding: 24px;
-                """)
+        """Start the camera preview.
+
+        With a camera broker the device usually is still open from the
+        previous visit, so the preview resumes without reopening it.
+        """
+        if self._camera_held:
+            return
+        if self.camera_broker is not None:
+            self._subscription = self.camera_broker.subscribe("capture")
+            ready = self._subscription is not None
+        else:
+            ready = self.camera.is_active or self.camera.start()
+        if ready:
+            self._camera_held = True
+            self._last_frame_seq = 0
+            self._start_renderer()
+            self.timer.start(self.scheduler.interval_ms)
+        else:
+            self.capture_btn.setEnabled(False)
+            self.preview_label.clear_frame()
+            self.preview_label.setText("Impossible d'ouvrir la caméra.\nVérifiez la configuration dans Administration.")
+            self.preview_label.setStyleSheet("""
+                background-color: #0f172a;
+                color: #cbd5e1;
+                border: 2px solid #1e293b;
+                border-radius: 14px;
+                padding: 24px;
+            """)
     
     def stop_camera(self):
-        """Stop the camera preview."""
+        """Stop the camera preview (the broker may keep the device open)."""
         self.timer.stop()
-        self.camera.stop()
+        if self.renderer is not None:
+            # The worker reads the camera: it must be gone first
+            self.renderer.stop()
+            self.renderer = None
+        if self._camera_held:
+            self._camera_held = False
+            if self._subscription is not None:
+                self._subscription.close()
+                self._subscription = None
+            else:
+                self.camera.stop()
         self.capture_btn.setEnabled(True)
     
-    def update_frame(self):
-        """Update the camera preview frame."""
-        frame = self.camera.get_frame()
-        if frame is not None:
-            display_frame = frame
-            if self.selected_frame:
-                try:
-                    display_frame = self.photo_controller.apply_frame_to_array_preview(frame, self.selected_frame)
-                except Exception:
-                    display_frame = frame
+    def _start_renderer(self):
+        """Render the live view on a worker; the GUI thread only paints."""
+        self.scheduler.reset()
+        self.scheduler.set_source_fps(source_fps(self._controller()))
+        self.renderer = PreviewRenderer(self.photo_controller, self._next_packet)
+        self._configure_renderer()
+        self.renderer.start()
+
+    def _controller(self):
+        return self.camera_broker.controller if self.camera_broker is not None else self.camera
+
+    def _configure_renderer(self):
+        """Apply the frame, size and pacing chosen by the scheduler to the worker."""
+        if self.renderer is None:
+            return
+        scale = self.scheduler.resolution_scale
+        size = (max(1, int(self._display_size[0] * scale)),
+                max(1, int(self._display_size[1] * scale)))
+        self.renderer.configure(self.selected_frame, size)
+        self.renderer.idle_wait = self.scheduler.poll_interval
+        self.renderer.min_interval = self.scheduler.render_interval
+
+    def _pace(self, tick_ms: float):
+        """Follow the camera's frame rate and degrade when rendering can't keep up."""
+        interval = self.scheduler.interval_ms
+        self.scheduler.set_source_fps(source_fps(self._controller()))
+        # The worker's render is the real cost of a preview frame
+        if (self.scheduler.record_cost(self.renderer.render_ms + tick_ms)
+                or interval != self.scheduler.interval_ms):
+            self._configure_renderer()
+        if self.timer.interval() != self.scheduler.interval_ms:
+            self.timer.setInterval(self.scheduler.interval_ms)
+
+    @property
+    def preview_fps(self) -> float:
+        """Frame rate the live preview currently achieves on screen."""
+        return self.scheduler.achieved_fps
+
+    def _next_packet(self):
+        """New camera frame for the renderer, or None (worker thread)."""
+        if self._subscription is not None:
+            return self._subscription.poll()
+        packet = self.camera.get_frame_packet()
+        if packet is None or packet.seq == self._last_frame_seq:
+            return None
+        self._last_frame_seq = packet.seq
+        return packet
 
+    def update_frame(self):
+        """Show the newest preview frame rendered by the worker."""
+        start = time.perf_counter()
+        if self.is_capturing:
+            self.preview_label.set_overlay_text(str(self.countdown) if self.countdown > 0 else "📷")
+        else:
+            self.preview_label.set_overlay_text("")
+
+        packet = self.renderer.take() if self.renderer is not None else None
+        if packet is None:
+            return  # nothing new rendered: no repaint
+        if self.preview_label.text():
+            # Leaving the "camera unavailable" state
+            self.preview_label.setText("")
             self.preview_label.setStyleSheet("""
                 background-color: #0f172a;
                 border: 2px solid #1e293b;
                 border-radius: 14px;
             """)
-            # Convert numpy array to QImage
-            height, width, channel = display_frame.shape
-            bytes_per_line = 3 * width
-            q_image = QImage(display_frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-            
-            # Scale to fit preview
-            pixmap = QPixmap.fromImage(q_image)
-            scaled_pixmap = pixmap.scaled(
-                self.preview_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
-            )
-
-            # Center-crop to fill the whole preview area
-            target_width = max(1, self.preview_label.width())
-            target_height = max(1, self.preview_label.height())
-            if scaled_pixmap.width() > target_width or scaled_pixmap.height() > target_height:
-                x = max(0, (scaled_pixmap.width() - target_width) // 2)
-                y = max(0, (scaled_pixmap.height() - target_height) // 2)
-                scaled_pixmap = scaled_pixmap.copy(x, y, target_width, target_height)
-
-            if self.is_capturing:
-                painter = QPainter(scaled_pixmap)
-                painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-                if self.countdown > 0:
-                    overlay_text = str(self.countdown)
-                else:
-                    overlay_text = "📷"
-
-                font_size = max(64, min(scaled_pixmap.width(), scaled_pixmap.height()) // 3)
-                font = QFont("Segoe UI", font_size, QFont.Weight.Bold)
-                painter.setFont(font)
-
-                painter.setPen(QColor(15, 23, 42, 210))
-                painter.drawText(
-                    scaled_pixmap.rect().adjusted(4, 4, 4, 4),
-                    Qt.AlignmentFlag.AlignCenter,
-                    overlay_text
-                )
-
-                painter.setPen(QColor(249, 115, 22))
-                painter.drawText(
-                    scaled_pixmap.rect(),
-                    Qt.AlignmentFlag.AlignCenter,
-                    overlay_text
-                )
-                painter.end()
-
-            self.preview_label.setPixmap(scaled_pixmap)
+        # Frame is already cropped and scaled to the preview area
+        self.preview_label.set_frame(packet.frame, packet.pixel_format,
+                                     self._rendered_scale(packet.frame))
+        self.scheduler.frame_shown()
+        self._pace((time.perf_counter() - start) * 1000.0)
+
+    def _rendered_scale(self, frame) -> float:
+        """Fraction of the display size a rendered frame was made at."""
+        height, width = frame.shape[:2]
+        return min(1.0, max(width / self._display_size[0], height / self._display_size[1]))
     
     def start_countdown(self):
         """Start the countdown before capture."""
@@ -512,9 +571,21 @@ class CaptureScreen(QWidget):
         self.gallery_btn.hide()
         self.admin_hotspot_btn.hide()
         self.fullscreen_hotspot_btn.hide()
+        # Rasterize the countdown glyphs now rather than on the first frames
+        self.preview_label.prepare_overlay_texts(["3", "2", "1", "📷"])
         # Beep immediately for 3 then schedule each tick with singleShot
         self._play_countdown_sound()
         QTimer.singleShot(1000, self._countdown_tick)
+        # A dual-mode camera switches to its photo mode during the last
+        # moments of the countdown, so the switch does not delay the shutter
+        lead_ms = getattr(self.camera, "capture_lead_ms", 0.0)
+        if lead_ms:
+            shutter_in_ms = self.countdown * 1000 + 500
+            QTimer.singleShot(max(0, int(shutter_in_ms - lead_ms)), self._prepare_capture)
+
+    def _prepare_capture(self):
+        if self.is_capturing and self._camera_held:
+            self.camera.prepare_capture()
 
     def _countdown_tick(self):
         """One countdown step — called via singleShot chain to guarantee 1s gaps."""
@@ -527,8 +598,16 @@ class CaptureScreen(QWidget):
     
     def capture_photo(self):
         """Capture the photo."""
+        shutter_time = time.monotonic()
         self._play_shutter_sound()
-        photo = self.camera.capture_photo(self.selected_frame)
+        # Keep the preview worker off the camera while it captures
+        if self.renderer is not None:
+            self.renderer.stop()
+        try:
+            photo = self.camera.capture_photo(self.selected_frame, shutter_time=shutter_time)
+        finally:
+            if self.renderer is not None and self._camera_held:
+                self.renderer.start()
         
         if photo:
             # Store frame path in photo object but don't apply yet
@@ -558,7 +637,13 @@ class CaptureScreen(QWidget):
         self.choose_frame_btn.show()
         self.gallery_btn.show()
         self._adapt_capture_button_size()
+        self._update_display_size()
         self.start_camera()
+
+    def resizeEvent(self, event):
+        """Handle resize event: preview geometry is only recomputed here."""
+        super().resizeEvent(event)
+        self._update_display_size()
     
     def hideEvent(self, event):
         """Handle hide event."""
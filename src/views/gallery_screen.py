@@ -1,11 +1,179 @@
 """Gallery screen to browse previously captured photos."""
 import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QGridLayout, QScrollArea
+    QPushButton, QListView, QStyledItemDelegate
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPixmap, QFont
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QAbstractListModel, QFileSystemWatcher, QModelIndex, QPoint, QRect, QSize,
+    QTimer
+)
+from PyQt6.QtGui import QPixmap, QFont, QPainter, QPen, QColor
+from src.controllers.photo_index import PhotoIndex
+from src.controllers.thumbnail_cache import THUMBNAIL_SIZE, ThumbnailCache
+from src.controllers.thumbnail_loader import ThumbnailLoader, list_photos
+from src.views.preview_widget import frame_to_qimage
+
+TILE_SIZE = (300, 220)
+
+
+class GalleryModel(QAbstractListModel):
+    """Photo paths as a list model whose thumbnails load in the background.
+
+    data() hands out a decoded thumbnail if there is one and otherwise
+    queues it, so the view only triggers decodes for tiles it paints.
+    Thumbnails are kept in a bounded LRU.
+    """
+
+    # ThumbnailLoader reports on its worker threads; the queued signal
+    # brings results to the GUI thread
+    _thumbnail_ready = pyqtSignal(str, object)
+
+    def __init__(self, thumbnail_size=THUMBNAIL_SIZE, cache_size: int = 400, parent=None):
+        super().__init__(parent)
+        self.cache_size = cache_size
+        self._paths: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._pixmaps: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.loader = ThumbnailLoader(thumbnail_size, on_ready=self._thumbnail_ready.emit)
+
+    def set_paths(self, paths: List[str]):
+        self.beginResetModel()
+        self.loader.retain(())
+        self._paths = list(paths)
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+        self.endResetModel()
+
+    def paths(self) -> List[str]:
+        return list(self._paths)
+
+    def insert_path(self, path: str, row: int = 0) -> bool:
+        """Add one photo at ``row``; False if it is already listed."""
+        if path in self._rows:
+            return False
+        row = max(0, min(row, len(self._paths)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._paths.insert(row, path)
+        self.endInsertRows()
+        self._reindex(row)
+        return True
+
+    def update_paths(self, paths: List[str]):
+        """Move to ``paths`` with row removals and insertions only.
+
+        Tiles that stay keep their thumbnails, and the view only lays out
+        the rows that changed. Falls back to a reset if the photos that
+        stay are not in the same order as before.
+        """
+        wanted = set(paths)
+        removed = [row for row, path in enumerate(self._paths) if path not in wanted]
+        first_changed = removed[0] if removed else len(self._paths)
+        # Bottom-up, one contiguous range at a time, so rows above stay valid
+        while removed:
+            last = removed.pop()
+            first = last
+            while removed and removed[-1] == first - 1:
+                first = removed.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for path in self._paths[first:last + 1]:
+                self.loader.cancel(path)
+                self._pixmaps.pop(path, None)
+                self._rows.pop(path, None)
+            del self._paths[first:last + 1]
+            self.endRemoveRows()
+
+        row = 0
+        while row < len(paths):
+            if row < len(self._paths) and self._paths[row] == paths[row]:
+                row += 1
+                continue
+            end = row
+            while end < len(paths) and paths[end] not in self._rows:
+                end += 1
+            if end == row:
+                break       # a kept photo moved
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._paths[row:row] = paths[row:end]
+            for path in paths[row:end]:
+                self._rows[path] = -1
+            self.endInsertRows()
+            first_changed = min(first_changed, row)
+            row = end
+
+        if self._paths != list(paths):
+            self.set_paths(paths)
+        else:
+            self._reindex(min(first_changed, len(self._paths)))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self._paths[index.row()]
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._pixmaps.get(path)
+            if pixmap is None:
+                self.loader.request(path)
+                return None
+            self._pixmaps.move_to_end(path)
+            return pixmap
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return os.path.basename(path)
+        if role == Qt.ItemDataRole.UserRole:
+            return path
+        return None
+
+    def retain_rows(self, first: int, last: int):
+        """Cancel queued decodes outside rows ``first``..``last``."""
+        first = max(0, first)
+        self.loader.retain(self._paths[first:last + 1])
+
+    def _reindex(self, start: int):
+        for row in range(start, len(self._paths)):
+            self._rows[self._paths[row]] = row
+
+    def _on_thumbnail_ready(self, path: str, image):
+        # An unreadable file gets an empty pixmap so it is not retried
+        pixmap = QPixmap.fromImage(frame_to_qimage(image)) if image is not None else QPixmap()
+        self._pixmaps[path] = pixmap
+        self._pixmaps.move_to_end(path)
+        while len(self._pixmaps) > self.cache_size:
+            self._pixmaps.popitem(last=False)
+        row = self._rows.get(path)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Paints a rounded tile with the thumbnail, or an empty tile while it loads."""
+
+    def sizeHint(self, option, index):
+        return QSize(*TILE_SIZE)
+
+    def paint(self, painter, option, index):
+        tile = QRect(0, 0, TILE_SIZE[0], TILE_SIZE[1])
+        tile.moveCenter(option.rect.center())
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor("#334155"), 2))
+        painter.setBrush(QColor("#111827"))
+        painter.drawRoundedRect(tile.adjusted(1, 1, -1, -1), 14, 14)
+
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            target = QRect(QPoint(0, 0), pixmap.size())
+            target.moveCenter(tile.center())
+            painter.drawPixmap(target, pixmap)
+        elif pixmap is None:
+            painter.setPen(QColor("#475569"))
+            painter.drawText(tile, Qt.AlignmentFlag.AlignCenter, "…")
+        painter.restore()
 
 
 class GalleryScreen(QWidget):
@@ -59,10 +227,37 @@ class GalleryScreen(QWidget):
         self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.empty_label.setStyleSheet("color: #cbd5e1;")
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Only the tiles on screen are painted, and thumbnails are decoded
+        # on a thread pool: opening a gallery of hundreds of photos costs
+        # a directory listing, not hundreds of full-size JPEG decodes
+        self.model = GalleryModel(THUMBNAIL_SIZE)
+        self._photos_directory = None
+        self._photo_index: Optional[PhotoIndex] = None
+
+        # The model outlives visits to the screen; the watcher marks it
+        # stale when files come and go behind the app's back
+        self._dirty = False
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(300)
+        self._refresh_timer.timeout.connect(self._refresh)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(ThumbnailDelegate(self.list_view))
+        self.list_view.setViewMode(QListView.ViewMode.IconMode)
+        self.list_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.list_view.setMovement(QListView.Movement.Static)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.list_view.setBatchSize(200)
+        self.list_view.setGridSize(QSize(TILE_SIZE[0] + 18, TILE_SIZE[1] + 18))
+        self.list_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.list_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.list_view.verticalScrollBar().setSingleStep(40)
+        self.list_view.setStyleSheet("""
+            QListView {
                 border: none;
                 background: transparent;
             }
@@ -85,57 +280,94 @@ class GalleryScreen(QWidget):
                 background: transparent;
             }
         """)
-
-        self.grid_container = QWidget()
-        self.grid_layout = QGridLayout(self.grid_container)
-        self.grid_layout.setHorizontalSpacing(18)
-        self.grid_layout.setVerticalSpacing(18)
-
-        scroll_area.setWidget(self.grid_container)
+        self.list_view.verticalScrollBar().valueChanged.connect(self._retain_visible)
 
         layout.addWidget(self.empty_label)
-        layout.addWidget(scroll_area, 1)
+        layout.addWidget(self.list_view, 1)
 
         self.setLayout(layout)
         self.setStyleSheet("background-color: #0f172a;")
 
-    def load_photos(self, photos_directory: str):
-        """Load all photos from directory into gallery grid."""
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        image_paths = []
-        if os.path.exists(photos_directory):
-            for file_name in os.listdir(photos_directory):
-                if file_name.lower().endswith((".jpg", ".jpeg", ".png")):
-                    image_paths.append(os.path.join(photos_directory, file_name))
-
-        image_paths.sort(reverse=True)
-        self.empty_label.setVisible(len(image_paths) == 0)
-
-        for index, image_path in enumerate(image_paths):
-            thumbnail = QLabel()
-            thumbnail.setFixedSize(300, 220)
-            thumbnail.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            thumbnail.setStyleSheet("""
-                QLabel {
-                    background-color: #111827;
-                    border: 2px solid #334155;
-                    border-radius: 14px;
-                }
-            """)
-
-            pixmap = QPixmap(image_path)
-            if not pixmap.isNull():
-                scaled = pixmap.scaled(
-                    thumbnail.size(),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                thumbnail.setPixmap(scaled)
-
-            row = index // 4
-            col = index % 4
-            self.grid_layout.addWidget(thumbnail, row, col)
+    def load_photos(self, photos_directory: str, photo_index: Optional[PhotoIndex] = None):
+        """Show the photos of a directory; thumbnails arrive as they are decoded.
+
+        The first call lists the directory. Later calls for the same
+        directory only apply what changed since: captures were added with
+        add_photo() as they were saved, and other changes are picked up if
+        the directory watcher reported any.
+
+        Args:
+            photos_directory: Directory holding the photos
+            photo_index: Index of the directory; without one it is listed
+        """
+        if photos_directory != self._photos_directory:
+            # Thumbnails saved with the photos: a tile costs a ~20 KB read
+            self._photos_directory = photos_directory
+            self._photo_index = photo_index
+            self.model.loader.decode = ThumbnailCache(photos_directory).load
+            if self.watcher.directories():
+                self.watcher.removePaths(self.watcher.directories())
+            if os.path.isdir(photos_directory):
+                self.watcher.addPath(photos_directory)
+            self._dirty = False
+            self.model.set_paths(self._list_photos())
+        elif self._dirty:
+            self._refresh()
+        self.empty_label.setVisible(self.model.rowCount() == 0)
+        self.list_view.scrollToTop()
+
+    def add_photo(self, path: str):
+        """Add a photo just saved by the app at the top of the gallery."""
+        if self._photos_directory is None or \
+                os.path.dirname(os.path.abspath(path)) != os.path.abspath(self._photos_directory):
+            return      # listed when that directory is first opened
+        if self.model.insert_path(path, 0):
+            self.empty_label.setVisible(False)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._retain_visible()
+
+    def _list_photos(self) -> List[str]:
+        if self._photo_index is not None:
+            self._photo_index.reconcile()
+            return self._photo_index.final_paths()
+        return list_photos(self._photos_directory)
+
+    def _on_directory_changed(self, _path: str):
+        """Files were added to or removed from the photos directory."""
+        self._dirty = True
+        if self.isVisible():
+            self._refresh_timer.start()     # coalesce bursts of events
+
+    def _refresh(self):
+        if not self._dirty or self._photos_directory is None:
+            return
+        self._dirty = False
+        self.model.update_paths(self._list_photos())
+        self.empty_label.setVisible(self.model.rowCount() == 0)
+        self._retain_visible()
+
+    def visible_rows(self):
+        """(first, last) model rows of the tiles in the viewport.
+
+        Worked out from the scroll position and the grid, since
+        indexAt() returns nothing for points in the gaps between tiles.
+        """
+        viewport = self.list_view.viewport().rect()
+        grid = self.list_view.gridSize()
+        per_row = max(1, viewport.width() // grid.width())
+        top = self.list_view.verticalScrollBar().value()
+        first_line = top // grid.height()
+        last_line = (top + viewport.height()) // grid.height()
+        last = min(self.model.rowCount(), (last_line + 1) * per_row) - 1
+        return first_line * per_row, last
+
+    def _retain_visible(self):
+        """Drop queued thumbnail decodes for tiles scrolled out of view."""
+        if self.model.rowCount() == 0:
+            return
+        first_row, last_row = self.visible_rows()
+        # A row of tiles either side stays queued for smooth scrolling
+        per_row = max(1, self.list_view.viewport().width() // self.list_view.gridSize().width())
+        self.model.retain_rows(first_row - per_row, last_row + per_row)
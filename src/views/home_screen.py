@@ -6,6 +6,10 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap, QFont
+from src.controllers.thumbnail_loader import ThumbnailLoader, load_cover_thumbnail
+from src.views.preview_widget import frame_to_qimage
+
+FRAME_PREVIEW_SIZE = (260, 260)
 
 
 class HomeScreen(QWidget):
@@ -13,11 +17,18 @@ class HomeScreen(QWidget):
     
     frame_selected = pyqtSignal(str)  # Signal when a frame is selected
     admin_requested = pyqtSignal()    # Signal when admin button is clicked
+    _preview_ready = pyqtSignal(str, object)  # frame path, RGBA preview (worker thread)
     
     def __init__(self):
         super().__init__()
         self.selected_frame = None
         self.show_no_frame_option = True
+        # Frame previews are decoded off the GUI thread, JPEGs at reduced scale
+        self._preview_labels = {}
+        self._preview_ready.connect(self._on_preview_ready)
+        self.preview_loader = ThumbnailLoader(
+            FRAME_PREVIEW_SIZE, on_ready=self._preview_ready.emit, decode=load_cover_thumbnail
+        )
         self.init_ui()
     
     def init_ui(self):
@@ -132,7 +143,9 @@ class HomeScreen(QWidget):
         Args:
             frames_dir: Directory containing frame images
         """
-        # Clear existing frames
+        # Clear existing frames; previews still on their way have no tile
+        self._preview_labels = {}
+        self.preview_loader.retain(())
         while self.frames_layout.count():
             item = self.frames_layout.takeAt(0)
             if item.widget():
@@ -195,17 +208,12 @@ class HomeScreen(QWidget):
         
         # Image preview
         if frame_path and os.path.exists(frame_path):
-            pixmap = QPixmap(frame_path)
-            scaled = pixmap.scaled(260, 260, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                   Qt.TransformationMode.SmoothTransformation)
-            x = max(0, (scaled.width() - 260) // 2)
-            y = max(0, (scaled.height() - 260) // 2)
-            cropped = scaled.copy(x, y, 260, 260)
             img_label = QLabel()
-            img_label.setFixedSize(260, 260)
-            img_label.setPixmap(cropped)
+            img_label.setFixedSize(*FRAME_PREVIEW_SIZE)
             img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             layout.addWidget(img_label)
+            self._preview_labels[frame_path] = img_label
+            self.preview_loader.request(frame_path)
         else:
             placeholder = QLabel("🚫")
             placeholder.setFont(QFont("Segoe UI", 72, QFont.Weight.Bold))
@@ -218,6 +226,13 @@ class HomeScreen(QWidget):
         
         return btn
     
+    def _on_preview_ready(self, frame_path, image):
+        """Show a decoded frame preview (GUI thread)."""
+        img_label = self._preview_labels.get(frame_path)
+        if img_label is None or image is None:
+            return
+        img_label.setPixmap(QPixmap.fromImage(frame_to_qimage(image, "RGBA")))
+    
     def on_frame_selected(self, frame_path, button):
         """Handle frame selection.
         
@@ -5,6 +5,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QImage, QPixmap, QFont
+from src.controllers.capture_pipeline import wait_for_path
 from src.models.photo import Photo
 
 
@@ -248,6 +249,7 @@ class PreviewScreen(QWidget):
         super().__init__()
         self.current_photo = None
         self.saved_path = None
+        self.saved_path_future = None
         self.recent_emails: list = []
         self.init_ui()
     
@@ -388,15 +390,26 @@ class PreviewScreen(QWidget):
         r, g, b = max(0, r - 30), max(0, g - 30), max(0, b - 30)
         return f"#{r:02x}{g:02x}{b:02x}"
     
-    def set_photo(self, photo: Photo, saved_path: str):
+    def set_photo(self, photo: Photo, saved_path: str = None, saved_path_future=None):
         """Set the photo to display.
         
         Args:
             photo: Photo object
             saved_path: Path where photo was saved
+            saved_path_future: Future resolving to the saved path while the
+                               photo is still being written in the background
         """
-        self.current_photo = photo
         self.saved_path = saved_path
+        self.saved_path_future = saved_path_future
+        self.update_photo(photo)
+
+    def update_photo(self, photo: Photo):
+        """Replace the displayed photo (e.g. once the framed version is ready).
+
+        Args:
+            photo: Photo object
+        """
+        self.current_photo = photo
         
         # Display photo
         height, width, channel = photo.image_data.shape
@@ -412,9 +425,16 @@ class PreviewScreen(QWidget):
         )
         self.photo_label.setPixmap(scaled_pixmap)
     
+    def _resolve_saved_path(self):
+        """Wait for the background save to finish if it is still running."""
+        if not self.saved_path and self.saved_path_future is not None:
+            self.saved_path = wait_for_path(self.saved_path_future)
+            self.saved_path_future = None
+        return self.saved_path
+
     def on_email_clicked(self):
         """Handle email button click."""
-        if not self.saved_path:
+        if not self._resolve_saved_path():
             QMessageBox.warning(self, "Email", "Aucune photo sauvegardée à envoyer.")
             return
 
@@ -428,7 +448,7 @@ class PreviewScreen(QWidget):
     
     def on_print_clicked(self):
         """Handle print button click."""
-        if not self.saved_path:
+        if not self._resolve_saved_path():
             QMessageBox.warning(
                 self,
                 "Impression",
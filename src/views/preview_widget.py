@@ -0,0 +1,145 @@
+"""Live preview widget that paints camera frames straight from a QImage."""
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QRect, QSize
+from PyQt6.QtGui import QImage, QPainter, QColor, QFont, QFontMetrics, QPixmap
+
+_QIMAGE_FORMATS = {
+    "RGB": QImage.Format.Format_RGB888,
+    "BGR": QImage.Format.Format_BGR888,
+    "RGBA": QImage.Format.Format_RGBA8888,
+}
+
+
+def frame_to_qimage(frame: np.ndarray, pixel_format: str = "RGB") -> QImage:
+    """Wrap a frame array in a QImage without converting pixels.
+
+    A C-contiguous frame is not copied either: the QImage points into it, so
+    keep the array alive (and unchanged) for as long as the image is used.
+    """
+    height, width = frame.shape[:2]
+    image_format = _QIMAGE_FORMATS[pixel_format]
+    if not frame.flags["C_CONTIGUOUS"]:
+        frame = np.ascontiguousarray(frame)
+        return QImage(frame.data, width, height, frame.strides[0], image_format).copy()
+    return QImage(frame.data, width, height, frame.strides[0], image_format)
+
+
+class PreviewLabel(QLabel):
+    """QLabel that paints the current camera frame and an optional overlay text.
+
+    Frames are drawn directly from a QImage wrapping the frame buffer, so
+    there is no QPixmap conversion per frame. Overlay texts (countdown
+    digits) are rasterized once per frame size into transparent pixmaps and
+    blitted with a single drawPixmap. Without a frame the label behaves
+    normally (stylesheet background, status text).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._image: Optional[QImage] = None
+        self._buffer: Optional[np.ndarray] = None   # keeps the QImage's memory alive
+        self._scale = 1.0
+        self._overlay_text = ""
+        self._glyph_size: Tuple[int, int] = (0, 0)
+        self._label_size = QSize()
+        self._glyphs: Dict[str, Tuple[QRect, QPixmap]] = {}
+
+    def set_frame(self, frame: np.ndarray, pixel_format: str = "RGB",
+                  scale: float = 1.0) -> None:
+        """Show a frame (already sized for display) on the next repaint.
+
+        Args:
+            frame: Image array
+            pixel_format: Channel order of ``frame``
+            scale: Fraction of the display size the frame was rendered at;
+                below 1 the frame is stretched back up when painted
+        """
+        self._buffer = frame
+        self._image = frame_to_qimage(frame, pixel_format)
+        self._scale = scale
+        self.update()
+
+    def clear_frame(self) -> None:
+        self._image = None
+        self._buffer = None
+        self.update()
+
+    def set_overlay_text(self, text: str) -> None:
+        """Text drawn centred over the frame (countdown); empty to hide."""
+        if text != self._overlay_text:
+            self._overlay_text = text
+            self.update()
+
+    def prepare_overlay_texts(self, texts: Iterable[str]) -> None:
+        """Rasterize overlay texts ahead of time for the current frame size."""
+        if self._image is not None:
+            size = self._display_size()
+            for text in texts:
+                self._glyph(text, size.width(), size.height())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Qt repeats the current size (e.g. grab() on a hidden label); keep
+        # the glyphs unless the label really changed size
+        if event.size() != self._label_size:
+            self._label_size = event.size()
+            self._glyphs.clear()
+
+    def _display_size(self) -> QSize:
+        """Size the current frame is painted at."""
+        size = self._image.size()
+        if self._scale < 1.0:
+            size = QSize(round(size.width() / self._scale), round(size.height() / self._scale))
+        return size
+
+    def _glyph(self, text: str, width: int, height: int) -> Tuple[QRect, QPixmap]:
+        """Cached (rect within the frame, pixmap) for an overlay text."""
+        if (width, height) != self._glyph_size:
+            self._glyphs.clear()
+            self._glyph_size = (width, height)
+        cached = self._glyphs.get(text)
+        if cached is not None:
+            return cached
+
+        font = QFont("Segoe UI", max(64, min(width, height) // 3), QFont.Weight.Bold)
+        rect = QFontMetrics(font).boundingRect(
+            QRect(0, 0, width, height), Qt.AlignmentFlag.AlignCenter, text
+        )
+        pixmap = QPixmap(rect.width() + 4, rect.height() + 4)   # room for the shadow offset
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(font)
+        glyph_rect = QRect(0, 0, rect.width(), rect.height())
+        painter.setPen(QColor(15, 23, 42, 210))
+        painter.drawText(glyph_rect.translated(4, 4), Qt.AlignmentFlag.AlignCenter, text)
+        painter.setPen(QColor(249, 115, 22))
+        painter.drawText(glyph_rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+
+        self._glyphs[text] = (rect, pixmap)
+        return rect, pixmap
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._image is None:
+            return
+        painter = QPainter(self)
+        rect = self.contentsRect()
+        size = self._display_size()
+        x = rect.x() + (rect.width() - size.width()) // 2
+        y = rect.y() + (rect.height() - size.height()) // 2
+        if size == self._image.size():
+            painter.drawImage(x, y, self._image)
+        else:
+            # Reduced-resolution preview: stretched with the (fast) default filter
+            painter.drawImage(QRect(x, y, size.width(), size.height()), self._image)
+
+        if self._overlay_text:
+            rect, glyph = self._glyph(self._overlay_text, size.width(), size.height())
+            painter.drawPixmap(x + rect.x(), y + rect.y(), glyph)
+        painter.end()
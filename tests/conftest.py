@@ -1,4 +1,6 @@
 """Shared fixtures for all test modules."""
+import os
+
 import numpy as np
 import pytest
 from datetime import datetime
@@ -35,3 +37,11 @@ def frame_png(tmp_path):
 @pytest.fixture
 def photo_controller(tmp_path):
     return PhotoController(photos_directory=str(tmp_path / "photos"))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """QApplication for widget tests, offscreen unless a platform is set."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
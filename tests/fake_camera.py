@@ -0,0 +1,40 @@
+"""Stand-in for cv2.VideoCapture, shared by the webcam tests."""
+import time
+
+import cv2
+import numpy as np
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture: yields numbered BGR frames."""
+
+    def __init__(self, *args, delay: float = 0.0, **kwargs):
+        self.delay = delay
+        self.count = 0
+        self.released = False
+        self.fps = 30.0
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def get(self, prop):
+        return self.fps if prop == cv2.CAP_PROP_FPS else 0.0
+
+    def read(self, image=None):
+        if self.delay:
+            time.sleep(self.delay)
+        self.count += 1
+        # Like cv2, fill the caller's array in place when it fits
+        if image is not None and image.shape == (48, 64, 3):
+            frame = image
+            frame[:] = 0
+        else:
+            frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        frame[:, :, 0] = self.count % 256   # blue channel in BGR
+        return True, frame
+
+    def release(self):
+        self.released = True
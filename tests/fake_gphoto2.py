@@ -0,0 +1,91 @@
+"""Minimal stand-in for the gphoto2 CLI, used by the DSLR tests.
+
+Supports ``--auto-detect``, ``--shell`` (capture-preview,
+capture-image-and-download, exit), one-shot ``--capture-preview`` and
+``--capture-image-and-download`` with ``--stdout``, and
+``--capture-movie --stdout``, which writes a concatenated JPEG stream until
+killed (or FAKE_MOVIE_FRAMES frames). Saved files are small canned JPEGs.
+"""
+import io
+import os
+import sys
+import time
+
+from PIL import Image
+
+PROMPT = "gphoto2: {%s} /> "
+
+
+def jpeg(width: int, height: int, color) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def shell() -> None:
+    out = sys.stdout
+    out.write(PROMPT % os.getcwd())
+    out.flush()
+    captures = 0
+    for line in sys.stdin:
+        command = line.strip()
+        if command in ("exit", "quit", "q"):
+            return
+        if command == "capture-preview":
+            with open("capture_preview.jpg", "wb") as f:
+                f.write(jpeg(64, 48, (0, 200, 0)))
+            out.write("Saving file as capture_preview.jpg\n")
+        elif command == "capture-image-and-download":
+            captures += 1
+            name = f"IMG_{captures:04d}.JPG"
+            with open(name, "wb") as f:
+                f.write(jpeg(320, 240, (200, 0, 0)))
+            out.write(f"New file is in location /store_00010001/DCIM/100CANON/{name} on the camera\n")
+            out.write(f"Saving file as {name}\n")
+            out.write(f"Deleting file /store_00010001/DCIM/100CANON/{name} on the camera\n")
+        elif command:
+            out.write(f"*** Error: unknown command '{command}' ***\n")
+        out.write(PROMPT % os.getcwd())
+        out.flush()
+
+
+def movie() -> None:
+    limit = int(os.environ.get("FAKE_MOVIE_FRAMES", "0"))
+    frames = [jpeg(64, 48, (i * 40 % 256, 0, 255 - i * 40 % 256)) for i in range(6)]
+    out = sys.stdout.buffer
+    count = 0
+    while not limit or count < limit:
+        out.write(frames[count % len(frames)])
+        out.flush()
+        count += 1
+        time.sleep(0.005)
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    if "--auto-detect" in args:
+        print("Model                          Port")
+        print("----------------------------------------------------------")
+        print("Fake Camera                    usb:001,002")
+        return 0
+    if "--shell" in args:
+        shell()
+        return 0
+    if "--capture-preview" in args and "--stdout" in args:
+        sys.stdout.buffer.write(jpeg(64, 48, (0, 200, 0)))
+        return 0
+    if "--capture-image-and-download" in args and "--stdout" in args:
+        sys.stdout.buffer.write(jpeg(320, 240, (200, 0, 0)))
+        return 0
+    if "--capture-movie" in args and "--stdout" in args:
+        try:
+            movie()
+        except BrokenPipeError:
+            pass
+        return 0
+    print(f"unsupported arguments: {args}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Tests for CameraBroker: one device, many subscribers."""
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.controllers.camera_broker import CameraBroker
+from src.controllers.camera_controller import CameraController
+from src.controllers.frame_grabber import FramePacket
+from tests.fake_camera import FakeCapture
+
+
+class CountingController:
+    """Unthreaded stand-in: every get_frame_packet() is a device read."""
+
+    def __init__(self):
+        self.is_active = False
+        self.resolution = (640, 480)
+        self.starts = 0
+        self.reads = 0
+        self.reconfigured = []
+
+    def start(self):
+        self.starts += 1
+        self.is_active = True
+        return True
+
+    def stop(self):
+        self.is_active = False
+
+    def set_resolution(self, resolution):
+        self.resolution = resolution
+        self.reconfigured.append(resolution)
+
+    def get_frame_packet(self):
+        self.reads += 1
+        w, h = self.resolution
+        return FramePacket(frame=np.zeros((h, w, 3), dtype=np.uint8), seq=self.reads,
+                           timestamp=time.monotonic())
+
+
+@pytest.fixture
+def broker():
+    b = CameraBroker(CountingController(), idle_release_seconds=60, share_window=10.0)
+    yield b
+    b.close()
+
+
+def test_device_opened_once_for_two_subscribers(broker):
+    capture = broker.subscribe("capture")
+    admin = broker.subscribe("admin")
+    assert capture and admin
+    assert broker.controller.starts == 1
+    capture.close()
+    assert broker.session.is_open and broker.session.holders == 1
+
+
+def test_subscribers_share_one_read(broker):
+    capture = broker.subscribe("capture")
+    admin = broker.subscribe("admin")
+    assert capture.poll().seq == admin.poll().seq
+    assert broker.controller.reads == 1
+
+
+def test_each_frame_delivered_once(broker):
+    sub = broker.subscribe("capture")
+    assert sub.poll() is not None
+    assert sub.poll() is None      # same frame, nothing new
+
+
+def test_target_size_fits_aspect(broker):
+    sub = broker.subscribe("admin", target_size=(320, 320))
+    assert sub.poll().frame.shape == (240, 320, 3)
+    full = broker.subscribe("capture")
+    full.last_seq = 0
+    assert full.poll().frame.shape == (480, 640, 3)
+
+
+def test_polled_frames_do_not_alias_the_device_buffer(broker):
+    capture = broker.subscribe("capture")
+    admin = broker.subscribe("admin")
+    shared = broker.latest().frame
+    frames = [capture.poll().frame, admin.poll().frame]
+    for frame in frames:
+        assert not np.shares_memory(frame, shared)
+    assert not np.shares_memory(frames[0], frames[1])
+    shared[:] = 255     # the pool refills the buffer
+    assert not frames[0].any() and not frames[1].any()
+
+
+def test_max_fps_throttles():
+    b = CameraBroker(CountingController(), share_window=0.0)
+    sub = b.subscribe("admin", max_fps=5)
+    assert sub.poll() is not None
+    assert sub.poll() is None      # a new frame exists but is not due yet
+    b.close()
+
+
+def test_reconfigure_only_on_resolution_change(broker):
+    broker.subscribe("capture")
+    assert broker.set_resolution((640, 480)) is False
+    assert broker.set_resolution((1280, 720)) is True
+    assert broker.controller.reconfigured == [(1280, 720)]
+    assert broker.controller.starts == 1
+
+
+def test_replace_moves_subscribers(broker):
+    sub = broker.subscribe("capture")
+    old = broker.controller
+    new = CountingController()
+    assert broker.replace(new)
+    assert not old.is_active and new.is_active
+    assert broker.session.holders == 1
+    assert sub.poll() is not None
+
+
+def test_close_drops_subscriptions(broker):
+    sub = broker.subscribe("capture")
+    broker.close()
+    sub.close()                     # late close is harmless
+    assert broker.session.holders == 0 and not broker.session.is_open
+
+
+def test_webcam_set_resolution_keeps_device_open():
+    capture = FakeCapture()
+    with patch("src.controllers.camera_controller.cv2.VideoCapture", return_value=capture):
+        cam = CameraController(0, (640, 480), threaded=True)
+        b = CameraBroker(cam)
+        assert b.subscribe("capture")
+        assert b.set_resolution((1280, 720))
+        assert cam.resolution == (1280, 720)
+        assert cam.is_active and not capture.released
+        assert cam.grabber.is_running
+        b.close()
+    assert capture.released
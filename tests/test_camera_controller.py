@@ -0,0 +1,455 @@
+"""Tests for CameraController and the background frame grabber."""
+import threading
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.controllers.camera_controller import CameraController
+from src.controllers.camera_probe import CameraMode
+from src.controllers.frame_grabber import FrameGrabber, LatestFrameSlot
+from src.controllers.frame_pool import FrameBufferPool
+from tests.fake_camera import FakeCapture
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+@pytest.fixture
+def fake_capture():
+    capture = FakeCapture(delay=0.002)
+    with patch("src.controllers.camera_controller.cv2.VideoCapture", return_value=capture):
+        yield capture
+
+
+# --- LatestFrameSlot ---
+
+def test_slot_sequence_increases():
+    slot = LatestFrameSlot()
+    assert slot.latest() is None
+    first = slot.publish(np.zeros(1))
+    second = slot.publish(np.ones(1))
+    assert (first.seq, second.seq) == (1, 2)
+    assert slot.latest() is second
+
+
+def test_slot_wait_newer_times_out():
+    slot = LatestFrameSlot()
+    slot.publish(np.zeros(1))
+    assert slot.wait_newer(slot.seq, timeout=0.01) is None
+
+
+def test_slot_wait_newer_wakes_on_publish():
+    slot = LatestFrameSlot()
+    threading.Timer(0.02, lambda: slot.publish(np.ones(1))).start()
+    packet = slot.wait_newer(0, timeout=1.0)
+    assert packet is not None and packet.seq == 1
+
+
+# --- FrameGrabber ---
+
+def test_grabber_survives_read_errors():
+    calls = []
+
+    def flaky_read():
+        calls.append(1)
+        if len(calls) % 2:
+            raise IOError("usb hiccup")
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+    grabber = FrameGrabber(flaky_read)
+    grabber.start()
+    try:
+        assert wait_until(lambda: grabber.slot.seq >= 2)
+    finally:
+        grabber.stop()
+    assert not grabber.is_running
+
+
+def test_grabber_restart_after_stuck_stop_keeps_one_reader():
+    gate = threading.Event()
+    readers = []
+
+    def read():
+        readers.append(threading.get_ident())
+        if len(readers) == 1:
+            gate.wait(2.0)      # a read stuck in the driver
+        time.sleep(0.002)
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+    grabber = FrameGrabber(read, name="stuck-reader")
+    grabber.start()
+    assert wait_until(lambda: readers)
+    assert grabber.stop(timeout=0.05) is False
+    assert grabber.is_running
+    grabber.start()
+    gate.set()
+    try:
+        assert wait_until(lambda: grabber.slot.seq >= 3)
+        assert len(set(readers)) == 1
+        assert len([t for t in threading.enumerate() if t.name == "stuck-reader"]) == 1
+    finally:
+        assert grabber.stop() is True
+
+
+def test_stuck_reader_keeps_device_open(fake_capture):
+    gate = threading.Event()
+    cam = CameraController(0, (64, 48), threaded=True)
+    assert cam.start()
+    assert wait_until(lambda: cam.grabber.slot.seq >= 1)
+    cam.grabber.read_fn = lambda: gate.wait(5.0) and None
+    time.sleep(0.05)
+    stop = cam.grabber.stop
+    cam.grabber.stop = lambda timeout=2.0: stop(0.05)
+    cam.stop()
+    assert not fake_capture.released and not cam.is_active
+    gate.set()
+    cam.grabber.stop = stop
+    cam.stop()
+    assert fake_capture.released
+
+
+# --- CameraController ---
+
+def test_packets_keep_native_bgr(fake_capture):
+    cam = CameraController(0, (64, 48))
+    cam.start()
+    packet = cam.get_frame_packet()
+    cam.stop()
+    assert packet.pixel_format == "BGR"
+    assert packet.frame[0, 0, 0] == 1 and packet.stride == 64 * 3
+
+
+def test_unthreaded_get_frame_converts_to_rgb(fake_capture):
+    cam = CameraController(0, (64, 48))
+    assert cam.start()
+    frame = cam.get_frame()
+    assert frame.shape == (48, 64, 3)
+    assert frame[0, 0, 2] == 1 and frame[0, 0, 0] == 0   # BGR → RGB
+    assert cam.grabber is None
+    cam.stop()
+
+
+def test_threaded_get_frame_does_not_block(fake_capture):
+    fake_capture.delay = 0.2
+    cam = CameraController(0, (64, 48), threaded=True)
+    assert cam.start()
+    try:
+        assert wait_until(lambda: cam.get_frame() is not None)
+        start = time.monotonic()
+        cam.get_frame()
+        assert time.monotonic() - start < 0.05
+    finally:
+        cam.stop()
+
+
+def test_threaded_packets_have_increasing_seq(fake_capture):
+    cam = CameraController(0, (64, 48), threaded=True)
+    cam.start()
+    try:
+        assert wait_until(lambda: cam.get_frame_packet() is not None)
+        first = cam.get_frame_packet()
+        assert wait_until(lambda: cam.get_frame_packet().seq > first.seq)
+        assert cam.get_frame_packet().timestamp >= first.timestamp
+    finally:
+        cam.stop()
+
+
+def test_threaded_stop_joins_thread_before_release(fake_capture):
+    cam = CameraController(0, (64, 48), threaded=True)
+    cam.start()
+    grabber = cam.grabber
+    cam.stop()
+    assert not grabber.is_running
+    assert fake_capture.released
+    assert cam.get_frame() is None
+
+
+def test_threaded_capture_photo(fake_capture):
+    cam = CameraController(0, (64, 48), threaded=True)
+    cam.start()
+    try:
+        photo = cam.capture_photo("frame.png")
+    finally:
+        cam.stop()
+    assert photo is not None
+    assert photo.frame_path == "frame.png"
+    assert photo.image_data.shape == (48, 64, 3)
+
+
+# --- pre-capture ring buffer ---
+
+def test_slot_history_is_bounded():
+    slot = LatestFrameSlot(history_size=3)
+    for i in range(5):
+        slot.publish(np.full(1, i), timestamp=float(i))
+    assert [p.seq for p in slot.history()] == [3, 4, 5]
+
+
+def test_slot_closest_to_timestamp():
+    slot = LatestFrameSlot(history_size=4)
+    for t in (1.0, 1.1, 1.2, 1.3):
+        slot.publish(np.zeros(1), timestamp=t)
+    assert slot.closest(1.14).timestamp == 1.1
+    assert slot.closest(5.0).timestamp == 1.3
+    assert LatestFrameSlot().closest(1.0) is None
+
+
+def test_capture_uses_frame_closest_to_shutter(fake_capture):
+    fake_capture.delay = 0.01
+    cam = CameraController(0, (64, 48), threaded=True, precapture_frames=16)
+    cam.start()
+    try:
+        assert wait_until(lambda: len(cam.grabber.slot.history()) >= 10)
+        target = cam.grabber.slot.history()[2]
+        expected = target.frame.copy()
+        photo = cam.capture_photo(shutter_time=target.timestamp)
+    finally:
+        cam.stop()
+    assert np.array_equal(photo.image_data, expected[:, :, ::-1])   # BGR → RGB
+    assert not np.shares_memory(photo.image_data, target.frame)   # copied out of the pool
+    assert cam.last_shutter_lag_ms == 0.0
+
+
+def test_capture_lag_metric_is_small(fake_capture):
+    fake_capture.delay = 0.01
+    cam = CameraController(0, (64, 48), threaded=True)
+    cam.start()
+    try:
+        assert wait_until(lambda: cam.get_frame() is not None)
+        cam.capture_photo(shutter_time=time.monotonic())
+    finally:
+        cam.stop()
+    assert abs(cam.last_shutter_lag_ms) < 50
+
+
+def test_unthreaded_capture_records_lag(fake_capture):
+    cam = CameraController(0, (64, 48))
+    cam.start()
+    cam.capture_photo(shutter_time=time.monotonic())
+    cam.stop()
+    assert cam.last_shutter_lag_ms >= 0
+
+
+# --- pause / resume ---
+
+def test_pause_keeps_device_open(fake_capture):
+    cam = CameraController(0, (64, 48), threaded=True)
+    cam.start()
+    try:
+        assert wait_until(lambda: cam.get_frame_packet() is not None)
+        cam.pause()
+        assert not cam.grabber.is_running
+        assert cam.is_active and not fake_capture.released
+        seq = cam.grabber.slot.seq
+        cam.resume()
+        assert wait_until(lambda: cam.get_frame_packet() is not None)
+        assert cam.get_frame_packet().seq > seq
+    finally:
+        cam.stop()
+
+
+# --- frame buffer pool ---
+
+def test_pool_reuses_released_buffers_oldest_first():
+    pool = FrameBufferPool(capacity=8, spare=1)
+    a, b = pool.lease((2, 2, 3)), pool.lease((2, 2, 3))
+    pool.release(a)
+    assert pool.lease((2, 2, 3)) is not a        # held back as the spare
+    pool.release(b)
+    assert pool.lease((2, 2, 3)) is a
+    assert pool.allocations == 3
+
+
+def test_pool_drops_buffers_on_shape_change():
+    pool = FrameBufferPool(spare=0)
+    pool.release(pool.lease((2, 2, 3)))
+    assert pool.lease((4, 4, 3)).shape == (4, 4, 3)
+    assert pool.free == 0
+
+
+def test_slot_returns_evicted_frames():
+    evicted = []
+    slot = LatestFrameSlot(history_size=2, on_evict=evicted.append)
+    frames = [np.full(1, i) for i in range(4)]
+    for frame in frames:
+        slot.publish(frame)
+    assert [f[0] for f in evicted] == [0, 1]
+    slot.clear()
+    assert [f[0] for f in evicted] == [0, 1, 2, 3]
+
+
+def test_threaded_reads_stop_allocating(fake_capture):
+    cam = CameraController(0, (64, 48), threaded=True, precapture_frames=4)
+    cam.start()
+    try:
+        assert wait_until(lambda: cam.grabber.slot.seq >= 20)
+        allocations = cam.pool.allocations
+        seq = cam.grabber.slot.seq
+        assert wait_until(lambda: cam.grabber.slot.seq >= seq + 50)
+        assert cam.pool.allocations == allocations
+    finally:
+        cam.stop()
+
+
+def test_preview_session_allocation_is_flat():
+    """A long preview session at 1080p must not allocate a frame per read."""
+    capture = FakeCapture1080()
+    with patch("src.controllers.camera_controller.cv2.VideoCapture", return_value=capture):
+        cam = CameraController(0, (1920, 1080), threaded=True, precapture_frames=4)
+        cam.start()
+        try:
+            assert wait_until(lambda: cam.grabber.slot.seq >= 20, timeout=5)
+            tracemalloc.start()
+            try:
+                seq = cam.grabber.slot.seq
+                baseline, _ = tracemalloc.get_traced_memory()
+                assert wait_until(lambda: cam.grabber.slot.seq >= seq + 60, timeout=10)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        finally:
+            cam.stop()
+    frame_bytes = 1920 * 1080 * 3
+    # Allocating per read would transiently add at least one full frame
+    assert peak - baseline < frame_bytes // 4
+
+
+class FakeCapture1080(FakeCapture):
+    def read(self, image=None):
+        self.count += 1
+        if image is None or image.shape != (1080, 1920, 3):
+            image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        image[0, 0, 0] = self.count % 256
+        return True, image
+
+
+def test_negotiated_fps_from_driver(fake_capture):
+    controller = CameraController(0, (64, 48))
+    assert controller.start()
+    assert controller.negotiated_fps == 30.0
+    fake_capture.fps = -1.0              # backend does not know
+    controller.set_resolution((32, 24))
+    assert controller.negotiated_fps == 0.0
+    controller.stop()
+
+
+def test_start_applies_probed_mode(fake_capture):
+    calls = []
+    fake_capture.set = lambda prop, value: calls.append((prop, value)) or True
+    modes = {(64, 48): CameraMode(64, 48, "MJPG", 30, 29.5)}
+    controller = CameraController(0, (64, 48), modes=modes)
+    assert controller.start()
+    assert calls[0] == (cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    assert (cv2.CAP_PROP_FPS, 30) in calls
+    calls.clear()
+    controller.set_resolution((32, 24))      # not probed: size only
+    assert [prop for prop, _ in calls] == [cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT]
+    controller.stop()
+
+
+class FakeModeCapture(FakeCapture):
+    """Honours frame size changes, after ``switch_delay`` and up to ``max_width``."""
+
+    def __init__(self, *args, switch_delay: float = 0.0, max_width: int = 4096, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.size = (64, 48)
+        self.switch_delay = switch_delay
+        self.max_width = max_width
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH and value <= self.max_width:
+            time.sleep(self.switch_delay)
+            self.size = (int(value), self.size[1])
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT and self.size[0] <= self.max_width:
+            self.size = (self.size[0], int(value))
+        return True
+
+    def read(self, image=None):
+        if self.delay:
+            time.sleep(self.delay)
+        self.count += 1
+        width, height = self.size
+        if image is None or image.shape != (height, width, 3):
+            image = np.zeros((height, width, 3), dtype=np.uint8)
+        return True, image
+
+
+def mode_capture(**kwargs):
+    capture = FakeModeCapture(delay=0.002, **kwargs)
+    return patch("src.controllers.camera_controller.cv2.VideoCapture", return_value=capture)
+
+
+@pytest.mark.parametrize("threaded", [False, True])
+def test_dual_mode_captures_at_still_resolution(threaded):
+    with mode_capture():
+        controller = CameraController(0, (64, 48), threaded=threaded, still_resolution=(128, 96))
+        assert controller.start()
+        assert wait_until(lambda: controller.get_frame_packet() is not None)
+        photo = controller.capture_photo()
+        assert photo.image_data.shape == (96, 128, 3)
+        assert controller.last_switch_ms is not None
+        assert controller.capture_lead_ms == controller.last_switch_ms
+        # Back to the light preview mode
+        assert wait_until(lambda: (packet := controller.get_frame_packet()) is not None
+                          and packet.frame.shape == (48, 64, 3))
+        assert controller.dual_mode
+        controller.stop()
+
+
+def test_prepare_capture_switches_ahead_of_shutter():
+    with mode_capture(switch_delay=0.05):
+        controller = CameraController(0, (64, 48), threaded=True, still_resolution=(128, 96))
+        assert controller.start()
+        controller.prepare_capture()
+        time.sleep(0.15)                 # the countdown hides the switch
+        start = time.perf_counter()
+        photo = controller.capture_photo()
+        assert (time.perf_counter() - start) < 0.05 + controller.last_switch_ms / 1000.0
+        assert controller.last_switch_ms >= 50
+        assert photo.image_data.shape == (96, 128, 3)
+        controller.stop()
+
+
+def test_slow_switch_falls_back_to_single_mode():
+    with mode_capture(switch_delay=0.05):
+        controller = CameraController(0, (64, 48), threaded=True, still_resolution=(128, 96),
+                                      max_switch_ms=10)
+        assert controller.start()
+        assert controller.capture_photo().image_data.shape == (96, 128, 3)
+        assert not controller.dual_mode and controller.capture_lead_ms == 0.0
+        # Next photos come from the preview stream
+        assert controller.capture_photo().image_data.shape == (48, 64, 3)
+        controller.stop()
+
+
+def test_unsupported_still_mode_uses_preview_frame():
+    with mode_capture(max_width=100):
+        controller = CameraController(0, (64, 48), still_resolution=(128, 96), max_switch_ms=20)
+        assert controller.start()
+        photo = controller.capture_photo()
+        assert photo.image_data.shape == (48, 64, 3)
+        assert not controller.dual_mode
+        controller.stop()
+
+
+def test_unthreaded_preview_read_does_not_wait_for_a_mode_switch():
+    with mode_capture(switch_delay=0.3):
+        controller = CameraController(0, (64, 48), still_resolution=(128, 96))
+        assert controller.start()
+        controller.prepare_capture()
+        time.sleep(0.02)
+        start = time.perf_counter()
+        assert controller.get_frame_packet() is None
+        assert time.perf_counter() - start < 0.05
+        assert controller.capture_photo().image_data.shape == (96, 128, 3)
+        controller.stop()
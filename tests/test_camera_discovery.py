@@ -0,0 +1,93 @@
+"""Tests for webcam discovery through sysfs and its cache."""
+import threading
+from unittest.mock import patch
+
+from src.controllers.camera_discovery import (
+    CameraDiscovery, list_v4l2_devices, probe_opencv_cameras
+)
+
+
+def add_node(tmp_path, n, name, index=0):
+    node = tmp_path / "sys" / f"video{n}"
+    node.mkdir(parents=True)
+    (node / "name").write_text(name + "\n")
+    (node / "index").write_text(f"{index}\n")
+    (tmp_path / "dev" / f"video{n}").write_text("")
+
+
+def make_tree(tmp_path):
+    (tmp_path / "dev").mkdir()
+    (tmp_path / "sys").mkdir()
+    add_node(tmp_path, 0, "HD Pro Webcam C920")
+    add_node(tmp_path, 1, "HD Pro Webcam C920", index=1)   # metadata node
+    add_node(tmp_path, 2, "USB Capture")
+    return str(tmp_path / "sys"), str(tmp_path / "dev")
+
+
+def test_lists_streaming_nodes_with_names(tmp_path):
+    sysfs, dev = make_tree(tmp_path)
+    assert list_v4l2_devices(sysfs, dev) == [(0, "HD Pro Webcam C920"), (2, "USB Capture")]
+
+
+def test_no_sysfs_returns_none(tmp_path):
+    assert list_v4l2_devices(str(tmp_path / "missing"), str(tmp_path)) is None
+
+
+def test_cache_invalidated_on_hotplug(tmp_path):
+    sysfs, dev = make_tree(tmp_path)
+    discovery = CameraDiscovery(dev_root=dev, sysfs_root=sysfs)
+    assert len(discovery.cameras()) == 2
+    (tmp_path / "sys" / "video2" / "name").write_text("Renamed\n")
+    assert discovery.cameras()[1][1] == "USB Capture"        # cached
+    add_node(tmp_path, 4, "Plugged in")
+    assert [name for _, name in discovery.cameras()] == ["HD Pro Webcam C920", "Renamed", "Plugged in"]
+
+
+def test_fallback_probe_is_cached(tmp_path):
+    calls = []
+
+    def probe(in_use):
+        calls.append(tuple(in_use))
+        return [(0, "Camera 0")]
+
+    discovery = CameraDiscovery(sysfs_root=str(tmp_path / "missing"), probe=probe)
+    assert discovery.cached() is None
+    assert discovery.cameras() == [(0, "Camera 0")]
+    assert discovery.cameras() == [(0, "Camera 0")]
+    assert len(calls) == 1
+    discovery.invalidate()
+    discovery.cameras(in_use=[0])
+    assert calls == [(), (0,)]
+
+
+def test_probe_does_not_open_devices_in_use():
+    opened = []
+
+    class Capture:
+        def __init__(self, index, backend):
+            opened.append(index)
+
+        def isOpened(self):
+            return True
+
+        def release(self):
+            pass
+
+    with patch("src.controllers.camera_discovery.cv2.VideoCapture", Capture):
+        cameras = probe_opencv_cameras(in_use=[1], max_index=3)
+    assert opened == [0, 2]
+    assert [index for index, _ in cameras] == [0, 1, 2]
+
+
+def test_discover_async_runs_off_caller_thread(tmp_path):
+    sysfs, dev = make_tree(tmp_path)
+    discovery = CameraDiscovery(dev_root=dev, sysfs_root=sysfs)
+    result = {}
+
+    def callback(cameras):
+        result["cameras"] = cameras
+        result["thread"] = threading.current_thread()
+
+    discovery.discover_async(callback).join(2.0)
+    assert len(result["cameras"]) == 2
+    assert result["thread"] is not threading.current_thread()
@@ -0,0 +1,101 @@
+"""Tests for webcam capture-mode probing."""
+import time
+
+import cv2
+import numpy as np
+
+from src.controllers.camera_probe import (
+    CameraMode, apply_mode, best_modes, fourcc_name, probe_camera, saved_modes,
+)
+from src.models import CameraConfig
+
+
+def fourcc_code(name):
+    return cv2.VideoWriter_fourcc(*name)
+
+
+class FakeUvcCapture:
+    """A UVC camera: MJPG is fast, YUYV only manages 1080p at a crawl."""
+
+    # (width, height, fourcc) -> frame period in seconds
+    MODES = {
+        (1920, 1080, "MJPG"): 1 / 200,
+        (1920, 1080, "YUYV"): 1 / 40,
+        (1280, 720, "MJPG"): 1 / 200,
+        (1280, 720, "YUYV"): 1 / 100,
+    }
+
+    def __init__(self):
+        self.props = {cv2.CAP_PROP_FOURCC: fourcc_code("YUYV"),
+                      cv2.CAP_PROP_FRAME_WIDTH: 640, cv2.CAP_PROP_FRAME_HEIGHT: 480,
+                      cv2.CAP_PROP_FPS: 30}
+        self.calls = []
+        self.released = False
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        self.calls.append(prop)
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return 30                       # this driver ignores rate requests
+        if prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT) and self._mode() is None:
+            # Unsupported size: the driver falls back to VGA
+            return 640 if prop == cv2.CAP_PROP_FRAME_WIDTH else 480
+        return self.props[prop]
+
+    def _mode(self):
+        key = (int(self.props[cv2.CAP_PROP_FRAME_WIDTH]), int(self.props[cv2.CAP_PROP_FRAME_HEIGHT]),
+               fourcc_name(self.props[cv2.CAP_PROP_FOURCC]))
+        return self.MODES.get(key)
+
+    def read(self, image=None):
+        time.sleep(self._mode() or 1 / 200)
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+def test_fourcc_name_roundtrip():
+    assert fourcc_name(fourcc_code("MJPG")) == "MJPG"
+    assert fourcc_name(fourcc_code("YUY2")) == "YUYV"
+    assert fourcc_name(0) == ""
+
+
+def test_apply_mode_sets_format_first():
+    capture = FakeUvcCapture()
+    apply_mode(capture, CameraMode(1280, 720, "MJPG", 30))
+    assert capture.calls == [cv2.CAP_PROP_FOURCC, cv2.CAP_PROP_FRAME_WIDTH,
+                             cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_FPS]
+
+
+def test_probe_measures_and_ranks_modes():
+    capture = FakeUvcCapture()
+    seen = []
+    modes = probe_camera(0, resolutions=((1920, 1080), (1280, 720), (800, 600)),
+                         on_progress=seen.append, open_fn=lambda index: capture)
+
+    assert capture.released
+    assert len(seen) == 12
+    # Rate requests are ignored by the driver: one measurement per format
+    assert {(m.width, m.height, m.fourcc) for m in modes} == set(FakeUvcCapture.MODES)
+    fastest = best_modes(modes)
+    assert fastest[(1920, 1080)].fourcc == "MJPG"
+    assert fastest[(1920, 1080)].measured_fps > 2 * modes[-1].measured_fps
+    assert (800, 600) not in fastest
+
+
+def test_saved_modes_from_config():
+    config = CameraConfig()
+    assert saved_modes(config, 0) == {}
+    config.probed_modes["0"] = [
+        CameraMode(1920, 1080, "YUYV", 30, 5.0).to_dict(),
+        CameraMode(1920, 1080, "MJPG", 30, 30.0).to_dict(),
+    ]
+    assert saved_modes(config, 0)[(1920, 1080)].fourcc == "MJPG"
+    assert saved_modes(config, 1) == {}
@@ -0,0 +1,90 @@
+"""Tests for CameraSession: device kept open across screens, idle release."""
+import time
+
+from src.controllers.camera_session import CameraSession
+
+
+class FakeController:
+    """Records the lifecycle calls CameraSession makes."""
+
+    def __init__(self, start_ok=True):
+        self.start_ok = start_ok
+        self.is_active = False
+        self.calls = []
+
+    def start(self):
+        self.calls.append("start")
+        self.is_active = self.start_ok
+        return self.start_ok
+
+    def stop(self):
+        self.calls.append("stop")
+        self.is_active = False
+
+    def pause(self):
+        self.calls.append("pause")
+
+    def resume(self):
+        self.calls.append("resume")
+
+
+def test_reacquire_reuses_open_device():
+    cam = FakeController()
+    session = CameraSession(cam, idle_release_seconds=60)
+    assert session.acquire()
+    session.release()
+    assert session.acquire()
+    assert cam.calls == ["start", "pause", "resume"]
+    assert session.is_open
+    session.close()
+
+
+def test_idle_timeout_releases_device():
+    cam = FakeController()
+    session = CameraSession(cam, idle_release_seconds=0.05)
+    session.acquire()
+    session.release()
+    deadline = time.monotonic() + 2
+    while cam.is_active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not session.is_open
+    assert cam.calls == ["start", "pause", "stop"]
+
+
+def test_acquire_cancels_idle_timer():
+    cam = FakeController()
+    session = CameraSession(cam, idle_release_seconds=0.05)
+    session.acquire()
+    session.release()
+    session.acquire()
+    time.sleep(0.15)
+    assert session.is_open
+    session.close()
+
+
+def test_device_stays_open_while_held_twice():
+    cam = FakeController()
+    session = CameraSession(cam, idle_release_seconds=0)
+    session.acquire()
+    session.acquire()
+    session.release()
+    assert session.holders == 1 and session.is_open
+    session.release()
+    assert not session.is_open            # zero timeout: released at once
+    assert "pause" not in cam.calls
+
+
+def test_close_releases_regardless_of_holders():
+    cam = FakeController()
+    session = CameraSession(cam)
+    session.acquire()
+    session.close()
+    assert session.holders == 0 and not session.is_open
+    session.release()                     # late release from a hiding screen is harmless
+    assert cam.calls == ["start", "stop"]
+
+
+def test_failed_start_is_not_held():
+    session = CameraSession(FakeController(start_ok=False))
+    assert session.acquire() is False
+    assert session.holders == 0
@@ -0,0 +1,73 @@
+"""Tests for CapturePipeline: futures, file names, frame application."""
+import os
+import pytest
+
+from src.controllers.capture_pipeline import CapturePipeline, wait_for_path
+
+
+@pytest.fixture
+def pipeline(photo_controller):
+    pipe = CapturePipeline(photo_controller)
+    yield pipe
+    pipe.shutdown()
+
+
+def test_framed_photo_saves_original_and_final(pipeline, sample_photo, frame_png):
+    sample_photo.frame_path = frame_png
+    job = pipeline.submit(sample_photo)
+
+    saved = job.saved_path.result(timeout=10)
+    original = job.original_path.result(timeout=10)
+    assert os.path.basename(saved) == "photo_20240101_120000.jpg"
+    assert os.path.basename(original) == "photo_20240101_120000_original.jpg"
+    assert os.path.exists(saved) and os.path.exists(original)
+
+
+def test_only_the_final_photo_gets_a_thumbnail(pipeline, sample_photo, frame_png,
+                                              photo_controller):
+    sample_photo.frame_path = frame_png
+    job = pipeline.submit(sample_photo)
+    saved = job.saved_path.result(timeout=10)
+    original = job.original_path.result(timeout=10)
+    assert photo_controller.thumbnails.get(saved) is not None
+    assert photo_controller.thumbnails.get(original) is None
+
+
+def test_unframed_photo_is_left_untouched(pipeline, sample_photo, frame_png):
+    sample_photo.frame_path = frame_png
+    original_data = sample_photo.image_data
+    job = pipeline.submit(sample_photo)
+
+    framed = job.framed.result(timeout=10)
+    assert framed is not sample_photo
+    assert framed.frame_applied is True
+    assert sample_photo.frame_applied is False
+    assert sample_photo.image_data is original_data
+
+
+def test_no_frame_skips_original(pipeline, sample_photo):
+    job = pipeline.submit(sample_photo)
+    assert job.original_path.result(timeout=10) is None
+    assert job.framed.result(timeout=10) is sample_photo
+    assert os.path.exists(job.saved_path.result(timeout=10))
+
+
+def test_save_to_disk_disabled(pipeline, sample_photo, frame_png, photo_controller):
+    sample_photo.frame_path = frame_png
+    job = pipeline.submit(sample_photo, save_to_disk=False)
+    assert job.framed.result(timeout=10).frame_applied is True
+    assert job.saved_path.result(timeout=10) is None
+    assert os.listdir(photo_controller.photos_directory) == []
+
+
+def test_save_error_propagates(pipeline, sample_photo, photo_controller, monkeypatch):
+    def boom(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(photo_controller, "save_photo", boom)
+    job = pipeline.submit(sample_photo)
+    assert isinstance(job.saved_path.exception(timeout=10), OSError)
+    assert wait_for_path(job.saved_path) is None
+
+
+def test_wait_for_path_none():
+    assert wait_for_path(None) is None
@@ -0,0 +1,131 @@
+"""Tests for the NumPy compositor: accuracy against PIL, buffers, sparse-alpha spans."""
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.controllers.compositor import (
+    SPAN_OPAQUE, SPAN_TRANSPARENT, Compositor, FrameAsset, analyse_alpha
+)
+
+
+@pytest.fixture
+def random_pair():
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (97, 131, 3), dtype=np.uint8)
+    rgba = rng.integers(0, 256, (97, 131, 4), dtype=np.uint8)
+    return background, rgba
+
+
+def test_matches_pil_alpha_composite(random_pair):
+    background, rgba = random_pair
+    expected = np.asarray(
+        Image.alpha_composite(
+            Image.fromarray(background).convert("RGBA"), Image.fromarray(rgba)
+        ).convert("RGB")
+    ).astype(int)
+    result = Compositor(band_rows=16).composite(background, FrameAsset.from_rgba(rgba))
+    assert np.abs(result.astype(int) - expected).max() <= 1
+
+
+def test_opaque_and_transparent_pixels_are_exact():
+    background = np.full((4, 4, 3), 77, dtype=np.uint8)
+    rgba = np.zeros((4, 4, 4), dtype=np.uint8)
+    rgba[:2] = [255, 10, 200, 255]
+    result = Compositor().composite(background, FrameAsset.from_rgba(rgba))
+    assert (result[:2] == [255, 10, 200]).all()
+    assert (result[2:] == 77).all()
+
+
+def test_never_overflows():
+    background = np.full((1, 256, 3), 255, dtype=np.uint8)
+    rgba = np.full((1, 256, 4), 255, dtype=np.uint8)
+    rgba[0, :, 3] = np.arange(256)
+    result = Compositor().composite(background, FrameAsset.from_rgba(rgba))
+    assert (result >= 254).all()
+
+
+def test_writes_into_preallocated_output(random_pair):
+    background, rgba = random_pair
+    out = np.empty_like(background)
+    result = Compositor().composite(background, FrameAsset.from_rgba(rgba), out=out)
+    assert result is out
+
+
+def test_background_is_not_modified(random_pair):
+    background, rgba = random_pair
+    original = background.copy()
+    Compositor().composite(background, FrameAsset.from_rgba(rgba))
+    assert (background == original).all()
+
+
+def test_in_place_matches_out_of_place(random_pair):
+    background, rgba = random_pair
+    asset = FrameAsset.from_rgba(rgba)
+    compositor = Compositor(band_rows=8)
+    expected = compositor.composite(background, asset)
+    compositor.composite(background, asset, out=background)
+    assert (background == expected).all()
+
+
+def test_size_mismatch_raises(random_pair):
+    background, rgba = random_pair
+    with pytest.raises(ValueError):
+        Compositor().composite(background[:-1], FrameAsset.from_rgba(rgba))
+
+
+def test_asset_nbytes():
+    asset = FrameAsset.from_rgba(np.zeros((10, 20, 4), dtype=np.uint8))
+    assert asset.size == (20, 10)
+    assert asset.nbytes == 10 * 20 * 4
+
+
+# --- sparse-alpha spans ---
+
+def _border_rgba(width=200, height=150, border=20):
+    rgba = np.zeros((height, width, 4), dtype=np.uint8)
+    rgba[:, :] = [255, 0, 0, 255]
+    rgba[border:-border, border:-border] = [0, 0, 0, 0]
+    rgba[border:border + 3, border:-border, 3] = 128   # soft inner edge
+    return rgba
+
+
+def test_spans_cover_every_pixel_once():
+    rgba = _border_rgba()
+    coverage = np.zeros(rgba.shape[:2], dtype=int)
+    for y0, y1, x0, x1, _ in analyse_alpha(rgba[:, :, 3], tile=16):
+        coverage[y0:y1, x0:x1] += 1
+    assert (coverage == 1).all()
+
+
+def test_span_kinds_match_alpha():
+    alpha = _border_rgba()[:, :, 3]
+    for y0, y1, x0, x1, kind in analyse_alpha(alpha, tile=16):
+        region = alpha[y0:y1, x0:x1]
+        if kind == SPAN_TRANSPARENT:
+            assert (region == 0).all()
+        elif kind == SPAN_OPAQUE:
+            assert (region == 255).all()
+
+
+def test_border_frame_blends_only_a_fraction():
+    asset = FrameAsset.from_rgba(_border_rgba(640, 480, 40), tile=16)
+    assert asset.blended_fraction < 0.3
+    assert len(asset.spans) < 40
+
+
+def test_sparse_result_matches_full_blend():
+    rng = np.random.default_rng(1)
+    rgba = _border_rgba()
+    background = rng.integers(0, 256, rgba.shape[:2] + (3,), dtype=np.uint8)
+    sparse = FrameAsset.from_rgba(rgba, tile=16)
+    dense = FrameAsset(sparse.premultiplied, sparse.inverse_alpha)
+    compositor = Compositor(band_rows=7)
+    assert (compositor.composite(background, sparse) == compositor.composite(background, dense)).all()
+
+
+def test_sparse_in_place_leaves_transparent_region_untouched():
+    rgba = _border_rgba()
+    background = np.full(rgba.shape[:2] + (3,), 42, dtype=np.uint8)
+    Compositor().composite(background, FrameAsset.from_rgba(rgba, tile=16), out=background)
+    assert (background[75, 100] == 42).all()
+    assert (background[0, 0] == [255, 0, 0]).all()
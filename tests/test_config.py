@@ -57,3 +57,13 @@ def test_config_creates_parent_directory(tmp_path):
 def test_last_selected_frame_default(tmp_path):
     cfg = AppConfig.load(str(tmp_path / "x.json"))
     assert cfg.last_selected_frame == ""
+
+
+def test_probed_modes_roundtrip(tmp_path):
+    path = str(tmp_path / "config.json")
+    cfg = AppConfig.load(path)
+    cfg.camera.probed_modes["1"] = [
+        {"width": 1280, "height": 720, "fourcc": "MJPG", "fps": 30, "measured_fps": 29.8}
+    ]
+    cfg.save(path)
+    assert AppConfig.load(path).camera.probed_modes == cfg.camera.probed_modes
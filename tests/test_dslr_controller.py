@@ -0,0 +1,183 @@
+"""Tests for DSLRController and the gphoto2 shell session, using a fake gphoto2."""
+import io
+import os
+import stat
+import sys
+import time
+
+import pytest
+from PIL import Image
+
+from src.controllers.dslr_controller import DSLRController, decode_jpeg
+from src.controllers.gphoto2_session import GPhoto2Session
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake gphoto2 is a POSIX script")
+
+FAKE_GPHOTO2 = os.path.join(os.path.dirname(__file__), "fake_gphoto2.py")
+
+
+@pytest.fixture
+def fake_gphoto2(tmp_path):
+    """Executable wrapper running tests/fake_gphoto2.py with this interpreter."""
+    script = tmp_path / "gphoto2"
+    script.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_GPHOTO2}" "$@"\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+@pytest.fixture
+def session(fake_gphoto2):
+    sess = GPhoto2Session(fake_gphoto2, timeout=10)
+    assert sess.start()
+    yield sess
+    sess.stop()
+
+
+# --- GPhoto2Session ---
+
+def test_session_preview_returns_jpeg(session):
+    data = session.capture_preview()
+    assert data[:2] == b"\xff\xd8"
+    assert os.listdir(session.workdir) == []   # temp file cleaned up
+
+
+def test_session_capture_returns_jpeg(session):
+    assert session.capture_image()[:2] == b"\xff\xd8"
+
+
+def test_session_reports_latency(session):
+    result = session.run("capture-preview")
+    assert result.latency_ms > 0
+    assert session.command_latency_ms["capture-preview"] == result.latency_ms
+    assert result.saved_files
+
+
+def test_session_serializes_concurrent_commands(session):
+    futures = [session.submit("capture-preview") for _ in range(5)]
+    results = [f.result(timeout=10) for f in futures]
+    assert all("Saving file as" in r.output for r in results)
+
+
+def test_session_stop_removes_workdir(fake_gphoto2):
+    sess = GPhoto2Session(fake_gphoto2)
+    assert sess.start()
+    workdir = sess.workdir
+    sess.stop()
+    assert not sess.is_running
+    assert not os.path.exists(workdir)
+
+
+def test_session_missing_executable():
+    sess = GPhoto2Session("/nonexistent/gphoto2")
+    assert sess.start() is False
+    assert sess.submit("capture-preview").exception() is not None
+
+
+# --- DSLRController ---
+
+def test_controller_uses_session(fake_gphoto2):
+    cam = DSLRController(fake_gphoto2)
+    assert cam.start()
+    try:
+        assert cam.session is not None
+        frame = cam.get_frame()
+        assert frame.shape == (48, 64, 3)
+        photo = cam.capture_photo("frame.png")
+        assert photo.image_data.shape == (240, 320, 3)
+        assert photo.frame_path == "frame.png"
+    finally:
+        cam.stop()
+    assert cam.session is None
+
+
+def test_controller_restarts_dead_session(fake_gphoto2):
+    cam = DSLRController(fake_gphoto2)
+    cam.start()
+    try:
+        cam.session._process.kill()
+        cam.session._process.wait()
+        assert cam.get_frame() is not None
+    finally:
+        cam.stop()
+
+
+def test_controller_without_session(fake_gphoto2):
+    cam = DSLRController(fake_gphoto2, use_session=False)
+    assert cam.start()
+    assert cam.session is None
+    assert cam.get_frame().shape == (48, 64, 3)
+    photo = cam.capture_photo()
+    assert photo.image_data.shape == (240, 320, 3)
+    assert photo.encoded_data[:2] == b"\xff\xd8"
+    cam.stop()
+
+
+def test_capture_keeps_camera_jpeg(fake_gphoto2):
+    cam = DSLRController(fake_gphoto2)
+    cam.start()
+    try:
+        photo = cam.capture_photo()
+    finally:
+        cam.stop()
+    assert photo.encoded_data[:2] == b"\xff\xd8"
+    assert decode_jpeg(photo.encoded_data).shape == photo.image_data.shape
+
+
+def test_decode_jpeg_reduces_to_cover_size():
+    buf = io.BytesIO()
+    Image.new("RGB", (1600, 1200), (10, 20, 30)).save(buf, format="JPEG")
+    data = buf.getvalue()
+    assert decode_jpeg(data).shape == (1200, 1600, 3)
+    assert decode_jpeg(data, (400, 300)).shape == (300, 400, 3)      # 1/4 scale
+    assert decode_jpeg(data, (500, 300)).shape == (600, 800, 3)      # must still cover
+    assert decode_jpeg(data, (2000, 1500)).shape == (1200, 1600, 3)  # never upscales
+
+
+def test_parse_camera_list():
+    out = "Model                          Port\n----------\nOlympus E-500   usb:001,004\n"
+    assert DSLRController._parse_camera_list(out) == ["Olympus E-500   usb:001,004"]
+
+
+# --- streaming live view ---
+
+def test_live_view_streams_frames(fake_gphoto2):
+    cam = DSLRController(fake_gphoto2, live_view=True)
+    assert cam.start()
+    try:
+        assert cam.live_view is not None and cam.session is None
+        deadline = time.monotonic() + 5
+        while cam.get_frame_packet() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        first = cam.get_frame_packet()
+        assert first.frame.shape == (48, 64, 3)
+        while cam.get_frame_packet().seq == first.seq and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cam.get_frame_packet().seq > first.seq
+    finally:
+        cam.stop()
+    assert cam.live_view is None
+
+
+def test_live_view_pauses_for_capture(fake_gphoto2):
+    cam = DSLRController(fake_gphoto2, live_view=True)
+    cam.start()
+    try:
+        photo = cam.capture_photo()
+        assert photo.image_data.shape == (240, 320, 3)
+        assert cam.live_view is not None and cam.live_view.is_running
+        assert cam.session is None
+    finally:
+        cam.stop()
+
+
+def test_live_view_falls_back_when_stream_ends(fake_gphoto2, monkeypatch):
+    monkeypatch.setenv("FAKE_MOVIE_FRAMES", "1")
+    cam = DSLRController(fake_gphoto2, live_view=True)
+    cam.start()
+    try:
+        cam.live_view._process.wait(timeout=5)
+        frame = cam.get_frame()
+        assert cam.live_view is None and cam.session is not None
+        assert frame is not None
+    finally:
+        cam.stop()
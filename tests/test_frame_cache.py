@@ -0,0 +1,81 @@
+"""Tests for FrameAssetCache: keying, mtime invalidation, LRU eviction."""
+import os
+from PIL import Image
+
+from src.controllers.compositor import FrameAsset
+from src.controllers.frame_cache import FrameAssetCache
+
+
+def test_natural_size_asset(frame_png):
+    cache = FrameAssetCache()
+    frame = cache.get(frame_png)
+    assert isinstance(frame, FrameAsset)
+    assert frame.size == (640, 480)
+
+
+def test_prescaled_size(frame_png):
+    cache = FrameAssetCache()
+    assert cache.get(frame_png, (320, 240)).size == (320, 240)
+
+
+def test_hit_returns_same_object(frame_png):
+    cache = FrameAssetCache()
+    first = cache.get(frame_png, (320, 240))
+    second = cache.get(frame_png, (320, 240))
+    assert first is second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_sizes_are_cached_separately(frame_png):
+    cache = FrameAssetCache()
+    cache.get(frame_png, (320, 240))
+    cache.get(frame_png, (160, 120))
+    assert len(cache) == 2
+    assert cache.nbytes == (320 * 240 + 160 * 120) * 4
+
+
+def test_mtime_change_reloads(frame_png):
+    cache = FrameAssetCache()
+    first = cache.get(frame_png)
+    Image.new("RGBA", (100, 50), (0, 255, 0, 255)).save(frame_png)
+    stat = os.stat(frame_png)
+    os.utime(frame_png, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = cache.get(frame_png)
+    assert second is not first
+    assert second.size == (100, 50)
+
+
+def test_lru_eviction_respects_memory_cap(frame_png):
+    entry = 100 * 100 * 4
+    cache = FrameAssetCache(max_bytes=2 * entry)
+    a = cache.get(frame_png, (100, 100))
+    cache.get(frame_png, (101, 99))
+    cache.get(frame_png, (100, 100))          # touch → most recent
+    cache.get(frame_png, (99, 101))           # evicts (101, 99)
+    assert cache.nbytes <= 2 * entry
+    assert cache.get(frame_png, (100, 100)) is a
+    assert cache.misses == 3
+
+
+def test_oversized_entry_is_kept(frame_png):
+    cache = FrameAssetCache(max_bytes=1)
+    frame = cache.get(frame_png)
+    assert len(cache) == 1
+    assert cache.get(frame_png) is frame
+
+
+def test_invalidate_drops_all_sizes(frame_png):
+    cache = FrameAssetCache()
+    cache.get(frame_png)
+    cache.get(frame_png, (320, 240))
+    cache.invalidate(frame_png)
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_preview_uses_cache(photo_controller, sample_image, frame_png):
+    photo_controller.apply_frame_to_array_preview(sample_image, frame_png)
+    photo_controller.apply_frame_to_array_preview(sample_image, frame_png)
+    assert photo_controller.frame_cache.misses == 1
+    assert photo_controller.frame_cache.hits == 1
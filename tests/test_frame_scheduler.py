@@ -0,0 +1,65 @@
+"""Tests for FrameScheduler: adaptive live-preview pacing."""
+import pytest
+
+from src.controllers.frame_scheduler import FrameScheduler, source_fps
+
+
+class FakeController:
+    def __init__(self, measured=0.0, negotiated=0.0):
+        self.measured_fps = measured
+        self.negotiated_fps = negotiated
+
+
+def test_interval_follows_source_fps():
+    scheduler = FrameScheduler()
+    assert scheduler.interval_ms == 33
+    scheduler.set_source_fps(15)
+    assert scheduler.interval_ms == 67
+    scheduler.set_source_fps(0)          # unknown: keep the last rate
+    assert scheduler.interval_ms == 67
+    scheduler.set_source_fps(500)
+    assert scheduler.source_fps == 60
+
+
+def test_source_fps_prefers_measured_rate():
+    assert source_fps(FakeController(measured=24.5, negotiated=30)) == 24.5
+    assert source_fps(FakeController(negotiated=30)) == 30
+    assert source_fps(object()) == 0.0
+
+
+def test_degrades_when_over_budget():
+    scheduler = FrameScheduler(fps=30, patience=3)
+    changed = [scheduler.record_cost(40.0) for _ in range(3)]
+    assert changed == [False, False, True]
+    assert scheduler.level == 1 and scheduler.resolution_scale == 0.75
+
+    for _ in range(20):
+        scheduler.record_cost(40.0)
+    assert scheduler.level == 3
+    assert scheduler.resolution_scale == 0.5
+    assert scheduler.interval_ms == 67          # half the source rate
+    assert scheduler.render_interval == pytest.approx(0.9 * 0.067)
+
+
+def test_recovers_only_after_sustained_headroom():
+    scheduler = FrameScheduler(fps=30, patience=2)
+    for _ in range(2):
+        scheduler.record_cost(40.0)
+    assert scheduler.level == 1
+    # Between half budget and budget: hold
+    for _ in range(20):
+        scheduler.record_cost(18.0)
+    assert scheduler.level == 1
+    for _ in range(8):
+        scheduler.record_cost(2.0)
+    assert scheduler.level == 0
+    assert scheduler.render_interval == 0.0
+
+
+def test_achieved_fps_from_shown_frames():
+    scheduler = FrameScheduler()
+    for i in range(50):
+        scheduler.frame_shown(now=i * 0.05)
+    assert scheduler.achieved_fps == pytest.approx(20.0)
+    scheduler.reset()
+    assert scheduler.achieved_fps == 0.0 and scheduler.level == 0
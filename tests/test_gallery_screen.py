@@ -0,0 +1,162 @@
+"""Tests for the gallery list model and its visible-range bookkeeping (offscreen Qt)."""
+import threading
+
+import pytest
+from PyQt6.QtCore import QtMsgType, qInstallMessageHandler
+from PyQt6.QtTest import QAbstractItemModelTester
+
+from src.views.gallery_screen import GalleryModel, GalleryScreen
+
+
+@pytest.fixture
+def model(qapp):
+    """GalleryModel under QAbstractItemModelTester; fails on any reported violation."""
+    violations = []
+
+    def handler(msg_type, _context, message):
+        if msg_type != QtMsgType.QtDebugMsg:
+            violations.append(message)
+
+    previous = qInstallMessageHandler(handler)
+    gallery = GalleryModel()
+    gallery.loader.decode = lambda path, size: None
+    tester = QAbstractItemModelTester(
+        gallery, QAbstractItemModelTester.FailureReportingMode.Warning
+    )
+    yield gallery
+    gallery.loader.shutdown(wait=True)
+    qInstallMessageHandler(previous)
+    del tester
+    assert violations == []
+
+
+def rows_of(gallery):
+    return {path: gallery.index(row).data(256) for row, path in enumerate(gallery.paths())}
+
+
+def assert_consistent(gallery, expected):
+    assert gallery.paths() == expected
+    assert gallery.rowCount() == len(expected)
+    assert gallery._rows == {path: row for row, path in enumerate(expected)}
+
+
+def record_changes(gallery):
+    changes = []
+    gallery.rowsInserted.connect(lambda _p, first, last: changes.append(("insert", first, last)))
+    gallery.rowsRemoved.connect(lambda _p, first, last: changes.append(("remove", first, last)))
+    gallery.modelReset.connect(lambda: changes.append(("reset",)))
+    return changes
+
+
+def test_update_removes_contiguous_ranges_bottom_up(model):
+    model.set_paths(list("abcdefg"))
+    changes = record_changes(model)
+    model.update_paths(list("adg"))
+    assert changes == [("remove", 4, 5), ("remove", 1, 2)]
+    assert_consistent(model, list("adg"))
+
+
+def test_update_inserts_new_photos_in_place(model):
+    model.set_paths(list("bdf"))
+    changes = record_changes(model)
+    model.update_paths(list("abcdefg"))
+    assert changes == [("insert", 0, 0), ("insert", 2, 2), ("insert", 4, 4), ("insert", 6, 6)]
+    assert_consistent(model, list("abcdefg"))
+
+
+def test_update_mixes_removals_and_insertions(model):
+    model.set_paths(list("gfedcba"))
+    changes = record_changes(model)
+    model.update_paths(list("hgfdcbz"))
+    assert ("reset",) not in changes
+    assert_consistent(model, list("hgfdcbz"))
+
+
+def test_update_falls_back_to_reset_when_order_changes(model):
+    model.set_paths(list("abcd"))
+    changes = record_changes(model)
+    model.update_paths(list("abdc"))
+    assert changes[-1] == ("reset",)
+    assert_consistent(model, list("abdc"))
+
+
+def test_unchanged_paths_emit_nothing(model):
+    model.set_paths(list("abc"))
+    changes = record_changes(model)
+    model.update_paths(list("abc"))
+    assert changes == []
+    assert_consistent(model, list("abc"))
+
+
+def test_insert_path_keeps_rows_consistent(model):
+    model.set_paths(list("bc"))
+    assert model.insert_path("a", 0)
+    assert not model.insert_path("b", 0)
+    assert model.insert_path("z", 99)
+    assert_consistent(model, list("abcz"))
+    assert rows_of(model) == {path: path for path in "abcz"}
+
+
+def test_screen_applies_captures_and_directory_changes(qapp, tmp_path):
+    for name in ("photo_1.jpg", "photo_2.jpg"):
+        (tmp_path / name).write_bytes(b"")
+    screen = GalleryScreen()
+    screen.model.loader.decode = lambda path, size: None
+    try:
+        screen.load_photos(str(tmp_path))
+        assert screen.model.paths() == [str(tmp_path / "photo_2.jpg"), str(tmp_path / "photo_1.jpg")]
+
+        (tmp_path / "photo_3.jpg").write_bytes(b"")
+        screen.add_photo(str(tmp_path / "photo_3.jpg"))
+        screen.add_photo("/elsewhere/photo_9.jpg")
+        assert screen.model.paths()[0] == str(tmp_path / "photo_3.jpg")
+        assert screen.model.rowCount() == 3
+
+        changes = record_changes(screen.model)
+        (tmp_path / "photo_1.jpg").unlink()
+        screen._on_directory_changed(str(tmp_path))    # as the watcher would
+        screen.load_photos(str(tmp_path))
+        assert changes == [("remove", 2, 2)]
+        assert screen.model.paths() == [str(tmp_path / "photo_3.jpg"), str(tmp_path / "photo_2.jpg")]
+
+        changes.clear()
+        screen.load_photos(str(tmp_path))               # nothing new: nothing done
+        assert changes == []
+    finally:
+        screen.model.loader.shutdown(wait=True)
+        screen.close()
+
+
+def test_scrolling_withdraws_decodes_for_rows_out_of_view(qapp):
+    gate = threading.Event()
+    screen = GalleryScreen()
+    screen.model.loader.decode = lambda path, size: gate.wait(2.0) and None
+    paths = [f"/photos/photo_{i:04d}.jpg" for i in range(800)]
+    screen.resize(1900, 1000)
+    screen.show()
+    screen.model.set_paths(paths)
+    for _ in range(20):                 # batched layout
+        qapp.processEvents()
+    try:
+        first, last = screen.visible_rows()
+        assert first == 0 and 0 < last < 100
+        queued_at_top = screen.model.loader.pending
+        assert queued_at_top > 0
+
+        bar = screen.list_view.verticalScrollBar()
+        bar.setValue(bar.maximum() // 2)
+        qapp.processEvents()
+        first, last = screen.visible_rows()
+        assert first > 300 and last < 500
+        with screen.model.loader._lock:
+            pending = list(screen.model.loader._pending)
+        per_row = screen.list_view.viewport().width() // screen.list_view.gridSize().width()
+        stale = [p for p in pending if paths.index(p) < first - per_row]
+        # Only decodes already running on a worker survive
+        assert len(stale) <= screen.model.loader._executor._max_workers
+    finally:
+        screen.model.loader.retain(())
+        gate.set()
+        screen.model.loader.shutdown(wait=True)
+        qapp.processEvents()
+        screen.close()
@@ -0,0 +1,34 @@
+"""Tests for the frame picker's background previews (offscreen Qt)."""
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.views.home_screen import HomeScreen
+
+
+def test_previews_fill_tiles_and_late_ones_are_dropped(qapp, tmp_path):
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    path = str(frames / "gold.png")
+    Image.new("RGBA", (900, 600), (250, 200, 0, 160)).save(path)
+    screen = HomeScreen()
+    try:
+        screen.load_frames(str(frames))
+        deadline = time.monotonic() + 5.0
+        label = screen._preview_labels[path]
+        while label.pixmap().isNull() and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+        assert label.pixmap().width() == 260 and label.pixmap().hasAlpha()
+
+        os.remove(path)
+        screen.load_frames(str(frames))
+        qapp.processEvents()
+        assert screen._preview_labels == {}
+        # A preview decoded before the reload must not reach the deleted tile
+        screen._on_preview_ready(path, np.zeros((260, 260, 4), dtype=np.uint8))
+    finally:
+        screen.preview_loader.shutdown(wait=True)
+        screen.close()
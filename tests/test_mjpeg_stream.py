@@ -0,0 +1,96 @@
+"""Tests for the MJPEG splitter and the streaming live view."""
+import io
+import sys
+import time
+
+import pytest
+from PIL import Image
+
+from src.controllers.mjpeg_stream import MjpegLiveView, MjpegSplitter
+
+
+def jpeg(color, size=(32, 24)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+# --- MjpegSplitter ---
+
+def test_splits_concatenated_frames():
+    frames = [jpeg((255, 0, 0)), jpeg((0, 255, 0)), jpeg((0, 0, 255))]
+    assert MjpegSplitter().feed(b"".join(frames)) == frames
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_handles_arbitrary_chunking(chunk_size):
+    frames = [jpeg((255, 0, 0)), jpeg((0, 255, 0))]
+    stream = b"junk" + b"".join(frames)
+    splitter = MjpegSplitter()
+    out = []
+    for i in range(0, len(stream), chunk_size):
+        out += splitter.feed(stream[i:i + chunk_size])
+    assert out == frames
+
+
+def test_incomplete_frame_is_held_back():
+    frame = jpeg((1, 2, 3))
+    splitter = MjpegSplitter()
+    assert splitter.feed(frame[:-2]) == []
+    assert splitter.feed(frame[-2:]) == [frame]
+
+
+def test_oversized_frame_is_discarded():
+    splitter = MjpegSplitter(max_frame_bytes=100)
+    assert splitter.feed(b"\xff\xd8" + b"\x00" * 200) == []
+    frame = jpeg((9, 9, 9))
+    assert splitter.feed(frame) == [frame]
+
+
+# --- MjpegLiveView ---
+
+STAND_IN = (
+    "import sys, time\n"
+    "data = open(sys.argv[1], 'rb').read()\n"
+    "for _ in range(int(sys.argv[2])):\n"
+    "    sys.stdout.buffer.write(data); sys.stdout.buffer.flush(); time.sleep(0.002)\n"
+    "time.sleep(30)\n"
+)
+
+
+@pytest.fixture
+def stream_command(tmp_path):
+    frame_file = tmp_path / "frame.jpg"
+    frame_file.write_bytes(jpeg((0, 0, 255), size=(64, 48)))
+    return [sys.executable, "-c", STAND_IN, str(frame_file), "200"]
+
+
+def test_live_view_decodes_newest_frame(stream_command):
+    live = MjpegLiveView(stream_command)
+    assert live.start()
+    try:
+        assert wait_until(lambda: live.frames_received >= 200)
+        assert wait_until(lambda: live.slot.latest() is not None)
+        packet = live.slot.latest()
+        assert packet.pixel_format == "BGR"
+        assert packet.frame.shape == (48, 64, 3)
+        assert packet.frame[24, 32, 0] > 200     # BGR, blue
+        assert packet.to_rgb()[24, 32, 2] > 200
+        decoded = live.slot.seq
+        assert decoded + live.frames_dropped >= live.frames_received - 1
+    finally:
+        live.stop()
+    assert not live.is_running
+
+
+def test_live_view_bad_command():
+    assert MjpegLiveView(["/nonexistent/gphoto2"]).start() is False
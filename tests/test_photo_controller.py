@@ -1,9 +1,12 @@
 """Tests for PhotoController: save, apply_frame, thumbnail."""
 import os
+import cv2
 import numpy as np
 import pytest
 from PIL import Image
 
+from src.controllers.photo_controller import preview_geometry
+
 
 def test_save_photo_creates_file(photo_controller, sample_photo):
     path = photo_controller.save_photo(sample_photo, "test.jpg")
@@ -71,3 +74,64 @@ def test_get_thumbnail_fits_target(photo_controller, sample_photo):
     h, w = thumb.shape[:2]
     assert w <= 150
     assert h <= 100
+
+
+# --- display-resolution preview ---
+
+def test_preview_geometry_same_aspect_uses_whole_camera():
+    box, overlay_size, crop = preview_geometry((1280, 960), (640, 480), (320, 240))
+    assert box == (0, 0, 1280, 960)
+    assert overlay_size == (320, 240)
+    assert crop == (0, 0, 320, 240)
+
+
+def test_preview_geometry_wide_camera_crops_sides():
+    x, y, w, h = preview_geometry((1920, 1080), (640, 480), (400, 300))[0]
+    assert (y, h) == (0, 1080)
+    assert w == 1440
+    assert abs(x - (1920 - 1440) // 2) <= 4
+
+
+def test_render_preview_has_display_size(photo_controller, frame_png):
+    camera = np.zeros((720, 1280, 3), dtype=np.uint8)
+    result = photo_controller.render_preview(camera, frame_png, (500, 300))
+    assert result.shape == (300, 500, 3)
+
+
+def test_render_preview_without_frame(photo_controller, sample_image):
+    result = photo_controller.render_preview(sample_image, None, (320, 240))
+    assert result.shape == (240, 320, 3)
+    assert (result[120, 160] == [0, 0, 200]).all()
+
+
+def test_render_preview_matches_final_print(photo_controller, frame_png):
+    """Display preview equals the final print downscaled to the display."""
+    rng = np.random.default_rng(0)
+    camera = rng.integers(0, 256, (90, 160, 3), dtype=np.uint8)
+    camera = cv2.resize(camera, (1280, 720), interpolation=cv2.INTER_LINEAR)
+    final = photo_controller.apply_frame_to_array(camera, frame_png)
+    expected = cv2.resize(final, (320, 240), interpolation=cv2.INTER_AREA).astype(int)
+    result = photo_controller.render_preview(camera, frame_png, (320, 240)).astype(int)
+    assert np.abs(result - expected).mean() < 4
+
+
+def test_save_photo_writes_camera_jpeg_verbatim(photo_controller, sample_photo):
+    sample_photo.encoded_data = b"\xff\xd8camera-bytes\xff\xd9"
+    path = photo_controller.save_photo(sample_photo, "raw.jpg")
+    with open(path, "rb") as f:
+        assert f.read() == sample_photo.encoded_data
+
+
+def test_apply_frame_drops_camera_jpeg(photo_controller, sample_photo, frame_png):
+    sample_photo.encoded_data = b"\xff\xd8camera-bytes\xff\xd9"
+    framed = photo_controller.apply_frame(sample_photo, frame_png)
+    assert framed.encoded_data is None
+
+
+def test_render_preview_bgr_matches_rgb(photo_controller, frame_png):
+    rgb = np.zeros((480, 640, 3), dtype=np.uint8)
+    rgb[:, :, 2] = 200
+    expected = photo_controller.render_preview(rgb, frame_png, (320, 240)).copy()
+    bgr = np.ascontiguousarray(rgb[:, :, ::-1])
+    out = photo_controller.render_preview(bgr, frame_png, (320, 240), "BGR")
+    assert np.array_equal(out[:, :, ::-1], expected)   # overlay red stays red
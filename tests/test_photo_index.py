@@ -0,0 +1,83 @@
+"""Tests for the SQLite photo index."""
+import os
+import time
+from datetime import datetime
+
+from PIL import Image
+
+from src.controllers.photo_index import PhotoIndex
+
+
+def make_photo(path, size=(64, 48)):
+    Image.new("RGB", size, (10, 20, 30)).save(path, "JPEG")
+    return str(path)
+
+
+def test_record_and_page_newest_first(tmp_path):
+    index = PhotoIndex(str(tmp_path))
+    for day in (1, 3, 2):
+        index.record_capture(str(tmp_path / f"photo_2024010{day}_120000.jpg"),
+                             datetime(2024, 1, day, 12), size=(1920, 1080))
+    assert index.count() == 3
+    first, second = index.page(0, 2)
+    assert first.final_path.endswith("photo_20240103_120000.jpg")
+    assert second.taken_at == datetime(2024, 1, 2, 12)
+    assert (first.width, first.height) == (1920, 1080)
+    assert [r.taken_at.day for r in index.page(2, 10)] == [1]
+
+
+def test_email_and_print_history(tmp_path):
+    index = PhotoIndex(str(tmp_path), thumb_key=lambda path: "k-" + os.path.basename(path))
+    path = str(tmp_path / "photo_20240101_120000.jpg")
+    index.record_capture(path, datetime(2024, 1, 1), original_path=path.replace(".jpg", "_original.jpg"),
+                         frame_path="frames/gold.png")
+    index.mark_emailed(path, "guest@example.com")
+    index.mark_printed(path)
+    index.mark_printed(path)
+    record = index.get(path)
+    assert record.emailed_to == "guest@example.com" and record.emailed_at is not None
+    assert record.print_count == 2
+    assert record.frame_path == "frames/gold.png"
+    assert record.thumb_key == "k-photo_20240101_120000.jpg"
+    assert index.stats() == {"photos": 1, "emailed": 1, "prints": 2}
+
+
+def test_reconcile_pairs_originals_and_drops_deleted(tmp_path):
+    final = make_photo(tmp_path / "photo_20240101_120000.jpg", size=(80, 60))
+    make_photo(tmp_path / "photo_20240101_120000_original.jpg")
+    lone = make_photo(tmp_path / "photo_20240102_090000.jpg")
+    index = PhotoIndex(str(tmp_path))
+
+    assert index.reconcile() == (2, 0)
+    record = index.get(final)
+    assert record.original_path.endswith("_original.jpg")
+    assert (record.width, record.height) == (80, 60)
+    assert index.final_paths() == [lone, final]
+
+    assert index.reconcile() == (0, 0)          # directory unchanged
+    time.sleep(0.01)
+    os.remove(lone)
+    assert index.reconcile() == (0, 1)
+    assert index.final_paths() == [final]
+
+
+def test_index_persists(tmp_path):
+    index = PhotoIndex(str(tmp_path))
+    index.record_capture(str(tmp_path / "photo_a.jpg"), datetime(2024, 5, 1))
+    index.close()
+    assert PhotoIndex(str(tmp_path)).count() == 1
+
+
+def test_reconcile_never_lists_an_original_as_final(tmp_path):
+    original = make_photo(tmp_path / "photo_20240101_120000_original.jpg")
+    index = PhotoIndex(str(tmp_path))
+    assert index.reconcile() == (0, 0)      # framed photo not written yet
+    assert index.count() == 0
+
+    final = make_photo(tmp_path / "photo_20240101_120000.jpg")
+    assert index.reconcile(force=True) == (1, 0)
+    assert index.get(final).original_path == original
+
+    index.record_capture(original, datetime(2024, 1, 1))   # left by an older version
+    assert index.reconcile(force=True) == (0, 1)
+    assert index.final_paths() == [final]
@@ -0,0 +1,142 @@
+"""Tests for PreviewRenderer: off-GUI-thread preview rendering."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.controllers.frame_grabber import FramePacket, LatestFrameSlot
+from src.controllers.preview_renderer import PreviewRenderer
+
+
+def wait_for(renderer, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        packet = renderer.take()
+        if packet is not None:
+            return packet
+        time.sleep(0.005)
+    return None
+
+
+@pytest.fixture
+def slot_source():
+    slot = LatestFrameSlot()
+    seen = {"seq": 0}
+
+    def source():
+        packet = slot.latest()
+        if packet is None or packet.seq == seen["seq"]:
+            return None
+        seen["seq"] = packet.seq
+        return packet
+
+    return slot, source
+
+
+def test_renders_at_display_size(photo_controller, frame_png, slot_source):
+    slot, source = slot_source
+    renderer = PreviewRenderer(photo_controller, source)
+    renderer.configure(frame_png, (320, 240))
+    renderer.start()
+    try:
+        slot.publish(np.zeros((480, 640, 3), dtype=np.uint8), pixel_format="BGR")
+        packet = wait_for(renderer)
+    finally:
+        renderer.stop()
+    assert packet.frame.shape == (240, 320, 3)
+    assert packet.pixel_format == "BGR" and packet.seq == 1
+    assert renderer.render_ms > 0
+
+
+def test_each_render_taken_once(photo_controller, slot_source):
+    slot, source = slot_source
+    renderer = PreviewRenderer(photo_controller, source)
+    renderer.configure(None, (64, 48))
+    renderer.start()
+    try:
+        slot.publish(np.zeros((48, 64, 3), dtype=np.uint8))
+        assert wait_for(renderer) is not None
+        assert renderer.take() is None
+    finally:
+        renderer.stop()
+
+
+def test_shown_buffer_is_never_overwritten(photo_controller, slot_source):
+    slot, source = slot_source
+    renderer = PreviewRenderer(photo_controller, source)
+    renderer.configure(None, (64, 48))
+    renderer.start()
+    try:
+        slot.publish(np.full((48, 64, 3), 1, dtype=np.uint8))
+        shown = wait_for(renderer)
+        for value in range(2, 30):
+            slot.publish(np.full((48, 64, 3), value, dtype=np.uint8))
+            time.sleep(0.002)
+        time.sleep(0.05)
+        assert (shown.frame == 1).all()
+        latest = renderer.take()
+        assert latest is not None and latest.frame is not shown.frame
+    finally:
+        renderer.stop()
+
+
+def test_resize_takes_effect(photo_controller, slot_source):
+    slot, source = slot_source
+    renderer = PreviewRenderer(photo_controller, source)
+    renderer.configure(None, (64, 48))
+    renderer.start()
+    try:
+        slot.publish(np.zeros((48, 64, 3), dtype=np.uint8))
+        assert wait_for(renderer).frame.shape == (48, 64, 3)
+        renderer.configure(None, (32, 24))
+        slot.publish(np.zeros((48, 64, 3), dtype=np.uint8))
+        assert wait_for(renderer).frame.shape == (24, 32, 3)
+    finally:
+        renderer.stop()
+
+
+def test_min_interval_throttles_renders(photo_controller):
+    calls = []
+
+    def source():
+        calls.append(time.monotonic())
+        return FramePacket(frame=np.zeros((48, 64, 3), dtype=np.uint8), seq=len(calls),
+                           timestamp=time.monotonic())
+
+    renderer = PreviewRenderer(photo_controller, source, min_interval=0.05)
+    renderer.configure(None, (64, 48))
+    renderer.start()
+    time.sleep(0.22)
+    renderer.stop()
+    assert 2 <= len(calls) <= 6
+
+
+def test_restart_after_stuck_stop_keeps_a_single_worker(photo_controller):
+    gate = threading.Event()
+    calls = []
+
+    def source():
+        calls.append(threading.get_ident())
+        if len(calls) == 1:
+            gate.wait(2.0)      # a slow DSLR read
+        return FramePacket(frame=np.zeros((48, 64, 3), dtype=np.uint8), seq=len(calls),
+                           timestamp=time.monotonic())
+
+    renderer = PreviewRenderer(photo_controller, source)
+    renderer.configure(None, (64, 48))
+    renderer.start()
+    time.sleep(0.05)
+    assert renderer.stop(timeout=0.05) is False
+    assert renderer.is_running
+    renderer.start()
+    gate.set()
+    try:
+        assert wait_for(renderer) is not None
+        time.sleep(0.05)
+        assert len(set(calls)) == 1
+        workers = [t for t in threading.enumerate() if t.name == "preview-renderer"]
+        assert len(workers) == 1
+    finally:
+        assert renderer.stop() is True
+    assert not renderer.is_running
@@ -0,0 +1,66 @@
+"""Tests for PreviewLabel's cached overlay glyphs (offscreen Qt)."""
+import numpy as np
+import pytest
+
+from src.views import preview_widget
+from src.views.preview_widget import PreviewLabel
+
+
+@pytest.fixture
+def label(qapp, monkeypatch):
+    """400x300 PreviewLabel showing a 320x240 frame; counts glyph rasterizations."""
+    widget = PreviewLabel()
+    widget.resize(400, 300)
+    widget.rasterized = []
+    metrics = preview_widget.QFontMetrics
+
+    def counting_metrics(font):
+        widget.rasterized.append(font.pointSize())
+        return metrics(font)
+
+    monkeypatch.setattr(preview_widget, "QFontMetrics", counting_metrics)
+    widget.set_frame(np.zeros((240, 320, 3), dtype=np.uint8))
+    widget.grab()
+    yield widget
+    widget.deleteLater()
+
+
+def test_each_text_rasterized_once_per_size(label):
+    label.prepare_overlay_texts(["3", "2", "1", "3"])
+    assert len(label.rasterized) == 3
+    assert label._glyph_size == (320, 240)
+
+
+def test_glyph_reused_across_repaints(label):
+    label.set_overlay_text("3")
+    label.grab()
+    pixmap = label._glyphs["3"][1]
+    for _ in range(3):
+        label.set_frame(np.zeros((240, 320, 3), dtype=np.uint8))
+        label.grab()
+    assert len(label.rasterized) == 1
+    assert label._glyphs["3"][1].cacheKey() == pixmap.cacheKey()
+
+
+def test_resize_invalidates_glyphs(label):
+    label.prepare_overlay_texts(["3"])
+    label.resize(500, 400)
+    label.grab()
+    assert label._glyphs == {}
+    label.prepare_overlay_texts(["3"])
+    assert len(label.rasterized) == 2
+
+
+def test_display_size_change_invalidates_glyphs(label):
+    label.set_overlay_text("3")
+    label.grab()
+    # Same frame rendered at half resolution: painted at the same size
+    label.set_frame(np.zeros((120, 160, 3), dtype=np.uint8), scale=0.5)
+    label.grab()
+    assert len(label.rasterized) == 1
+    # Scheduler lowers the scale on a smaller frame: display size changes
+    label.set_frame(np.zeros((120, 160, 3), dtype=np.uint8), scale=0.75)
+    label.grab()
+    assert len(label.rasterized) == 2
+    assert label._glyph_size == (213, 160)
+    assert set(label._glyphs) == {"3"}
@@ -0,0 +1,74 @@
+"""Tests for the persistent on-disk thumbnail cache."""
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.controllers.thumbnail_cache import ThumbnailCache
+
+
+def make_photo(path, color=(200, 40, 10), size=(1920, 1080)):
+    Image.new("RGB", size, color).save(path, "JPEG", quality=92)
+    return str(path)
+
+
+def entries(cache):
+    return [os.path.join(d, f) for d, _, files in os.walk(cache.root) for f in files]
+
+
+def test_load_decodes_once_then_reads_small_entry(tmp_path, monkeypatch):
+    photo = make_photo(tmp_path / "photo_1.jpg")
+    cache = ThumbnailCache(str(tmp_path))
+    first = cache.load(photo)
+    assert first.shape[1] == 292 and first.shape[0] <= 212
+    [entry] = entries(cache)
+    assert os.path.getsize(entry) < 20 * 1024
+
+    decoded = []
+    monkeypatch.setattr("src.controllers.thumbnail_cache.load_thumbnail",
+                        lambda *args: decoded.append(args))
+    again = ThumbnailCache(str(tmp_path)).load(photo)     # e.g. after a restart
+    assert decoded == []
+    assert again.shape == first.shape
+
+
+def test_rewritten_photo_gets_new_entry(tmp_path):
+    photo = make_photo(tmp_path / "photo_1.jpg")
+    cache = ThumbnailCache(str(tmp_path))
+    old_key = cache.key(photo)
+    cache.load(photo)
+    time.sleep(0.01)
+    make_photo(photo, color=(10, 40, 200), size=(1280, 720))
+    assert cache.key(photo) != old_key
+    assert cache.get(photo) is None
+    assert cache.load(photo)[50, 100, 2] > 150
+
+
+def test_store_at_save_time(photo_controller, sample_photo):
+    path = photo_controller.save_photo(sample_photo, "photo_test.jpg")
+    thumb = photo_controller.thumbnails.get(path)
+    assert thumb is not None
+    assert max(thumb.shape[:2]) <= 292
+
+
+def test_size_bounded_eviction_drops_least_recently_used(tmp_path):
+    noise = np.random.default_rng(0).integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"photo_{i}.jpg")
+        Image.fromarray(noise).save(path)
+        paths.append(path)
+    cache = ThumbnailCache(str(tmp_path))
+    cache.load(paths[0])
+    entry_size = os.path.getsize(entries(cache)[0])
+    cache.max_bytes = int(entry_size * 2.5)
+    time.sleep(0.02)
+    cache.load(paths[1])
+    time.sleep(0.02)
+    assert cache.get(paths[0]) is not None      # photo_0 used again
+    time.sleep(0.02)
+    cache.load(paths[2])
+    assert len(entries(cache)) == 2
+    assert cache.get(paths[1]) is None
+    assert cache.get(paths[0]) is not None and cache.get(paths[2]) is not None
@@ -0,0 +1,102 @@
+"""Tests for the background gallery thumbnail loader."""
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.controllers.thumbnail_loader import (
+    ThumbnailLoader, list_photos, load_cover_thumbnail, load_thumbnail, reduce_decode
+)
+
+
+def make_photo(path, size=(1920, 1080)):
+    Image.new("RGB", size, (200, 40, 10)).save(path, "JPEG")
+    return str(path)
+
+
+def test_list_photos_filters_and_sorts(tmp_path):
+    for name in ["photo_20240101.jpg", "photo_20240301.PNG", "notes.txt", "photo_20240201.jpeg"]:
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "sub.jpg").mkdir()
+    names = [p.rsplit("/", 1)[-1] for p in list_photos(str(tmp_path))]
+    assert names == ["photo_20240301.PNG", "photo_20240201.jpeg", "photo_20240101.jpg"]
+    assert list_photos(str(tmp_path / "missing")) == []
+
+
+def test_load_thumbnail_fits_box(tmp_path):
+    thumb = load_thumbnail(make_photo(tmp_path / "a.jpg"), (300, 220))
+    assert thumb.shape[1] == 300 and 168 <= thumb.shape[0] <= 169
+    assert abs(int(thumb[80, 150, 0]) - 200) < 8
+
+
+def test_jpeg_decodes_at_reduced_scale(tmp_path):
+    path = make_photo(tmp_path / "big.jpg", size=(4000, 3000))
+    with Image.open(path) as image:
+        reduce_decode(image, (300, 220))
+        image.load()
+        assert image.size == (500, 375)     # 1/8 scale still covers the box
+
+
+def test_reduced_decode_accounts_for_rotation(tmp_path):
+    exif = Image.Exif()
+    exif[0x0112] = 6                        # rotate 90 degrees on display
+    path = str(tmp_path / "portrait.jpg")
+    Image.new("RGB", (4000, 1000), (0, 90, 200)).save(path, "JPEG", exif=exif)
+    with Image.open(path) as image:
+        reduce_decode(image, (200, 1000))   # box as displayed: 1000 px of height
+        image.load()
+        assert image.size == (1000, 250)
+    thumb = load_thumbnail(path, (200, 1000))
+    assert thumb.shape[:2] == (800, 200)
+
+
+def test_cover_thumbnail_fills_box_and_keeps_alpha(tmp_path):
+    path = str(tmp_path / "frame.png")
+    Image.new("RGBA", (1800, 1200), (255, 0, 0, 128)).save(path)
+    thumb = load_cover_thumbnail(path, (260, 260))
+    assert thumb.shape == (260, 260, 4)
+    assert int(thumb[130, 130, 3]) == 128
+
+    thumb = load_cover_thumbnail(make_photo(tmp_path / "b.jpg", size=(4000, 3000)), (260, 260))
+    assert thumb.shape == (260, 260, 4) and int(thumb[10, 10, 3]) == 255
+
+
+def test_unreadable_file_reports_none(tmp_path):
+    (tmp_path / "broken.jpg").write_bytes(b"not a jpeg")
+    results = {}
+    done = threading.Event()
+
+    def on_ready(path, image):
+        results[path] = image
+        done.set()
+
+    loader = ThumbnailLoader(on_ready=on_ready)
+    loader.request(str(tmp_path / "broken.jpg"))
+    assert done.wait(2.0)
+    assert results[str(tmp_path / "broken.jpg")] is None
+    loader.shutdown()
+
+
+def test_requests_are_deduplicated_and_withdrawn():
+    gate = threading.Event()
+    decoded = []
+
+    def decode(path, size):
+        gate.wait(2.0)
+        decoded.append(path)
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+    loader = ThumbnailLoader(max_workers=1, decode=decode)
+    assert loader.request("a")          # occupies the only worker
+    assert not loader.request("a")
+    for path in "bcd":
+        loader.request(path)
+    loader.retain(["a", "d"])           # b and c scrolled out of view
+    loader.cancel("d")
+    gate.set()
+    deadline = time.monotonic() + 2.0
+    while loader.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert decoded == ["a"]
+    loader.shutdown()